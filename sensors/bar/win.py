@@ -1,11 +1,17 @@
-"""Windows Tanium sensor returning the OS build number via `cmd /c ver`."""
+"""Windows Tanium sensor returning the OS build number from the registry or `cmd /c ver`."""
 
 from __future__ import annotations
 
+import contextlib
+import json
+import os
 import re
 import subprocess
 import sys
-from typing import Final
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Final
 
 _COMMAND: Final[list[str]] = [
     "cmd.exe",
@@ -19,11 +25,31 @@ _TIMEOUT_SECONDS = 0.5
 
 _ERROR_EXECUTION_FAILED = "BAR101"
 _ERROR_NON_ZERO_RC = "BAR102"
+_ERROR_CACHE_WRITE_FAILED = "BAR103"
 
 
 # === SENSOR_COPY_BLOCK START ===
+_MAX_OUTPUT_BYTES = 1024
+_TRUNCATED_ROW = "[partial results] Truncated: {} row dropped"
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+_CACHE_VERSION = 1
+_errors: dict[str, list[Any]] = {}
+# In-process readers may fail in any of these ways before the next source is tried.
+_READ_ERRORS = (OSError, ValueError, LookupError, AttributeError, ImportError)
+
+
 def _emit_error(code: str, message: str) -> None:
-    sys.stderr.write(f"{code} {message}\n")
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    """Write one line per code (count beyond the first examples) and reset for the next run."""
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
 
 
 def _capture_command_output(command: list[str]) -> str:
@@ -54,18 +80,123 @@ def _sanitize_build_number(raw_value: str, pattern: re.Pattern[str]) -> str:
     return raw_value.strip()
 
 
+def _read_command(root: Path) -> str:
+    return _capture_command_output(_COMMAND)
+
+
+def _lookup_build(root: Path, readers: dict[str, Callable[[Path], str]]) -> tuple[str, str]:
+    """Return `(build, source)` from the first reader that yields a build, else `("", "none")`."""
+    for source, reader in readers.items():
+        try:
+            build = _sanitize_build_number(reader(root), _BUILD_PATTERN)
+        except _READ_ERRORS:
+            continue
+        if build:
+            return build, source
+    return "", "none"
+
+
+def _boot_key(root: Path, boot_id: Callable[[Path], str]) -> str:
+    try:
+        return boot_id(root).strip()
+    except _READ_ERRORS:
+        return ""
+
+
+def _load_cached_build(cache_path: str, boot: str) -> str:
+    with contextlib.suppress(OSError, ValueError, LookupError, TypeError):
+        with open(cache_path, encoding="utf-8") as handle:
+            cache = json.load(handle)
+        if cache["version"] == _CACHE_VERSION and cache["boot_id"] == boot:
+            return cache["build"] if isinstance(cache["build"], str) else ""
+    return ""
+
+
+def _save_cached_build(cache_path: str, boot: str, build: str) -> None:
+    """Swap in the cache file atomically so a crash mid-write never leaves a torn record."""
+    cache = {"version": _CACHE_VERSION, "boot_id": boot, "build": build}
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(cache, handle, separators=(",", ":"))
+        os.replace(temp_path, cache_path)
+    except OSError as exc:
+        _emit_error(_ERROR_CACHE_WRITE_FAILED, f"Unable to persist {cache_path}: {exc}")
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+
+
+def _cap_output(value: str) -> str:
+    """Swap a result larger than the manifest's max_output_bytes for the marker row."""
+    if len(value.encode()) <= _MAX_OUTPUT_BYTES:
+        return value
+    return _TRUNCATED_ROW.format(1)
+
+
 # === SENSOR_COPY_BLOCK END ===
 
 
-def run_sensor(base_dir: str | None = None) -> str:
-    """Return the Windows build identifier as a single-column response."""
-    if base_dir is not None:
-        _ = base_dir
+_CURRENT_VERSION_KEY = r"SOFTWARE\Microsoft\Windows NT\CurrentVersion"
+_BUILD_VALUES = ("CurrentMajorVersionNumber", "CurrentMinorVersionNumber", "CurrentBuild", "UBR")
+
+
+def _registry_build(query: Callable[[str], Any]) -> str:
+    return ".".join(str(query(name)) for name in _BUILD_VALUES)
+
+
+def _read_registry(root: Path) -> str:
+    import winreg
+
+    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, _CURRENT_VERSION_KEY) as key:
+        return _registry_build(lambda name: winreg.QueryValueEx(key, name)[0])
+
+
+def _read_boot_id(root: Path) -> str:
+    import ctypes
+
+    ticks = ctypes.windll.kernel32.GetTickCount64
+    ticks.restype = ctypes.c_uint64
+    # Boot time to the second; a rare off-by-one between runs only costs a cache miss.
+    return str(int(time.time() - ticks() / 1000))
+
+
+def _default_readers(base_dir: str | None) -> dict[str, Callable[[Path], str]]:
+    return {"registry": _read_registry, "command": _read_command}
+
+
+def lookup_build(
+    base_dir: str | None = None,
+    *,
+    readers: dict[str, Callable[[Path], str]] | None = None,
+    cache_path: str | None = None,
+    boot_id: Callable[[Path], str] | None = None,
+) -> tuple[str, str]:
+    """Return `(build, source)`, where source names the reader that served the build.
+
+    Readers are tried in order and receive the root path; `readers` replaces the default
+    `registry`, `command` chain so tests can drive each source without the host OS.
+    With `cache_path`, a build cached under the current `boot_id` returns as source `cache`.
+    """
+    root = Path(base_dir or "/")
+    try:
+        boot = _boot_key(root, boot_id or _read_boot_id) if cache_path else ""
+        build = _load_cached_build(cache_path, boot) if boot else ""
+        if build:
+            return build, "cache"
+        chain = _default_readers(base_dir) if readers is None else readers
+        build, source = _lookup_build(root, chain)
+        build = _cap_output(build)
+        if boot and build:
+            _save_cached_build(cache_path, boot, build)
+    finally:
+        _flush_errors()
+    return build, source
+
 
-    stdout = _capture_command_output(_COMMAND)
-    build = _sanitize_build_number(stdout, _BUILD_PATTERN)
-    return build
+def run_sensor(base_dir: str | None = None, **options: Any) -> str:
+    """Return the Windows OS build number as a single-column response."""
+    return lookup_build(base_dir, **options)[0]
 
 
 if __name__ == "__main__":
-    print(run_sensor())
+    print(run_sensor(cache_path=os.environ.get("BAR_CACHE_PATH")))
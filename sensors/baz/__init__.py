@@ -0,0 +1 @@
+"""Tanium baz sensor package."""
@@ -0,0 +1,98 @@
+"""Linux Tanium sensor returning hostname, kernel release, architecture, and build in one row."""
+
+from __future__ import annotations
+
+import os
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+_ERROR_FACT_UNREADABLE = "BAZ001"
+
+
+# === SENSOR_COPY_BLOCK START ===
+_FACTS = ("hostname", "kernel", "arch", "build")
+_NO_RESULTS_ROW = "[no results]" + "\t" * 3
+_TRUNCATED_ROW = "[partial results]\tTruncated\t{} row dropped\t"
+_MAX_OUTPUT_BYTES = 1024
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+_errors: dict[str, list[Any]] = {}
+# In-process readers may fail in any of these ways; the fact is then left empty.
+_READ_ERRORS = (OSError, ValueError, LookupError, AttributeError, ImportError)
+# Controls (including the tab delimiter) become "?".
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys((*range(32), 127), "?"))
+
+
+def _emit_error(code: str, message: str) -> None:
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    """Write one line per code (count beyond the first examples) and reset for the next run."""
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
+
+
+def _read_fact(name: str, reader: Callable[[Path], str], root: Path) -> str:
+    try:
+        return str(reader(root)).strip().translate(_SANITIZE_TABLE)
+    except _READ_ERRORS as exc:
+        _emit_error(_ERROR_FACT_UNREADABLE, f"Cannot read {name}: {exc}")
+        return ""
+
+
+def _format_row(root: Path, readers: dict[str, Callable[[Path], str]]) -> str:
+    """Join one cell per `_FACTS` entry; a fact without a reader stays empty."""
+    try:
+        cells = [
+            _read_fact(name, readers[name], root) if name in readers else "" for name in _FACTS
+        ]
+    finally:
+        _flush_errors()
+    if not any(cells):
+        return _NO_RESULTS_ROW
+    row = "\t".join(cells)
+    return row if len(row.encode()) <= _MAX_OUTPUT_BYTES else _TRUNCATED_ROW.format(1)
+
+
+# === SENSOR_COPY_BLOCK END ===
+
+
+def _procfs_reader(name: str) -> Callable[[Path], str]:
+    return lambda root: (root / "proc/sys/kernel" / name).read_text(encoding="utf-8")
+
+
+def _default_readers(base_dir: str | None) -> dict[str, Callable[[Path], str]]:
+    if base_dir is not None:
+        release = _procfs_reader("osrelease")
+        return {
+            "hostname": _procfs_reader("hostname"),
+            "kernel": release,
+            "arch": _procfs_reader("arch"),
+            "build": release,
+        }
+    # One uname(2) call answers every fact; the kernel release doubles as the build.
+    uname = os.uname()
+    return {
+        "hostname": lambda root: uname.nodename,
+        "kernel": lambda root: uname.release,
+        "arch": lambda root: uname.machine,
+        "build": lambda root: uname.release,
+    }
+
+
+def run_sensor(
+    base_dir: str | None = None, *, readers: dict[str, Callable[[Path], str]] | None = None
+) -> str:
+    """Return `hostname<TAB>kernel<TAB>arch<TAB>build` for the Linux host as one row."""
+    readers = _default_readers(base_dir) if readers is None else readers
+    return _format_row(Path(base_dir or "/"), readers)
+
+
+if __name__ == "__main__":
+    print(run_sensor())
@@ -0,0 +1,104 @@
+"""Windows Tanium sensor returning hostname, kernel version, architecture, and build in one row."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+_ERROR_FACT_UNREADABLE = "BAZ101"
+_CURRENT_VERSION_KEY = r"SOFTWARE\Microsoft\Windows NT\CurrentVersion"
+_COMPUTER_NAME_KEY = r"SYSTEM\CurrentControlSet\Control\ComputerName\ActiveComputerName"
+_ENVIRONMENT_KEY = r"SYSTEM\CurrentControlSet\Control\Session Manager\Environment"
+_VERSION_VALUES = ("CurrentMajorVersionNumber", "CurrentMinorVersionNumber", "CurrentBuild", "UBR")
+
+
+# === SENSOR_COPY_BLOCK START ===
+_FACTS = ("hostname", "kernel", "arch", "build")
+_NO_RESULTS_ROW = "[no results]" + "\t" * 3
+_TRUNCATED_ROW = "[partial results]\tTruncated\t{} row dropped\t"
+_MAX_OUTPUT_BYTES = 1024
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+_errors: dict[str, list[Any]] = {}
+# In-process readers may fail in any of these ways; the fact is then left empty.
+_READ_ERRORS = (OSError, ValueError, LookupError, AttributeError, ImportError)
+# Controls (including the tab delimiter) become "?".
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys((*range(32), 127), "?"))
+
+
+def _emit_error(code: str, message: str) -> None:
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    """Write one line per code (count beyond the first examples) and reset for the next run."""
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
+
+
+def _read_fact(name: str, reader: Callable[[Path], str], root: Path) -> str:
+    try:
+        return str(reader(root)).strip().translate(_SANITIZE_TABLE)
+    except _READ_ERRORS as exc:
+        _emit_error(_ERROR_FACT_UNREADABLE, f"Cannot read {name}: {exc}")
+        return ""
+
+
+def _format_row(root: Path, readers: dict[str, Callable[[Path], str]]) -> str:
+    """Join one cell per `_FACTS` entry; a fact without a reader stays empty."""
+    try:
+        cells = [
+            _read_fact(name, readers[name], root) if name in readers else "" for name in _FACTS
+        ]
+    finally:
+        _flush_errors()
+    if not any(cells):
+        return _NO_RESULTS_ROW
+    row = "\t".join(cells)
+    return row if len(row.encode()) <= _MAX_OUTPUT_BYTES else _TRUNCATED_ROW.format(1)
+
+
+# === SENSOR_COPY_BLOCK END ===
+
+
+def _query_registry(key_path: str, name: str) -> Any:
+    import winreg
+
+    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
+        return winreg.QueryValueEx(key, name)[0]
+
+
+def _registry_readers(query: Callable[[str, str], Any]) -> dict[str, Callable[[Path], str]]:
+    """Map each fact to HKLM values; `kernel` is `major.minor.build` and `build` adds the UBR."""
+
+    def version(count: int) -> str:
+        return ".".join(str(query(_CURRENT_VERSION_KEY, name)) for name in _VERSION_VALUES[:count])
+
+    return {
+        "hostname": lambda root: query(_COMPUTER_NAME_KEY, "ComputerName"),
+        "kernel": lambda root: version(3),
+        "arch": lambda root: query(_ENVIRONMENT_KEY, "PROCESSOR_ARCHITECTURE"),
+        "build": lambda root: version(4),
+    }
+
+
+def _default_readers(base_dir: str | None) -> dict[str, Callable[[Path], str]]:
+    # The registry always describes the running host, so base_dir is unused.
+    return _registry_readers(_query_registry)
+
+
+def run_sensor(
+    base_dir: str | None = None, *, readers: dict[str, Callable[[Path], str]] | None = None
+) -> str:
+    """Return `hostname<TAB>kernel<TAB>arch<TAB>build` for the Windows host as one row."""
+    readers = _default_readers(base_dir) if readers is None else readers
+    return _format_row(Path(base_dir or "/"), readers)
+
+
+if __name__ == "__main__":
+    print(run_sensor())
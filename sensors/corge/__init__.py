@@ -0,0 +1 @@
+"""Tanium corge sensor package."""
@@ -0,0 +1,147 @@
+"""Linux Tanium sensor inventorying installed packages from the dpkg status database."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+_ERROR_MISSING_DATABASE = "CORGE001"
+_ERROR_DATABASE_UNREADABLE = "CORGE002"
+
+
+def _default_root() -> Path:
+    return Path("/")
+
+
+def _status_path(root: Path) -> Path:
+    return root / "var" / "lib" / "dpkg" / "status"
+
+
+# === SENSOR_COPY_BLOCK START ===
+_NO_RESULTS_ROW = "[no results]" + "\t" * 2
+_PARTIAL_ROW = "[partial results]\tTruncated\t{} packages not listed"
+_MAX_OUTPUT_BYTES = 262144
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+_errors: dict[str, list[Any]] = {}
+# Controls (including the tab delimiter) become "?".
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys((*range(32), 127), "?"))
+
+
+def _emit_error(code: str, message: str) -> None:
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    """Write one line per code (count beyond the first examples) and reset for the next run."""
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
+
+
+def _package_filter(packages: Iterable[str] | str | None) -> frozenset[str] | None:
+    """Normalise the optional filter (a list or a comma-separated string); None keeps every row."""
+    if isinstance(packages, str):
+        packages = packages.split(",")
+    wanted = frozenset(name.strip() for name in packages or () if name.strip())
+    return wanted or None
+
+
+def _iter_package_rows(records: Iterator[tuple[str, str, str]]) -> Iterator[str]:
+    """Yield `package<TAB>version<TAB>status` rows until the output budget is spent."""
+    budget, emitted = _MAX_OUTPUT_BYTES - 64, False
+    try:
+        for record in records:
+            line = "\t".join(value.strip().translate(_SANITIZE_TABLE) for value in record)
+            budget -= len(line.encode()) + 1
+            if budget < 0:
+                # Keep consuming so the marker can say how many rows were dropped.
+                yield _PARTIAL_ROW.format(1 + sum(1 for _ in records))
+                return
+            emitted = True
+            yield line
+        if not emitted:
+            yield _NO_RESULTS_ROW
+    finally:
+        _flush_errors()
+
+
+# === SENSOR_COPY_BLOCK END ===
+
+
+def _stanza_field(view: mmap.mmap, start: int, end: int, key: bytes) -> bytes:
+    """Return the value of `key` (e.g. b"Package:") within one stanza, or b"" when absent."""
+    if view[start : start + len(key)] == key:
+        position = start + len(key)
+    else:
+        position = view.find(b"\n" + key, start, end)
+        if position < 0:
+            return b""
+        position += len(key) + 1
+    stop = view.find(b"\n", position, end)
+    return view[position : end if stop < 0 else stop].strip()
+
+
+def _iter_dpkg_records(
+    view: mmap.mmap, wanted: frozenset[str] | None
+) -> Iterator[tuple[str, str, str]]:
+    """Walk blank-line stanza boundaries; only the three fields we report are copied out."""
+    wanted_bytes = None if wanted is None else {name.encode() for name in wanted}
+    start, size = 0, len(view)
+    while start < size:
+        end = view.find(b"\n\n", start)
+        end = size if end < 0 else end
+        name = _stanza_field(view, start, end, b"Package:")
+        if name and (wanted_bytes is None or name in wanted_bytes):
+            yield (
+                name.decode("utf-8", "replace"),
+                _stanza_field(view, start, end, b"Version:").decode("utf-8", "replace"),
+                _stanza_field(view, start, end, b"Status:").decode("utf-8", "replace"),
+            )
+        start = end + 2
+
+
+def _map_file(path: Path) -> mmap.mmap | None:
+    """Map `path` read-only; None for an empty file, which mmap cannot map."""
+    with open(path, "rb") as handle:
+        if not os.fstat(handle.fileno()).st_size:
+            return None
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_sensor_rows(
+    base_dir: str | None = None, *, packages: Iterable[str] | str | None = None
+) -> Iterator[str]:
+    """Yield one row per package recorded in the dpkg status file, optionally filtered by name."""
+    root = _default_root() if base_dir is None else Path(base_dir)
+    status_path = _status_path(root)
+    try:
+        view = _map_file(status_path)
+    except FileNotFoundError:
+        _emit_error(_ERROR_MISSING_DATABASE, f"Missing dpkg database: {status_path}")
+        _flush_errors()
+        return
+    except (OSError, ValueError) as exc:
+        _emit_error(_ERROR_DATABASE_UNREADABLE, f"Cannot map {status_path}: {exc}")
+        _flush_errors()
+        return
+    if view is None:
+        yield from _iter_package_rows(iter(()))
+        return
+    with view:
+        yield from _iter_package_rows(_iter_dpkg_records(view, _package_filter(packages)))
+
+
+def run_sensor(base_dir: str | None = None, **options: Any) -> str:
+    """Inventory the packages in /var/lib/dpkg/status."""
+    return "\n".join(iter_sensor_rows(base_dir, **options))
+
+
+if __name__ == "__main__":
+    print(run_sensor(packages=os.environ.get("CORGE_PACKAGES")))
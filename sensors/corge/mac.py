@@ -0,0 +1,128 @@
+"""macOS Tanium sensor inventorying installed packages from the installer receipt database."""
+
+from __future__ import annotations
+
+import os
+import plistlib
+import sys
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+from xml.parsers.expat import ExpatError
+
+_ERROR_MISSING_DATABASE = "CORGE201"
+_ERROR_ENUMERATION_FAILED = "CORGE202"
+_ERROR_RECEIPT_UNREADABLE = "CORGE203"
+# A malformed XML receipt surfaces as ExpatError rather than plistlib.InvalidFileException.
+_RECEIPT_ERRORS = (OSError, ValueError, ExpatError)
+
+
+def _default_root() -> Path:
+    return Path("/")
+
+
+def _receipts_dir(root: Path) -> Path:
+    return root / "var" / "db" / "receipts"
+
+
+# === SENSOR_COPY_BLOCK START ===
+_NO_RESULTS_ROW = "[no results]" + "\t" * 2
+_PARTIAL_ROW = "[partial results]\tTruncated\t{} packages not listed"
+_MAX_OUTPUT_BYTES = 262144
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+_errors: dict[str, list[Any]] = {}
+# Controls (including the tab delimiter) become "?".
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys((*range(32), 127), "?"))
+
+
+def _emit_error(code: str, message: str) -> None:
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    """Write one line per code (count beyond the first examples) and reset for the next run."""
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
+
+
+def _package_filter(packages: Iterable[str] | str | None) -> frozenset[str] | None:
+    """Normalise the optional filter (a list or a comma-separated string); None keeps every row."""
+    if isinstance(packages, str):
+        packages = packages.split(",")
+    wanted = frozenset(name.strip() for name in packages or () if name.strip())
+    return wanted or None
+
+
+def _iter_package_rows(records: Iterator[tuple[str, str, str]]) -> Iterator[str]:
+    """Yield `package<TAB>version<TAB>status` rows until the output budget is spent."""
+    budget, emitted = _MAX_OUTPUT_BYTES - 64, False
+    try:
+        for record in records:
+            line = "\t".join(value.strip().translate(_SANITIZE_TABLE) for value in record)
+            budget -= len(line.encode()) + 1
+            if budget < 0:
+                # Keep consuming so the marker can say how many rows were dropped.
+                yield _PARTIAL_ROW.format(1 + sum(1 for _ in records))
+                return
+            emitted = True
+            yield line
+        if not emitted:
+            yield _NO_RESULTS_ROW
+    finally:
+        _flush_errors()
+
+
+# === SENSOR_COPY_BLOCK END ===
+
+
+def _list_receipts(receipts_dir: Path) -> list[str]:
+    with os.scandir(receipts_dir) as entries:
+        return sorted(entry.path for entry in entries if entry.name.endswith(".plist"))
+
+
+def _iter_receipt_records(
+    paths: list[str], wanted: frozenset[str] | None
+) -> Iterator[tuple[str, str, str]]:
+    """Read each `<identifier>.plist` receipt; pkgutil only records installed packages."""
+    for path in paths:
+        try:
+            with open(path, "rb") as handle:
+                receipt = plistlib.load(handle)
+            name = str(receipt["PackageIdentifier"])
+        except (*_RECEIPT_ERRORS, LookupError, TypeError) as exc:
+            _emit_error(_ERROR_RECEIPT_UNREADABLE, f"Cannot read {path}: {exc}")
+            continue
+        if wanted is None or name in wanted:
+            yield name, str(receipt.get("PackageVersion", "")), "installed"
+
+
+def iter_sensor_rows(
+    base_dir: str | None = None, *, packages: Iterable[str] | str | None = None
+) -> Iterator[str]:
+    """Yield one row per installer receipt, optionally filtered by package identifier."""
+    root = _default_root() if base_dir is None else Path(base_dir)
+    receipts_dir = _receipts_dir(root)
+    try:
+        paths = _list_receipts(receipts_dir)
+    except FileNotFoundError:
+        _emit_error(_ERROR_MISSING_DATABASE, f"Missing receipt database: {receipts_dir}")
+        _flush_errors()
+        return
+    except OSError as exc:
+        _emit_error(_ERROR_ENUMERATION_FAILED, f"Unable to enumerate {receipts_dir}: {exc}")
+        _flush_errors()
+        return
+    yield from _iter_package_rows(_iter_receipt_records(paths, _package_filter(packages)))
+
+
+def run_sensor(base_dir: str | None = None, **options: Any) -> str:
+    """Inventory the packages recorded under /var/db/receipts."""
+    return "\n".join(iter_sensor_rows(base_dir, **options))
+
+
+if __name__ == "__main__":
+    print(run_sensor(packages=os.environ.get("CORGE_PACKAGES")))
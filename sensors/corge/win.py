@@ -0,0 +1,141 @@
+"""Windows Tanium sensor inventorying installed programs from the registry Uninstall keys."""
+
+from __future__ import annotations
+
+import itertools
+import os
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+_ERROR_MISSING_DATABASE = "CORGE101"
+_ERROR_ENTRY_UNREADABLE = "CORGE102"
+# 64-bit and 32-bit programs register under separate views of HKLM.
+_UNINSTALL_KEYS = (
+    r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
+    r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall",
+)
+
+
+# === SENSOR_COPY_BLOCK START ===
+_NO_RESULTS_ROW = "[no results]" + "\t" * 2
+_PARTIAL_ROW = "[partial results]\tTruncated\t{} packages not listed"
+_MAX_OUTPUT_BYTES = 262144
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+_errors: dict[str, list[Any]] = {}
+# Controls (including the tab delimiter) become "?".
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys((*range(32), 127), "?"))
+
+
+def _emit_error(code: str, message: str) -> None:
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    """Write one line per code (count beyond the first examples) and reset for the next run."""
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
+
+
+def _package_filter(packages: Iterable[str] | str | None) -> frozenset[str] | None:
+    """Normalise the optional filter (a list or a comma-separated string); None keeps every row."""
+    if isinstance(packages, str):
+        packages = packages.split(",")
+    wanted = frozenset(name.strip() for name in packages or () if name.strip())
+    return wanted or None
+
+
+def _iter_package_rows(records: Iterator[tuple[str, str, str]]) -> Iterator[str]:
+    """Yield `package<TAB>version<TAB>status` rows until the output budget is spent."""
+    budget, emitted = _MAX_OUTPUT_BYTES - 64, False
+    try:
+        for record in records:
+            line = "\t".join(value.strip().translate(_SANITIZE_TABLE) for value in record)
+            budget -= len(line.encode()) + 1
+            if budget < 0:
+                # Keep consuming so the marker can say how many rows were dropped.
+                yield _PARTIAL_ROW.format(1 + sum(1 for _ in records))
+                return
+            emitted = True
+            yield line
+        if not emitted:
+            yield _NO_RESULTS_ROW
+    finally:
+        _flush_errors()
+
+
+# === SENSOR_COPY_BLOCK END ===
+
+
+def _value(winreg: Any, key: Any, name: str) -> Any:
+    try:
+        return winreg.QueryValueEx(key, name)[0]
+    except FileNotFoundError:
+        return ""
+
+
+def _uninstall_entries() -> Iterator[dict[str, Any]]:
+    """Yield the DisplayName and DisplayVersion of every Uninstall subkey in both views."""
+    try:
+        import winreg
+    except ImportError as exc:
+        _emit_error(_ERROR_MISSING_DATABASE, f"Registry unavailable: {exc}")
+        return
+    opened = 0
+    for key_path in _UNINSTALL_KEYS:
+        try:
+            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path)
+        except OSError:
+            continue
+        opened += 1
+        with key:
+            for index in itertools.count():
+                try:
+                    name = winreg.EnumKey(key, index)
+                except OSError:
+                    break
+                try:
+                    with winreg.OpenKey(key, name) as subkey:
+                        yield {
+                            value: _value(winreg, subkey, value)
+                            for value in ("DisplayName", "DisplayVersion")
+                        }
+                except OSError as exc:
+                    _emit_error(_ERROR_ENTRY_UNREADABLE, f"Cannot read {key_path}\\{name}: {exc}")
+    if not opened:
+        _emit_error(_ERROR_MISSING_DATABASE, f"Missing registry key: HKLM\\{_UNINSTALL_KEYS[0]}")
+
+
+def _iter_registry_records(
+    entries: Iterable[dict[str, Any]], wanted: frozenset[str] | None
+) -> Iterator[tuple[str, str, str]]:
+    """Keep entries with a DisplayName; updates and components without one are not programs."""
+    for entry in entries:
+        name = str(entry.get("DisplayName") or "")
+        if name and (wanted is None or name in wanted):
+            yield name, str(entry.get("DisplayVersion") or ""), "installed"
+
+
+def iter_sensor_rows(
+    base_dir: str | None = None,
+    *,
+    packages: Iterable[str] | str | None = None,
+    entries: Callable[[], Iterable[dict[str, Any]]] | None = None,
+) -> Iterator[str]:
+    """Yield one row per installed program, optionally filtered by display name."""
+    # The registry always describes the running host, so base_dir is unused.
+    entries = _uninstall_entries if entries is None else entries
+    yield from _iter_package_rows(_iter_registry_records(entries(), _package_filter(packages)))
+
+
+def run_sensor(base_dir: str | None = None, **options: Any) -> str:
+    """Inventory the programs registered under the HKLM Uninstall keys."""
+    return "\n".join(iter_sensor_rows(base_dir, **options))
+
+
+if __name__ == "__main__":
+    print(run_sensor(packages=os.environ.get("CORGE_PACKAGES")))
@@ -2,16 +2,31 @@
 
 from __future__ import annotations
 
+import contextlib
+import errno
+import itertools
+import ntpath
+import os
+import stat
 import sys
+import time
+import zlib
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
+from typing import Any, TextIO
 
 _ERROR_MISSING_USERS = "FOO201"
 _ERROR_ENUMERATION_FAILED = "FOO202"
 _ERROR_KEY_SCAN_FAILED = "FOO203"
+_ERROR_PROFILES_UNREADABLE = "FOO205"
+_ERROR_DEADLINE_EXCEEDED = "FOO206"
+_ERROR_INVALID_OPTION = "FOO207"
+
+# NTFS ACLs have no POSIX mode bits or uid, so those metadata columns stay empty.
+_POSIX_MODES = False
 
 
 def _default_root() -> Path:
-    # Default to the typical Windows system drive root.
     return Path(r"C:\\")
 
 
@@ -19,76 +34,275 @@ def _users_dir(root: Path) -> Path:
     return root / "Users"
 
 
-def _emit_error(code: str, message: str) -> None:
-    sys.stderr.write(f"{code} {message}\n")
+# Controls become "?"; the second table keeps only visible ASCII.
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys((*range(32), 127), "?"))
+_INVISIBLE_TABLE = str.maketrans(dict.fromkeys((*range(33), 127)))
 
 
 def _sanitize_user(value: str) -> str:
-    sanitized_chars: list[str] = []
-    saw_visible = False
+    if not (value.isascii() and value.isprintable()):
+        if not value.encode("ascii", "ignore").decode("ascii").translate(_INVISIBLE_TABLE):
+            return "<unknown>"
+        value = value.encode("ascii", "replace").decode("ascii").translate(_SANITIZE_TABLE)
+    return value.strip() or "<unknown>"
 
-    for char in value:
-        code_point = ord(char)
-        if char in {"\t", "\n", "\r"} or not (32 <= code_point <= 126):
-            sanitized_chars.append("?")
-            continue
 
-        sanitized_chars.append(char)
-        if not char.isspace():
-            saw_visible = True
+# === SENSOR_COPY_BLOCK START ===
+_NO_RESULTS_ROW = "[no results]" + "\t" * 5
+_PARTIAL_ROW = "[partial results]\t{}\t{} users not scanned" + "\t" * 3
+_MAX_OUTPUT_BYTES = 262144
+_WRITE_CHUNK_ROWS = 512
+_KEY_NAMES = frozenset(
+    {"id_dsa", "id_ecdsa", "id_ecdsa_sk", "id_ed25519", "id_ed25519_sk", "id_rsa"}
+)
+_DIR_FD = os.open in os.supports_dir_fd and os.scandir in os.supports_fd
+# `.ssh` is opened without following links.
+_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+# A probe is one list per home, in column order.
+_PROBE_SLOTS = 4
+_TYPES, _OLDEST_MTIME, _EXPOSED, _OWNER_MISMATCH = range(_PROBE_SLOTS)
 
-    sanitized = "".join(sanitized_chars).strip()
-    if not sanitized or not saw_visible:
-        return "<unknown>"
-    return sanitized
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+# code -> [occurrences, first examples...]
+_errors: dict[str, list[Any]] = {}
 
 
-def run_sensor(base_dir: str | None = None) -> str:
-    """Scan each user profile for a private SSH key."""
-    if base_dir is None:
-        root = _default_root()
+def _emit_error(code: str, message: str) -> None:
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    """Write one line per code (count beyond the first examples) and reset for the next run."""
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
+
+
+def _probe_keys(user_dir: str, dir_fd: int | None = None) -> list[Any] | OSError:
+    """List `.ssh` once; return the probe, or the OSError that stopped it."""
+    ssh_dir = os.path.join(user_dir, ".ssh")
+    ssh_fd = None
+    probe: list[Any] = [""] * _PROBE_SLOTS
+    try:
+        if dir_fd is not None:
+            # A `.ssh` linked elsewhere (say to /root/.ssh) is refused: ENOTDIR or ELOOP.
+            ssh_fd = os.open(ssh_dir, os.O_RDONLY | os.O_DIRECTORY | _NOFOLLOW, dir_fd=dir_fd)
+        with os.scandir(ssh_dir if ssh_fd is None else ssh_fd) as entries:
+            keys = sorted(
+                (entry.name[3:].replace("_", "-"), entry.stat(follow_symlinks=False))
+                for entry in entries
+                if entry.name in _KEY_NAMES and entry.is_file(follow_symlinks=False)
+            )
+        stats = [st for _, st in keys]
+        if stats and _POSIX_MODES:
+            home_uid = os.stat(user_dir, dir_fd=dir_fd).st_uid
+            probe[_EXPOSED] = "Yes" if any(st.st_mode & 0o044 for st in stats) else "No"
+            mismatch = any(st.st_uid != home_uid for st in stats)
+            probe[_OWNER_MISMATCH] = "Yes" if mismatch else "No"
+    except (FileNotFoundError, NotADirectoryError):
+        return probe
+    except OSError as exc:
+        if exc.errno == errno.ELOOP:  # macOS's answer for a linked `.ssh`; treated as a file
+            return probe
+        _emit_error(_ERROR_KEY_SCAN_FAILED, f"Cannot determine key status for {user_dir}: {exc}")
+        return exc
+    finally:
+        if ssh_fd is not None:
+            os.close(ssh_fd)
+    probe[_TYPES] = ",".join(kind for kind, _ in keys)
+    if stats:
+        probe[_OLDEST_MTIME] = min(int(st.st_mtime) for st in stats)
+    return probe
+
+
+def _format_row(user_name: str, probe: list[Any] | OSError | str) -> str:
+    """Render a probe, a skip status or a failed probe (empty columns) as one row."""
+    columns = list(probe) if isinstance(probe, list) else [""] * _PROBE_SLOTS
+    if columns[_OLDEST_MTIME] != "":
+        age_days = int(time.time() - columns[_OLDEST_MTIME]) // 86400
+        columns[_OLDEST_MTIME] = str(max(0, age_days))
+    if isinstance(probe, str):
+        status = probe
     else:
-        root = Path(base_dir)
+        status = "Exist" if columns[_TYPES] else "No"
+    return "\t".join((_sanitize_user(user_name), status, *columns))
 
-    users_root = _users_dir(root)
 
-    if not users_root.exists():
-        _emit_error(_ERROR_MISSING_USERS, f"Missing directory: {users_root}")
-        return ""
+def _checked_shard(shard_count: Any, shard_index: Any) -> tuple[int, int]:
+    """The shard options if they name a shard, else a reported fallback to an unsharded scan."""
+    if type(shard_count) is int and shard_count >= 1 and shard_index in range(shard_count):
+        return shard_count, shard_index
+    message = f"Invalid shard_count={shard_count!r}, shard_index={shard_index!r}"
+    _emit_error(_ERROR_INVALID_OPTION, f"{message}; scanning all users")
+    return 1, 0
 
+
+def _iter_user_rows(
+    users_root: str,
+    users: list[tuple[str, ...]],
+    started: float,
+    *,
+    time_budget: float | None = None,
+    shard_count: int = 1,
+    shard_index: int = 0,
+) -> Iterator[str]:
+    """Yield a row per `(label, home[, skip status])` in the selected CRC-32 shard."""
+    shard_count, shard_index = _checked_shard(shard_count, shard_index)
+    if shard_count > 1:
+        users = [
+            user for user in users if zlib.crc32(os.fsencode(user[1])) % shard_count == shard_index
+        ]
+    root_fd = None
+    with contextlib.suppress(OSError):  # without a descriptor, probes use full paths
+        if _DIR_FD:
+            root_fd = os.open(users_root, os.O_RDONLY | os.O_DIRECTORY)
+    deadline = float("inf") if time_budget is None else started + time_budget
+    budget = _MAX_OUTPUT_BYTES - 64  # room for the marker row
     try:
-        user_dirs = sorted(
-            (entry for entry in users_root.iterdir() if entry.is_dir()),
-            key=lambda entry: entry.name,
+        if not users:
+            yield _NO_RESULTS_ROW
+        for index, (user_name, home, *skip) in enumerate(users):
+            if time.monotonic() >= deadline:
+                skipped = len(users) - index
+                _emit_error(_ERROR_DEADLINE_EXCEEDED, f"Time budget exhausted; {skipped} left")
+                yield _PARTIAL_ROW.format("Timeout", skipped)
+                break
+            user_dir = home if root_fd is not None else os.path.join(users_root, home)
+            probe = skip[0] if skip else _probe_keys(user_dir, root_fd)
+            line = _format_row(user_name, probe)
+            budget -= len(line.encode()) + 1
+            if budget < 0:
+                yield _PARTIAL_ROW.format("Truncated", len(users) - index)
+                break
+            yield line
+    finally:
+        if root_fd is not None:
+            os.close(root_fd)
+        _flush_errors()
+
+
+def _env_number(name: str, parse: Callable[[str], Any], default: Any) -> Any:
+    """Parse a `FOO_*` number; unset or malformed (reported) gives the default."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return parse(value)
+    except ValueError:
+        _emit_error(_ERROR_INVALID_OPTION, f"Invalid {name}={value!r}; using {default!r}")
+        return default
+
+
+def _main_options() -> dict[str, Any]:
+    """Read the `FOO_*` environment variables used when the file runs directly."""
+    return {
+        "time_budget": _env_number("FOO_TIME_BUDGET", float, None),
+        "shard_count": _env_number("FOO_SHARD_COUNT", int, 1),
+        "shard_index": _env_number("FOO_SHARD_INDEX", int, 0),
+    }
+
+
+def _write_rows(rows: Iterable[str], stream: TextIO) -> None:
+    rows = iter(rows)
+    while chunk := list(itertools.islice(rows, _WRITE_CHUNK_ROWS)):
+        stream.write("\n".join(chunk) + "\n")
+
+
+# === SENSOR_COPY_BLOCK END ===
+
+
+def _list_user_dirs(users_root: Path) -> list[str]:
+    """List profile directories, skipping junctions and symlinks (reparse points)."""
+    # `All Users`, `Default User` and similar junctions are not profiles; the attributes of
+    # DirEntry.stat(follow_symlinks=False) come from the FindFirstFile data at no cost.
+    with os.scandir(users_root) as entries:
+        return sorted(
+            entry.name
+            for entry in entries
+            if entry.is_dir(follow_symlinks=False)
+            and not getattr(entry.stat(follow_symlinks=False), "st_file_attributes", 0)
+            & stat.FILE_ATTRIBUTE_REPARSE_POINT
         )
+
+
+_PROFILE_LIST = r"SOFTWARE\Microsoft\Windows NT\CurrentVersion\ProfileList"
+
+
+def _registry_profiles() -> dict[str, str]:
+    """Read `{SID: ProfileImagePath}` from the ProfileList key in one pass."""
+    import winreg  # Windows-only; tests inject a stand-in reader
+
+    profiles = {}
+    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, _PROFILE_LIST) as key:
+        for index in range(winreg.QueryInfoKey(key)[0]):
+            sid = winreg.EnumKey(key, index)
+            with contextlib.suppress(OSError), winreg.OpenKey(key, sid) as profile:
+                profiles[sid] = winreg.QueryValueEx(profile, "ProfileImagePath")[0]
+    return profiles
+
+
+def _profile_users(
+    read_profiles: Callable[[], dict[str, str]], rebase: bool
+) -> list[tuple[str, ...]] | None:
+    try:
+        profiles = read_profiles()
+    except OSError as exc:
+        _emit_error(_ERROR_PROFILES_UNREADABLE, f"Unable to read ProfileList: {exc}")
+        _flush_errors()
+        return None
+
+    # One row per profile folder; `<SID>.bak` copies sort after the SID they shadow.
+    homes: dict[str, tuple[str, str]] = {}
+    for _, image_path in sorted(profiles.items()):
+        path = ntpath.expandvars(str(image_path))
+        parts = [part for part in ntpath.splitdrive(path)[1].split("\\") if part]
+        if parts:
+            home = os.path.join(*parts) if rebase else path
+            homes.setdefault(path.lower(), (parts[-1], home))
+    return sorted(homes.values())
+
+
+def iter_sensor_rows(
+    base_dir: str | None = None,
+    *,
+    discovery: str = "users",
+    read_profiles: Callable[[], dict[str, str]] | None = None,
+    **options: Any,
+) -> Iterator[str]:
+    """Yield one row per profile as it is scanned (`discovery="users"` or `"profiles"`)."""
+    started = time.monotonic()
+    root = _default_root() if base_dir is None else Path(base_dir)
+    if discovery == "profiles":
+        # Outside the live drive root, profile paths are re-rooted beneath base_dir.
+        users = _profile_users(read_profiles or _registry_profiles, base_dir is not None)
+        if users is not None:
+            yield from _iter_user_rows(str(root), users, started, **options)
+        return
+
+    users_root = _users_dir(root)
+    try:
+        user_names = _list_user_dirs(users_root)
+    except FileNotFoundError:
+        _emit_error(_ERROR_MISSING_USERS, f"Missing directory: {users_root}")
+        _flush_errors()
+        return
     except OSError as exc:
         _emit_error(_ERROR_ENUMERATION_FAILED, f"Unable to enumerate {users_root}: {exc}")
-        return ""
-
-    # === SENSOR_COPY_BLOCK START ===
-    results: list[str] = []
-
-    for user_dir in user_dirs:
-        ssh_dir = user_dir / ".ssh"
-        key_file = ssh_dir / "id_ed25519"
-        try:
-            key_exists = key_file.is_file()
-        except OSError as exc:
-            _emit_error(
-                _ERROR_KEY_SCAN_FAILED, f"Cannot determine key status for {user_dir}: {exc}"
-            )
-            key_exists = False
+        _flush_errors()
+        return
 
-        status = "Exist" if key_exists else "No"
-        user_name = _sanitize_user(user_dir.name)
-        results.append(f"{user_name}\t{status}")
+    users = [(name, name) for name in user_names]
+    yield from _iter_user_rows(str(users_root), users, started, **options)
 
-    if results:
-        return "\n".join(results)
 
-    return "[no results]\t"
-    # === SENSOR_COPY_BLOCK END ===
+def run_sensor(base_dir: str | None = None, **options: Any) -> str:
+    """Scan each user profile for a private SSH key."""
+    return "\n".join(iter_sensor_rows(base_dir, **options))
 
 
 if __name__ == "__main__":
-    print(run_sensor())
+    rows = iter_sensor_rows(discovery=os.environ.get("FOO_DISCOVERY", "users"), **_main_options())
+    _write_rows(rows, sys.stdout)
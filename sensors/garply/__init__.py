@@ -0,0 +1 @@
+"""Tanium garply sensor package."""
@@ -0,0 +1,200 @@
+"""Linux Tanium sensor listing listening TCP sockets from /proc/net without spawning ss."""
+
+from __future__ import annotations
+
+import os
+import socket
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+_ERROR_MISSING_TABLES = "GARPLY001"
+_ERROR_TABLE_UNREADABLE = "GARPLY002"
+_ERROR_MALFORMED_ROW = "GARPLY003"
+_ERROR_FDS_UNREADABLE = "GARPLY004"
+_LISTEN = b"0A"
+_BATCH_ROWS = 4096
+_READ_BUFFER = 1 << 20
+# (table, hex digits per address, family); a missing tcp6 only means IPv6 is disabled.
+_TABLES = (("tcp", 8, socket.AF_INET), ("tcp6", 32, socket.AF_INET6))
+
+
+def _default_root() -> Path:
+    return Path("/")
+
+
+def _proc_dir(root: Path) -> Path:
+    return root / "proc"
+
+
+# === SENSOR_COPY_BLOCK START ===
+_NO_RESULTS_ROW = "[no results]" + "\t" * 4
+_PARTIAL_ROW = "[partial results]\tTruncated: {} sockets not listed\t\t\t"
+_MAX_OUTPUT_BYTES = 262144
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+_errors: dict[str, list[Any]] = {}
+# Controls (including the tab delimiter) become "?".
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys((*range(32), 127), "?"))
+
+
+def _emit_error(code: str, message: str) -> None:
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    """Write one line per code (count beyond the first examples) and reset for the next run."""
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
+
+
+def _iter_socket_rows(records: list[tuple[str, str, int, int | str, int | str]]) -> Iterator[str]:
+    """Yield `protocol<TAB>address<TAB>port<TAB>uid<TAB>pid` rows until the output budget is spent."""
+    budget = _MAX_OUTPUT_BYTES - 64
+    try:
+        for index, (protocol, address, port, uid, pid) in enumerate(records):
+            line = f"{protocol}\t{address.translate(_SANITIZE_TABLE)}\t{port}\t{uid}\t{pid}"
+            budget -= len(line.encode()) + 1
+            if budget < 0:
+                yield _PARTIAL_ROW.format(len(records) - index)
+                return
+            yield line
+        if not records:
+            yield _NO_RESULTS_ROW
+    finally:
+        _flush_errors()
+
+
+# === SENSOR_COPY_BLOCK END ===
+
+
+def _iter_listen_lines(lines: Iterable[bytes], hex_len: int) -> Iterator[tuple[int, bytes]]:
+    """Yield `(colon, line)` for LISTEN rows, judged by two bytes before anything is decoded."""
+    # `sl` widens past 9999 rows, so offsets count from the colon that ends it.
+    state_at = 2 * hex_len + 14
+    for line in lines:
+        colon = line.find(b":")
+        if line[colon + state_at : colon + state_at + 2] == _LISTEN:
+            yield colon, line
+
+
+def _unhex(fields: Iterable[bytes]) -> bytes:
+    return bytes.fromhex(b"".join(fields).decode("ascii"))
+
+
+def _decode_rows(
+    protocol: str, rows: list[tuple[int, bytes]], hex_len: int, family: int
+) -> list[tuple[str, str, int, int, int]]:
+    """Decode `(protocol, address, port, uid, inode)` with one `bytes.fromhex` per column."""
+    try:
+        addresses = array("I", _unhex(line[c + 2 : c + 2 + hex_len] for c, line in rows))
+        ports = array("H", _unhex(line[c + 3 + hex_len : c + 7 + hex_len] for c, line in rows))
+        # fromhex skips whitespace, so a short field only shows up in the decoded length.
+        if len(addresses) * 8 != len(rows) * hex_len or len(ports) != len(rows):
+            raise ValueError("truncated address field")
+        # uid and inode follow the queue, timer and retransmit fields.
+        tails = [line[c + 2 * hex_len + 17 :].split(None, 6) for c, line in rows]
+        owners = [(int(tail[3]), int(tail[5])) for tail in tails]
+    except (ValueError, IndexError) as exc:
+        if len(rows) == 1:
+            _emit_error(_ERROR_MALFORMED_ROW, f"Malformed {protocol} row: {exc}")
+            return []
+        # Decode row by row so one bad line costs only itself.
+        return [record for row in rows for record in _decode_rows(protocol, [row], hex_len, family)]
+    # The kernel prints each 32-bit address word and the port as host-order numbers.
+    if sys.byteorder == "little":
+        addresses.byteswap()
+        ports.byteswap()
+    packed, width = addresses.tobytes(), hex_len // 2
+    return [
+        (protocol, socket.inet_ntop(family, packed[i * width : i * width + width]), port, *owner)
+        for i, (port, owner) in enumerate(zip(ports, owners, strict=True))
+    ]
+
+
+def _read_listeners(net_dir: Path) -> list[tuple[str, str, int, int, int]] | None:
+    """Stream each table in binary; None when neither table could be read."""
+    records: list[tuple[str, str, int, int, int]] = []
+    missing, read = [], 0
+    for protocol, hex_len, family in _TABLES:
+        path = net_dir / protocol
+        try:
+            with open(path, "rb", buffering=_READ_BUFFER) as handle:
+                next(handle, None)  # column header
+                batch: list[tuple[int, bytes]] = []
+                for row in _iter_listen_lines(handle, hex_len):
+                    batch.append(row)
+                    if len(batch) == _BATCH_ROWS:
+                        records += _decode_rows(protocol, batch, hex_len, family)
+                        batch = []
+                records += _decode_rows(protocol, batch, hex_len, family) if batch else []
+            read += 1
+        except FileNotFoundError:
+            missing.append(str(path))
+        except OSError as exc:
+            _emit_error(_ERROR_TABLE_UNREADABLE, f"Unable to read {path}: {exc}")
+    if len(missing) == len(_TABLES):
+        _emit_error(_ERROR_MISSING_TABLES, f"Missing socket tables: {', '.join(missing)}")
+    return records if read else None
+
+
+def _socket_owners(proc_dir: Path, inodes: set[int]) -> dict[int, int]:
+    """Map each inode to the lowest pid holding it, stopping once every inode is found."""
+    wanted = {f"socket:[{inode}]": inode for inode in inodes if inode}
+    owners: dict[int, int] = {}
+    try:
+        with os.scandir(proc_dir) as entries:
+            pids = sorted(int(entry.name) for entry in entries if entry.name.isdigit())
+    except OSError as exc:
+        _emit_error(_ERROR_FDS_UNREADABLE, f"Unable to enumerate {proc_dir}: {exc}")
+        return owners
+    for pid in pids:
+        if len(owners) == len(wanted):
+            break
+        fd_dir = f"{proc_dir}/{pid}/fd"
+        try:
+            with os.scandir(fd_dir) as fds:
+                for fd in fds:
+                    try:
+                        inode = wanted.get(os.readlink(fd.path))
+                    except FileNotFoundError:
+                        continue  # closed since the listing
+                    if inode is not None:
+                        owners.setdefault(inode, pid)
+        except (FileNotFoundError, ProcessLookupError):
+            continue  # the process exited
+        except OSError as exc:
+            _emit_error(_ERROR_FDS_UNREADABLE, f"Unable to list {fd_dir}: {exc}")
+    return owners
+
+
+def iter_sensor_rows(base_dir: str | None = None, *, owners: bool = False) -> Iterator[str]:
+    """Yield one row per listening TCP socket; with `owners`, also walk /proc/<pid>/fd for pids."""
+    proc_dir = _proc_dir(_default_root() if base_dir is None else Path(base_dir))
+    listeners = _read_listeners(proc_dir / "net")
+    if listeners is None:
+        _flush_errors()
+        return
+    pids = _socket_owners(proc_dir, {inode for *_, inode in listeners}) if owners else {}
+    records: list[tuple[str, str, int, int | str, int | str]] = sorted(
+        (
+            (protocol, address, port, uid, pids.get(inode, ""))
+            for protocol, address, port, uid, inode in listeners
+        ),
+        key=lambda record: (record[0], record[2], record[1]),
+    )
+    yield from _iter_socket_rows(records)
+
+
+def run_sensor(base_dir: str | None = None, **options: Any) -> str:
+    """List the listening TCP sockets in /proc/net."""
+    return "\n".join(iter_sensor_rows(base_dir, **options))
+
+
+if __name__ == "__main__":
+    print(run_sensor(owners=os.environ.get("GARPLY_OWNERS", "") not in ("", "0")))
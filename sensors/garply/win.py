@@ -0,0 +1,124 @@
+"""Windows Tanium sensor listing listening TCP sockets through iphlpapi without spawning netstat."""
+
+from __future__ import annotations
+
+import ctypes
+import socket
+import struct
+import sys
+from collections.abc import Iterator
+from typing import Any
+
+_ERROR_IPHLPAPI_UNAVAILABLE = "GARPLY101"
+_ERROR_TABLE_FAILED = "GARPLY102"
+_TCP_TABLE_OWNER_PID_LISTENER = 3
+_ERROR_INSUFFICIENT_BUFFER = 122
+_TABLE_BYTES = 16384
+# (table, Windows AF_*, family for inet_ntop, MIB_TCPROW_OWNER_PID or MIB_TCP6ROW_OWNER_PID).
+# Addresses and ports are in network byte order, so they are sliced as bytes, not DWORDs.
+_TABLES = (
+    ("tcp", 2, socket.AF_INET, struct.Struct("<4x4s2s2x4x4xI")),
+    ("tcp6", 23, socket.AF_INET6, struct.Struct("<16s4x2s2x16x4x4x4xI")),
+)
+
+
+# === SENSOR_COPY_BLOCK START ===
+_NO_RESULTS_ROW = "[no results]" + "\t" * 4
+_PARTIAL_ROW = "[partial results]\tTruncated: {} sockets not listed\t\t\t"
+_MAX_OUTPUT_BYTES = 262144
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+_errors: dict[str, list[Any]] = {}
+# Controls (including the tab delimiter) become "?".
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys((*range(32), 127), "?"))
+
+
+def _emit_error(code: str, message: str) -> None:
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    """Write one line per code (count beyond the first examples) and reset for the next run."""
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
+
+
+def _iter_socket_rows(records: list[tuple[str, str, int, int | str, int | str]]) -> Iterator[str]:
+    """Yield `protocol<TAB>address<TAB>port<TAB>uid<TAB>pid` rows until the output budget is spent."""
+    budget = _MAX_OUTPUT_BYTES - 64
+    try:
+        for index, (protocol, address, port, uid, pid) in enumerate(records):
+            line = f"{protocol}\t{address.translate(_SANITIZE_TABLE)}\t{port}\t{uid}\t{pid}"
+            budget -= len(line.encode()) + 1
+            if budget < 0:
+                yield _PARTIAL_ROW.format(len(records) - index)
+                return
+            yield line
+        if not records:
+            yield _NO_RESULTS_ROW
+    finally:
+        _flush_errors()
+
+
+# === SENSOR_COPY_BLOCK END ===
+
+
+def _iphlpapi() -> Any:
+    return ctypes.WinDLL("iphlpapi")
+
+
+def _listener_table(iphlpapi: Any, family: int) -> bytes:
+    """Fetch one listener table, growing the buffer while the table grows between calls."""
+    size = ctypes.c_uint32(_TABLE_BYTES)
+    while True:
+        buffer = ctypes.create_string_buffer(size.value)
+        result = iphlpapi.GetExtendedTcpTable(
+            buffer, ctypes.pointer(size), False, family, _TCP_TABLE_OWNER_PID_LISTENER, 0
+        )
+        if result == 0:
+            return buffer.raw
+        if result != _ERROR_INSUFFICIENT_BUFFER:
+            raise OSError(result, "GetExtendedTcpTable failed")
+
+
+def _iter_listeners(iphlpapi: Any) -> Iterator[tuple[str, str, int, str, int]]:
+    for protocol, family, ntop_family, row in _TABLES:
+        table = _listener_table(iphlpapi, family)
+        count = int.from_bytes(table[:4], "little")
+        # One struct pass decodes every row of the table.
+        for address, port, pid in row.iter_unpack(table[4 : 4 + count * row.size]):
+            address = socket.inet_ntop(ntop_family, address)
+            yield protocol, address, int.from_bytes(port, "big"), "", pid
+
+
+def iter_sensor_rows(
+    base_dir: str | None = None, *, owners: bool = False, iphlpapi: Any = None
+) -> Iterator[str]:
+    """Yield one row per listening TCP socket; the table carries the owning pid on Windows."""
+    # The tables always describe the running host, so base_dir is unused.
+    try:
+        iphlpapi = _iphlpapi() if iphlpapi is None else iphlpapi
+        records = sorted(
+            _iter_listeners(iphlpapi), key=lambda record: (record[0], record[2], record[1])
+        )
+    except AttributeError as exc:
+        _emit_error(_ERROR_IPHLPAPI_UNAVAILABLE, f"iphlpapi unavailable: {exc}")
+        _flush_errors()
+        return
+    except OSError as exc:
+        _emit_error(_ERROR_TABLE_FAILED, f"Unable to read the TCP listener table: {exc}")
+        _flush_errors()
+        return
+    yield from _iter_socket_rows(records)
+
+
+def run_sensor(base_dir: str | None = None, **options: Any) -> str:
+    """List the listening TCP sockets in the iphlpapi listener tables."""
+    return "\n".join(iter_sensor_rows(base_dir, **options))
+
+
+if __name__ == "__main__":
+    print(run_sensor())
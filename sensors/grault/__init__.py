@@ -0,0 +1 @@
+"""Tanium grault sensor package."""
@@ -0,0 +1,142 @@
+"""Linux Tanium sensor listing running processes from /proc without spawning ps."""
+
+from __future__ import annotations
+
+import os
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+_ERROR_MISSING_PROC = "GRAULT001"
+_ERROR_ENUMERATION_FAILED = "GRAULT002"
+_ERROR_PROCESS_UNREADABLE = "GRAULT003"
+_READ_BYTES = 4096
+# The kernel cuts comm at 15 bytes; only then is cmdline read for the full name.
+_TASK_COMM_LEN = 15
+# rss (field 24 of /proc/<pid>/stat, in pages) counted from the state field.
+_RSS_FIELD = 21
+
+
+def _default_root() -> Path:
+    return Path("/")
+
+
+def _proc_dir(root: Path) -> Path:
+    return root / "proc"
+
+
+# === SENSOR_COPY_BLOCK START ===
+_NO_RESULTS_ROW = "[no results]" + "\t" * 4
+_PARTIAL_ROW = "[partial results]\t\t\t\tTruncated: {} processes not listed"
+_MAX_OUTPUT_BYTES = 262144
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+_errors: dict[str, list[Any]] = {}
+# Controls (including the tab delimiter) become "?".
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys((*range(32), 127), "?"))
+
+
+def _emit_error(code: str, message: str) -> None:
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    """Write one line per code (count beyond the first examples) and reset for the next run."""
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
+
+
+def _iter_process_rows(records: Iterator[tuple[int, int, str, int | str, str]]) -> Iterator[str]:
+    """Yield `pid<TAB>ppid<TAB>state<TAB>rss_kb<TAB>comm` rows until the output budget is spent."""
+    budget, emitted = _MAX_OUTPUT_BYTES - 64, False
+    try:
+        for pid, ppid, state, rss_kb, comm in records:
+            line = f"{pid}\t{ppid}\t{state}\t{rss_kb}\t{comm.translate(_SANITIZE_TABLE)}"
+            budget -= len(line.encode()) + 1
+            if budget < 0:
+                # Keep consuming so the marker can say how many rows were dropped.
+                yield _PARTIAL_ROW.format(1 + sum(1 for _ in records))
+                return
+            emitted = True
+            yield line
+        if not emitted:
+            yield _NO_RESULTS_ROW
+    finally:
+        _flush_errors()
+
+
+# === SENSOR_COPY_BLOCK END ===
+
+
+def _list_pids(proc_dir: Path) -> list[int]:
+    with os.scandir(proc_dir) as entries:
+        return sorted(int(entry.name) for entry in entries if entry.name.isdigit())
+
+
+def _read_into(path: str, buffer: bytearray) -> int:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.readv(fd, [buffer])
+    finally:
+        os.close(fd)
+
+
+def _iter_proc_records(
+    proc_dir: str, pids: list[int], page_kb: int
+) -> Iterator[tuple[int, int, str, int | str, str]]:
+    """Parse each `stat` from one reused buffer; a process that exits mid-scan is skipped."""
+    buffer = bytearray(_READ_BYTES)
+    for pid in pids:
+        prefix = f"{proc_dir}/{pid}/"
+        try:
+            size = _read_into(prefix + "stat", buffer)
+            # comm may hold spaces and parentheses, so split at the last ")".
+            close = buffer.rindex(b")", 0, size)
+            comm = buffer[buffer.index(b"(", 0, close) + 1 : close]
+            fields = buffer[close + 2 : size].split(None, _RSS_FIELD + 1)
+            state, ppid, rss = (
+                fields[0].decode("ascii", "replace"),
+                int(fields[1]),
+                int(fields[_RSS_FIELD]),
+            )
+            if len(comm) == _TASK_COMM_LEN:
+                size = _read_into(prefix + "cmdline", buffer)
+                argv0 = buffer[:size].split(b"\0", 1)[0].rsplit(b"/", 1)[-1]
+                comm = argv0 if argv0.startswith(comm) else comm
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+        except (OSError, ValueError, IndexError) as exc:
+            _emit_error(_ERROR_PROCESS_UNREADABLE, f"Cannot parse {prefix}stat: {exc}")
+            continue
+        yield pid, ppid, state, rss * page_kb, comm.decode("utf-8", "replace")
+
+
+def iter_sensor_rows(base_dir: str | None = None, *, page_kb: int | None = None) -> Iterator[str]:
+    """Yield one row per process directory under /proc, in pid order."""
+    root = _default_root() if base_dir is None else Path(base_dir)
+    proc_dir = _proc_dir(root)
+    try:
+        pids = _list_pids(proc_dir)
+    except FileNotFoundError:
+        _emit_error(_ERROR_MISSING_PROC, f"Missing directory: {proc_dir}")
+        _flush_errors()
+        return
+    except OSError as exc:
+        _emit_error(_ERROR_ENUMERATION_FAILED, f"Unable to enumerate {proc_dir}: {exc}")
+        _flush_errors()
+        return
+    page_kb = os.sysconf("SC_PAGE_SIZE") // 1024 if page_kb is None else page_kb
+    yield from _iter_process_rows(_iter_proc_records(str(proc_dir), pids, page_kb))
+
+
+def run_sensor(base_dir: str | None = None, **options: Any) -> str:
+    """List the processes under /proc."""
+    return "\n".join(iter_sensor_rows(base_dir, **options))
+
+
+if __name__ == "__main__":
+    print(run_sensor())
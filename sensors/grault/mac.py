@@ -0,0 +1,151 @@
+"""macOS Tanium sensor listing running processes through libproc without spawning ps."""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import sys
+from collections.abc import Iterator
+from typing import Any
+
+_ERROR_LIBPROC_UNAVAILABLE = "GRAULT201"
+_ERROR_ENUMERATION_FAILED = "GRAULT202"
+_ERROR_PROCESS_UNREADABLE = "GRAULT203"
+_PROC_PIDTBSDINFO = 3
+_PROC_PIDTASKINFO = 4
+# p_stat values from <sys/proc.h>: SIDL, SRUN, SSLEEP, SSTOP, SZOMB.
+_STATES = {1: "I", 2: "R", 3: "S", 4: "T", 5: "Z"}
+
+
+class _BsdInfo(ctypes.Structure):
+    """struct proc_bsdinfo from <sys/proc_info.h> (136 bytes)."""
+
+    _fields_ = [
+        *((name, ctypes.c_uint32) for name in ("flags", "status", "xstatus", "pid", "ppid")),
+        *((name, ctypes.c_uint32) for name in ("uid", "gid", "ruid", "rgid", "svuid", "svgid")),
+        ("rfu_1", ctypes.c_uint32),
+        ("comm", ctypes.c_char * 16),
+        ("name", ctypes.c_char * 32),
+        *((name, ctypes.c_uint32) for name in ("nfiles", "pgid", "pjobc", "tdev", "tpgid")),
+        ("nice", ctypes.c_int32),
+        ("start_tvsec", ctypes.c_uint64),
+        ("start_tvusec", ctypes.c_uint64),
+    ]
+
+
+class _TaskInfo(ctypes.Structure):
+    """struct proc_taskinfo (96 bytes); only the resident size is read."""
+
+    _fields_ = [
+        ("virtual_size", ctypes.c_uint64),
+        ("resident_size", ctypes.c_uint64),
+        ("rest", ctypes.c_uint8 * 80),
+    ]
+
+
+# === SENSOR_COPY_BLOCK START ===
+_NO_RESULTS_ROW = "[no results]" + "\t" * 4
+_PARTIAL_ROW = "[partial results]\t\t\t\tTruncated: {} processes not listed"
+_MAX_OUTPUT_BYTES = 262144
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+_errors: dict[str, list[Any]] = {}
+# Controls (including the tab delimiter) become "?".
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys((*range(32), 127), "?"))
+
+
+def _emit_error(code: str, message: str) -> None:
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    """Write one line per code (count beyond the first examples) and reset for the next run."""
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
+
+
+def _iter_process_rows(records: Iterator[tuple[int, int, str, int | str, str]]) -> Iterator[str]:
+    """Yield `pid<TAB>ppid<TAB>state<TAB>rss_kb<TAB>comm` rows until the output budget is spent."""
+    budget, emitted = _MAX_OUTPUT_BYTES - 64, False
+    try:
+        for pid, ppid, state, rss_kb, comm in records:
+            line = f"{pid}\t{ppid}\t{state}\t{rss_kb}\t{comm.translate(_SANITIZE_TABLE)}"
+            budget -= len(line.encode()) + 1
+            if budget < 0:
+                # Keep consuming so the marker can say how many rows were dropped.
+                yield _PARTIAL_ROW.format(1 + sum(1 for _ in records))
+                return
+            emitted = True
+            yield line
+        if not emitted:
+            yield _NO_RESULTS_ROW
+    finally:
+        _flush_errors()
+
+
+# === SENSOR_COPY_BLOCK END ===
+
+
+def _libproc() -> Any:
+    # proc_listallpids and proc_pidinfo live in libSystem, which CDLL(None) already exposes.
+    return ctypes.CDLL(None, use_errno=True)
+
+
+def _list_pids(libproc: Any) -> list[int]:
+    count = libproc.proc_listallpids(None, 0)
+    if count > 0:
+        # Leave headroom for processes started between the two calls.
+        pids = (ctypes.c_int * (count + 64))()
+        count = libproc.proc_listallpids(pids, ctypes.sizeof(pids))
+    if count <= 0:
+        raise OSError(ctypes.get_errno(), "proc_listallpids failed")
+    return sorted(pids[:count])
+
+
+def _iter_libproc_records(
+    libproc: Any, pids: list[int]
+) -> Iterator[tuple[int, int, str, int | str, str]]:
+    """Fill one reused proc_bsdinfo and proc_taskinfo per pid; exited processes are skipped."""
+    bsd, task = _BsdInfo(), _TaskInfo()
+    bsd_ref, task_ref = ctypes.pointer(bsd), ctypes.pointer(task)
+    bsd_size, task_size = ctypes.sizeof(bsd), ctypes.sizeof(task)
+    for pid in pids:
+        if libproc.proc_pidinfo(pid, _PROC_PIDTBSDINFO, 0, bsd_ref, bsd_size) != bsd_size:
+            error = ctypes.get_errno()
+            if error not in (0, errno.ESRCH):
+                _emit_error(_ERROR_PROCESS_UNREADABLE, f"proc_pidinfo({pid}) failed: errno {error}")
+            continue
+        # Task info of other users' processes needs root; the RSS cell is then left empty.
+        taskinfo = libproc.proc_pidinfo(pid, _PROC_PIDTASKINFO, 0, task_ref, task_size)
+        rss_kb = task.resident_size // 1024 if taskinfo == task_size else ""
+        name = (bsd.name or bsd.comm).decode("utf-8", "replace")
+        yield pid, bsd.ppid, _STATES.get(bsd.status, "?"), rss_kb, name
+
+
+def iter_sensor_rows(base_dir: str | None = None, *, libproc: Any = None) -> Iterator[str]:
+    """Yield one row per process reported by libproc, in pid order."""
+    # libproc always describes the running host, so base_dir is unused.
+    try:
+        libproc = _libproc() if libproc is None else libproc
+        pids = _list_pids(libproc)
+    except AttributeError as exc:
+        _emit_error(_ERROR_LIBPROC_UNAVAILABLE, f"libproc unavailable: {exc}")
+        _flush_errors()
+        return
+    except OSError as exc:
+        _emit_error(_ERROR_ENUMERATION_FAILED, f"Unable to enumerate processes: {exc}")
+        _flush_errors()
+        return
+    yield from _iter_process_rows(_iter_libproc_records(libproc, pids))
+
+
+def run_sensor(base_dir: str | None = None, **options: Any) -> str:
+    """List the processes known to libproc."""
+    return "\n".join(iter_sensor_rows(base_dir, **options))
+
+
+if __name__ == "__main__":
+    print(run_sensor())
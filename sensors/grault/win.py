@@ -0,0 +1,167 @@
+"""Windows Tanium sensor listing running processes through Toolhelp32 without spawning tasklist."""
+
+from __future__ import annotations
+
+import ctypes
+import sys
+from collections.abc import Iterator
+from typing import Any
+
+_ERROR_TOOLHELP_UNAVAILABLE = "GRAULT101"
+_ERROR_SNAPSHOT_FAILED = "GRAULT102"
+_TH32CS_SNAPPROCESS = 0x2
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+
+class _ProcessEntry(ctypes.Structure):
+    """PROCESSENTRY32W from <tlhelp32.h>."""
+
+    _fields_ = [
+        ("dwSize", ctypes.c_uint32),
+        ("cntUsage", ctypes.c_uint32),
+        ("th32ProcessID", ctypes.c_uint32),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", ctypes.c_uint32),
+        ("cntThreads", ctypes.c_uint32),
+        ("th32ParentProcessID", ctypes.c_uint32),
+        ("pcPriClassBase", ctypes.c_int32),
+        ("dwFlags", ctypes.c_uint32),
+        ("szExeFile", ctypes.c_wchar * 260),
+    ]
+
+
+class _MemoryCounters(ctypes.Structure):
+    """PROCESS_MEMORY_COUNTERS from <psapi.h>; only WorkingSetSize is read."""
+
+    _fields_ = [
+        ("cb", ctypes.c_uint32),
+        ("PageFaultCount", ctypes.c_uint32),
+        ("PeakWorkingSetSize", ctypes.c_size_t),
+        ("WorkingSetSize", ctypes.c_size_t),
+        ("rest", ctypes.c_size_t * 6),
+    ]
+
+
+# === SENSOR_COPY_BLOCK START ===
+_NO_RESULTS_ROW = "[no results]" + "\t" * 4
+_PARTIAL_ROW = "[partial results]\t\t\t\tTruncated: {} processes not listed"
+_MAX_OUTPUT_BYTES = 262144
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+_errors: dict[str, list[Any]] = {}
+# Controls (including the tab delimiter) become "?".
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys((*range(32), 127), "?"))
+
+
+def _emit_error(code: str, message: str) -> None:
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    """Write one line per code (count beyond the first examples) and reset for the next run."""
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
+
+
+def _iter_process_rows(records: Iterator[tuple[int, int, str, int | str, str]]) -> Iterator[str]:
+    """Yield `pid<TAB>ppid<TAB>state<TAB>rss_kb<TAB>comm` rows until the output budget is spent."""
+    budget, emitted = _MAX_OUTPUT_BYTES - 64, False
+    try:
+        for pid, ppid, state, rss_kb, comm in records:
+            line = f"{pid}\t{ppid}\t{state}\t{rss_kb}\t{comm.translate(_SANITIZE_TABLE)}"
+            budget -= len(line.encode()) + 1
+            if budget < 0:
+                # Keep consuming so the marker can say how many rows were dropped.
+                yield _PARTIAL_ROW.format(1 + sum(1 for _ in records))
+                return
+            emitted = True
+            yield line
+        if not emitted:
+            yield _NO_RESULTS_ROW
+    finally:
+        _flush_errors()
+
+
+# === SENSOR_COPY_BLOCK END ===
+
+
+def _kernel32() -> Any:
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    # HANDLE is pointer-sized; the default int restype would truncate it on 64-bit hosts.
+    kernel32.CreateToolhelp32Snapshot.restype = ctypes.c_void_p
+    kernel32.OpenProcess.restype = ctypes.c_void_p
+    kernel32.CloseHandle.argtypes = (ctypes.c_void_p,)
+    entry = ctypes.POINTER(_ProcessEntry)
+    kernel32.Process32FirstW.argtypes = kernel32.Process32NextW.argtypes = (ctypes.c_void_p, entry)
+    kernel32.K32GetProcessMemoryInfo.argtypes = (
+        ctypes.c_void_p,
+        ctypes.POINTER(_MemoryCounters),
+        ctypes.c_uint32,
+    )
+    return kernel32
+
+
+def _snapshot(kernel32: Any) -> list[tuple[int, int, str]]:
+    """Return `(pid, ppid, exe)` for every process in one Toolhelp32 snapshot, in pid order."""
+    handle = kernel32.CreateToolhelp32Snapshot(_TH32CS_SNAPPROCESS, 0)
+    if handle in (None, _INVALID_HANDLE_VALUE):
+        raise OSError(ctypes.get_last_error(), "CreateToolhelp32Snapshot failed")
+    try:
+        entry = _ProcessEntry(dwSize=ctypes.sizeof(_ProcessEntry))
+        entry_ref, processes = ctypes.pointer(entry), []
+        more = kernel32.Process32FirstW(handle, entry_ref)
+        while more:
+            processes.append((entry.th32ProcessID, entry.th32ParentProcessID, entry.szExeFile))
+            more = kernel32.Process32NextW(handle, entry_ref)
+    finally:
+        kernel32.CloseHandle(handle)
+    return sorted(processes)
+
+
+def _iter_toolhelp_records(
+    kernel32: Any, processes: list[tuple[int, int, str]]
+) -> Iterator[tuple[int, int, str, int | str, str]]:
+    """Add the working set from one reused counters buffer; Windows has no run state to report."""
+    counters = _MemoryCounters(cb=ctypes.sizeof(_MemoryCounters))
+    counters_ref = ctypes.pointer(counters)
+    for pid, ppid, exe in processes:
+        # Protected and already-exited processes cannot be opened; the RSS cell is left empty.
+        rss_kb: int | str = ""
+        handle = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if handle:
+            try:
+                if kernel32.K32GetProcessMemoryInfo(handle, counters_ref, counters.cb):
+                    rss_kb = counters.WorkingSetSize // 1024
+            finally:
+                kernel32.CloseHandle(handle)
+        yield pid, ppid, "", rss_kb, exe
+
+
+def iter_sensor_rows(base_dir: str | None = None, *, kernel32: Any = None) -> Iterator[str]:
+    """Yield one row per process in a Toolhelp32 snapshot, in pid order."""
+    # The snapshot always describes the running host, so base_dir is unused.
+    try:
+        kernel32 = _kernel32() if kernel32 is None else kernel32
+        processes = _snapshot(kernel32)
+    except AttributeError as exc:
+        _emit_error(_ERROR_TOOLHELP_UNAVAILABLE, f"Toolhelp32 unavailable: {exc}")
+        _flush_errors()
+        return
+    except OSError as exc:
+        _emit_error(_ERROR_SNAPSHOT_FAILED, f"Unable to snapshot processes: {exc}")
+        _flush_errors()
+        return
+    yield from _iter_process_rows(_iter_toolhelp_records(kernel32, processes))
+
+
+def run_sensor(base_dir: str | None = None, **options: Any) -> str:
+    """List the processes in a Toolhelp32 snapshot."""
+    return "\n".join(iter_sensor_rows(base_dir, **options))
+
+
+if __name__ == "__main__":
+    print(run_sensor())
@@ -0,0 +1 @@
+"""Tanium quux sensor package."""
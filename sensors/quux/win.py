@@ -0,0 +1,216 @@
+"""Windows Tanium sensor reporting per-user home directory size from a bounded walk."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import stat
+import sys
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+_ERROR_MISSING_USERS = "QUUX101"
+_ERROR_ENUMERATION_FAILED = "QUUX102"
+_ERROR_WALK_FAILED = "QUUX103"
+_ERROR_DEADLINE_EXCEEDED = "QUUX104"
+_ERROR_INVALID_OPTION = "QUUX105"
+
+
+def _default_root() -> Path:
+    return Path(r"C:\\")
+
+
+def _users_dir(root: Path) -> Path:
+    return root / "Users"
+
+
+# === SENSOR_COPY_BLOCK START ===
+_NO_RESULTS_ROW = "[no results]" + "\t" * 3
+_PARTIAL_ROW = "[partial results]\t\t\t{}: {} users not scanned"
+_MAX_OUTPUT_BYTES = 262144
+_MAX_DEPTH = 64
+_MAX_ENTRIES = 1_000_000
+_TIME_BUDGET = 30.0
+_CLOCK_EVERY = 1024
+# stat.FILE_ATTRIBUTE_REPARSE_POINT: junctions are not followed any more than symlinks.
+_REPARSE_POINT = 0x400
+# Only Windows has the attribute; elsewhere a directory needs no stat to be entered.
+_FILE_ATTRIBUTES = hasattr(os.stat_result, "st_file_attributes")
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+_errors: dict[str, list[Any]] = {}
+
+# Controls become "?"; the second table keeps only visible ASCII.
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys((*range(32), 127), "?"))
+_INVISIBLE_TABLE = str.maketrans(dict.fromkeys((*range(33), 127)))
+
+
+def _sanitize_user(value: str) -> str:
+    if not (value.isascii() and value.isprintable()):
+        if not value.encode("ascii", "ignore").decode("ascii").translate(_INVISIBLE_TABLE):
+            return "<unknown>"
+        value = value.encode("ascii", "replace").decode("ascii").translate(_SANITIZE_TABLE)
+    return value.strip() or "<unknown>"
+
+
+def _emit_error(code: str, message: str) -> None:
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
+
+
+class _BoundedWalk:
+    """Iterate the entries beneath `top` from an explicit scandir stack, never following links.
+
+    Iteration stops at `max_entries` entries or at `deadline` (time.monotonic()), and
+    directories deeper than `max_depth` are not entered. Afterwards `status` is `Complete`,
+    `Truncated(depth|entries|time|unreadable)`, or `Unreadable` when `top` itself cannot be
+    listed; `Truncated(unreadable)` means a subdirectory could not be listed.
+    """
+
+    def __init__(self, top: str, max_depth: int, max_entries: int, deadline: float) -> None:
+        self.top, self.max_depth, self.max_entries = top, max_depth, max_entries
+        self.deadline, self.entries, self.status = deadline, 0, "Complete"
+
+    def _descend(self, entry: os.DirEntry[str]) -> bool:
+        if not entry.is_dir(follow_symlinks=False):
+            return False
+        if not _FILE_ATTRIBUTES:
+            return True
+        return not entry.stat(follow_symlinks=False).st_file_attributes & _REPARSE_POINT
+
+    def _stop(self) -> bool:
+        # The clock is read once per `_CLOCK_EVERY` entries, not per entry.
+        if self.entries >= self.max_entries:
+            self.status = "Truncated(entries)"
+        elif self.entries % _CLOCK_EVERY == 0 and time.monotonic() >= self.deadline:
+            self.status = "Truncated(time)"
+        else:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[os.DirEntry[str]]:
+        stack = [(self.top, 0)]
+        while stack:
+            path, depth = stack.pop()
+            try:
+                with os.scandir(path) as scan:
+                    for entry in scan:
+                        if self._stop():
+                            return
+                        self.entries += 1
+                        yield entry
+                        if not self._descend(entry):
+                            continue
+                        if depth < self.max_depth:
+                            stack.append((entry.path, depth + 1))
+                        else:
+                            self.status = "Truncated(depth)"
+            except OSError as exc:
+                self.status = "Unreadable" if path == self.top else "Truncated(unreadable)"
+                _emit_error(_ERROR_WALK_FAILED, f"Cannot list {path}: {exc}")
+
+
+def _home_usage(home: str, deadline: float, max_depth: int, max_entries: int) -> tuple[str, ...]:
+    walk, total = _BoundedWalk(home, max_depth, max_entries, deadline), 0
+    for entry in walk:
+        # Directory sizes are filesystem bookkeeping; only files and links hold content.
+        if not entry.is_dir(follow_symlinks=False):
+            with contextlib.suppress(OSError):
+                total += entry.stat(follow_symlinks=False).st_size
+    if walk.status == "Unreadable":
+        return ("", "", walk.status)
+    return (str(total), str(walk.entries), walk.status)
+
+
+def _iter_user_rows(
+    users_root: str,
+    names: list[str],
+    *,
+    time_budget: float | None = _TIME_BUDGET,
+    max_depth: int = _MAX_DEPTH,
+    max_entries: int = _MAX_ENTRIES,
+) -> Iterator[str]:
+    # `None` disables the deadline; `0` expires it before the first home.
+    deadline = float("inf") if time_budget is None else time.monotonic() + time_budget
+    budget = _MAX_OUTPUT_BYTES - 64
+    try:
+        if not names:
+            yield _NO_RESULTS_ROW
+        for index, name in enumerate(names):
+            if time.monotonic() >= deadline:
+                _emit_error(
+                    _ERROR_DEADLINE_EXCEEDED, f"Time budget exhausted; {len(names) - index} left"
+                )
+                yield _PARTIAL_ROW.format("Timeout", len(names) - index)
+                break
+            usage = _home_usage(os.path.join(users_root, name), deadline, max_depth, max_entries)
+            line = "\t".join((_sanitize_user(name), *usage))
+            budget -= len(line.encode()) + 1
+            if budget < 0:
+                yield _PARTIAL_ROW.format("Truncated", len(names) - index)
+                break
+            yield line
+    finally:
+        _flush_errors()
+
+
+def _env_number(name: str, parse: Callable[[str], Any], default: Any) -> Any:
+    """Parse a `QUUX_*` number; unset or malformed (reported) gives the default."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return parse(value)
+    except ValueError:
+        _emit_error(_ERROR_INVALID_OPTION, f"Invalid {name}={value!r}; using {default!r}")
+        return default
+
+
+# === SENSOR_COPY_BLOCK END ===
+
+
+def _list_user_dirs(users_root: Path) -> list[str]:
+    # `All Users`, `Default User` and similar junctions are not profiles.
+    with os.scandir(users_root) as entries:
+        return sorted(
+            entry.name
+            for entry in entries
+            if entry.is_dir(follow_symlinks=False)
+            and not getattr(entry.stat(follow_symlinks=False), "st_file_attributes", 0)
+            & stat.FILE_ATTRIBUTE_REPARSE_POINT
+        )
+
+
+def iter_sensor_rows(base_dir: str | None = None, **options: Any) -> Iterator[str]:
+    """Yield one row per Windows profile with its size, entry count, and walk status."""
+    root = _default_root() if base_dir is None else Path(base_dir)
+    users_root = _users_dir(root)
+    try:
+        names = _list_user_dirs(users_root)
+    except FileNotFoundError:
+        _emit_error(_ERROR_MISSING_USERS, f"Missing directory: {users_root}")
+        _flush_errors()
+        return
+    except OSError as exc:
+        _emit_error(_ERROR_ENUMERATION_FAILED, f"Unable to enumerate {users_root}: {exc}")
+        _flush_errors()
+        return
+    yield from _iter_user_rows(str(users_root), names, **options)
+
+
+def run_sensor(base_dir: str | None = None, **options: Any) -> str:
+    """Measure the home directories under C:\\Users."""
+    return "\n".join(iter_sensor_rows(base_dir, **options))
+
+
+if __name__ == "__main__":
+    print(run_sensor(time_budget=_env_number("QUUX_TIME_BUDGET", float, _TIME_BUDGET)))
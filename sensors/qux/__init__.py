@@ -0,0 +1 @@
+"""Tanium qux sensor package."""
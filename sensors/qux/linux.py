@@ -0,0 +1,196 @@
+"""Linux Tanium sensor inventorying per-user SSH authorized_keys entries."""
+
+from __future__ import annotations
+
+import errno
+import os
+import re
+import stat
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+_ERROR_MISSING_USERS = "QUX001"
+_ERROR_ENUMERATION_FAILED = "QUX002"
+_ERROR_KEYS_UNREADABLE = "QUX003"
+
+
+def _default_root() -> Path:
+    return Path("/")
+
+
+def _users_dir(root: Path) -> Path:
+    return root / "home"
+
+
+# === SENSOR_COPY_BLOCK START ===
+_NO_RESULTS_ROW = "[no results]" + "\t" * 4
+_PARTIAL_ROW = "[partial results]\tTruncated\t\t{} users not scanned\t"
+_MAX_OUTPUT_BYTES = 262144
+_CHUNK_BYTES = 65536
+_MAX_FILE_BYTES = 4 * 1024 * 1024
+# A linked file is refused and a FIFO cannot block the open; Windows, lacking
+# O_NOFOLLOW, checks for a link first.
+_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+_OPEN_FLAGS = os.O_RDONLY | _NOFOLLOW | getattr(os, "O_NONBLOCK", 0) | getattr(os, "O_BINARY", 0)
+_KEY_TYPES = frozenset(
+    {
+        b"ssh-rsa",
+        b"ssh-dss",
+        b"ssh-ed25519",
+        b"ecdsa-sha2-nistp256",
+        b"ecdsa-sha2-nistp384",
+        b"ecdsa-sha2-nistp521",
+        b"sk-ssh-ed25519@openssh.com",
+        b"sk-ecdsa-sha2-nistp256@openssh.com",
+    }
+)
+_TRACKED_OPTIONS = frozenset({b"command", b"from"})
+# Quoted option values may hold spaces and commas; blank them before splitting.
+_QUOTED = re.compile(rb'"(?:[^"\\]|\\.)*"?')
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+_errors: dict[str, list[Any]] = {}
+
+# Controls become "?"; the second table keeps only visible ASCII.
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys((*range(32), 127), "?"))
+_INVISIBLE_TABLE = str.maketrans(dict.fromkeys((*range(33), 127)))
+
+
+def _sanitize_user(value: str) -> str:
+    if not (value.isascii() and value.isprintable()):
+        if not value.encode("ascii", "ignore").decode("ascii").translate(_INVISIBLE_TABLE):
+            return "<unknown>"
+        value = value.encode("ascii", "replace").decode("ascii").translate(_SANITIZE_TABLE)
+    return value.strip() or "<unknown>"
+
+
+def _emit_error(code: str, message: str) -> None:
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
+
+
+def _classify_entry(line: bytes, algorithms: set[str], options: set[str]) -> bool:
+    fields = line.split(None, 1)
+    if not fields or fields[0].startswith(b"#"):
+        return False
+    key_type = fields[0]
+    if key_type not in _KEY_TYPES and len(fields) > 1:
+        bare = _QUOTED.sub(b'""', line) if b'"' in line else line
+        prefix, *rest = bare.split(None, 2)
+        names = {option.partition(b"=")[0].strip().lower() for option in prefix.split(b",")}
+        options.update(name.decode() for name in names & _TRACKED_OPTIONS)
+        key_type = rest[0] if rest else b""
+    algorithms.add(key_type.decode() if key_type in _KEY_TYPES else "unknown")
+    return True
+
+
+def _open_nofollow(path: str) -> int | None:
+    """Open `path` for reading; None when it is a symlink, which is never followed."""
+    if not _NOFOLLOW and os.path.islink(path):
+        return None
+    try:
+        fd = os.open(path, _OPEN_FLAGS)
+    except OSError as exc:
+        if exc.errno == errno.ELOOP:  # the symlink O_NOFOLLOW refused
+            return None
+        raise
+    return fd
+
+
+def _scan_authorized_keys(path: str, max_bytes: int) -> tuple[int, set[str], set[str], bool] | None:
+    """Classify entries one chunk at a time, reading at most `max_bytes`; None if not a file."""
+    count, algorithms, options, tail, remaining = 0, set[str](), set[str](), b"", max_bytes
+    fd = _open_nofollow(path)
+    if fd is None:
+        return None
+    try:
+        if not stat.S_ISREG(os.fstat(fd).st_mode):  # a FIFO, device or directory
+            return None
+        while remaining > 0 and (chunk := os.read(fd, min(_CHUNK_BYTES, remaining))):
+            remaining -= len(chunk)
+            *lines, tail = (tail + chunk).split(b"\n")
+            count += sum(_classify_entry(line, algorithms, options) for line in lines)
+        truncated = remaining <= 0 and bool(os.read(fd, 1))
+    finally:
+        os.close(fd)
+    # Past the cap the tail is a cut line; otherwise it is a final line without a newline.
+    if not truncated:
+        count += _classify_entry(tail, algorithms, options)
+    return count, algorithms, options, truncated
+
+
+def _probe_user(path: str, max_bytes: int) -> tuple[str, ...]:
+    try:
+        scan = _scan_authorized_keys(path, max_bytes)
+    except (FileNotFoundError, NotADirectoryError):
+        return ("No", "", "", "")
+    except OSError as exc:
+        _emit_error(_ERROR_KEYS_UNREADABLE, f"Cannot read {path}: {exc}")
+        return ("Unreadable", "", "", "")
+    if scan is None:
+        return ("NotRegular", "", "", "")
+    count, algorithms, options, truncated = scan
+    status = "Truncated" if truncated else "Exist"
+    return (status, str(count), ",".join(sorted(algorithms)), ",".join(sorted(options)))
+
+
+def _iter_user_rows(users_root: str, names: list[str], max_file_bytes: int) -> Iterator[str]:
+    budget = _MAX_OUTPUT_BYTES - 64
+    try:
+        if not names:
+            yield _NO_RESULTS_ROW
+        for index, name in enumerate(names):
+            path = os.path.join(users_root, name, ".ssh", "authorized_keys")
+            line = "\t".join((_sanitize_user(name), *_probe_user(path, max_file_bytes)))
+            budget -= len(line.encode()) + 1
+            if budget < 0:
+                yield _PARTIAL_ROW.format(len(names) - index)
+                break
+            yield line
+    finally:
+        _flush_errors()
+
+
+# === SENSOR_COPY_BLOCK END ===
+
+
+def _list_user_dirs(users_root: Path) -> list[str]:
+    with os.scandir(users_root) as entries:
+        return sorted(entry.name for entry in entries if entry.is_dir())
+
+
+def iter_sensor_rows(
+    base_dir: str | None = None, *, max_file_bytes: int = _MAX_FILE_BYTES
+) -> Iterator[str]:
+    """Yield one row per home directory with its authorized_keys summary."""
+    root = _default_root() if base_dir is None else Path(base_dir)
+    users_root = _users_dir(root)
+    try:
+        names = _list_user_dirs(users_root)
+    except FileNotFoundError:
+        _emit_error(_ERROR_MISSING_USERS, f"Missing directory: {users_root}")
+        _flush_errors()
+        return
+    except OSError as exc:
+        _emit_error(_ERROR_ENUMERATION_FAILED, f"Unable to enumerate {users_root}: {exc}")
+        _flush_errors()
+        return
+    yield from _iter_user_rows(str(users_root), names, max_file_bytes)
+
+
+def run_sensor(base_dir: str | None = None, **options: Any) -> str:
+    """Inventory authorized_keys entries under /home."""
+    return "\n".join(iter_sensor_rows(base_dir, **options))
+
+
+if __name__ == "__main__":
+    print(run_sensor())
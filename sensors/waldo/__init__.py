@@ -0,0 +1 @@
+"""Tanium waldo sensor package."""
@@ -0,0 +1,354 @@
+"""Windows Tanium sensor classifying SSH private keys from an incremental snapshot."""
+
+from __future__ import annotations
+
+import base64
+import contextlib
+import errno
+import json
+import os
+import stat
+import struct
+import sys
+import time
+import zlib
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+_ERROR_MISSING_USERS = "WALDO201"
+_ERROR_ENUMERATION_FAILED = "WALDO202"
+_ERROR_KEY_SCAN_FAILED = "WALDO203"
+_ERROR_STATE_WRITE_FAILED = "WALDO204"
+_ERROR_DEADLINE_EXCEEDED = "WALDO205"
+_ERROR_INVALID_OPTION = "WALDO206"
+
+
+def _default_root() -> Path:
+    return Path(r"C:\\")
+
+
+def _users_dir(root: Path) -> Path:
+    return root / "Users"
+
+
+# === SENSOR_COPY_BLOCK START ===
+_NO_RESULTS_ROW = "[no results]" + "\t" * 3
+_PARTIAL_ROW = "[partial results]\t{}\t{} users not scanned\t"
+_MAX_OUTPUT_BYTES = 262144
+_STATE_VERSION = 1
+_KEY_NAMES = frozenset(
+    {"id_dsa", "id_ecdsa", "id_ecdsa_sk", "id_ed25519", "id_ed25519_sk", "id_rsa"}
+)
+_KEY_HEADER_BYTES = 512
+_PEM_LABELS = {"RSA": "pem:rsa", "DSA": "pem:dsa", "EC": "pem:ecdsa"}
+_PEM_LABELS.update(dict.fromkeys(("", "ENCRYPTED"), "pkcs8:unknown"))
+_OPENSSH_MAGIC = b"openssh-key-v1\0"
+_FD_LISTING = os.scandir in os.supports_fd
+# Key files and `.ssh` are opened without following links; a FIFO key must not block the read.
+_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+_KEY_OPEN_FLAGS = _NOFOLLOW | getattr(os, "O_NONBLOCK", 0) | getattr(os, "O_BINARY", 0)
+_FAILED_LIMIT = 256
+_SLOW_PROBE_SECONDS = 2.0
+
+_ERROR_EXAMPLES = 3
+_ERROR_LINES = 8
+_errors: dict[str, list[Any]] = {}
+
+# Controls become "?"; the second table keeps only visible ASCII.
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys((*range(32), 127), "?"))
+_INVISIBLE_TABLE = str.maketrans(dict.fromkeys((*range(33), 127)))
+
+
+def _sanitize_user(value: str) -> str:
+    if not (value.isascii() and value.isprintable()):
+        if not value.encode("ascii", "ignore").decode("ascii").translate(_INVISIBLE_TABLE):
+            return "<unknown>"
+        value = value.encode("ascii", "replace").decode("ascii").translate(_SANITIZE_TABLE)
+    return value.strip() or "<unknown>"
+
+
+def _emit_error(code: str, message: str) -> None:
+    count, *examples = _errors.get(code, [0])
+    _errors[code] = [count + 1, *examples, message][: _ERROR_EXAMPLES + 1]
+
+
+def _flush_errors() -> None:
+    for code, (count, *examples) in list(_errors.items())[:_ERROR_LINES]:
+        more = f" (+{count - len(examples)} more)" if count > len(examples) else ""
+        sys.stderr.write(f"{code} {'; '.join(examples)}{more}\n")
+    _errors.clear()
+
+
+def _read_ssh_string(blob: bytes, offset: int) -> tuple[str, int]:
+    """Read one length-prefixed SSH string; return it and the offset just past it."""
+    (size,) = struct.unpack_from(">I", blob, offset)
+    end = offset + 4 + size
+    if end > len(blob):
+        raise ValueError("truncated SSH string")
+    return blob[offset + 4 : end].decode("ascii", "replace"), end
+
+
+def _classify_openssh(body: str) -> str:
+    """Read the cipher and the first key type from the base64 body of an OpenSSH key."""
+    with contextlib.suppress(ValueError, struct.error):
+        blob = base64.b64decode(body[: len(body) // 4 * 4])
+        if blob.startswith(_OPENSSH_MAGIC):
+            cipher, offset = _read_ssh_string(blob, len(_OPENSSH_MAGIC))
+            _kdf_name, offset = _read_ssh_string(blob, offset)
+            _kdf_options, offset = _read_ssh_string(blob, offset)
+            # Skip the key count and the public key blob's length; the blob opens with its type.
+            key_type, _ = _read_ssh_string(blob, offset + 8)
+            return f"openssh:{key_type}:{'plaintext' if cipher == 'none' else 'encrypted'}"
+    return "openssh:unknown:unknown"
+
+
+def _classify_key(path: str, dir_fd: int | None = None) -> str:
+    """Classify a private key from its first `_KEY_HEADER_BYTES` bytes."""
+    try:
+        fd = os.open(path, os.O_RDONLY | _KEY_OPEN_FLAGS, dir_fd=dir_fd)
+        try:
+            head = os.read(fd, _KEY_HEADER_BYTES).decode("ascii", "replace")
+        finally:
+            os.close(fd)
+    except OSError:
+        return "unreadable"
+    first, _, rest = head.partition("\n")
+    if not first.startswith("-----BEGIN "):
+        return "unknown"
+    label = first.strip().removesuffix("PRIVATE KEY-----")[11:].strip()
+    if label == "OPENSSH":
+        return _classify_openssh("".join(rest.partition("-")[0].split()))
+    if label in _PEM_LABELS:
+        encrypted = label == "ENCRYPTED" or "Proc-Type: 4,ENCRYPTED" in rest
+        return f"{_PEM_LABELS[label]}:{'encrypted' if encrypted else 'plaintext'}"
+    return "unknown"
+
+
+def _probe_keys(ssh_dir: str) -> tuple[list[str], list[int]] | OSError:
+    """List `.ssh` once and classify its keys; return `[types, details]` and the key stamp."""
+    ssh_fd = None
+    try:
+        if _FD_LISTING:
+            ssh_fd = os.open(ssh_dir, os.O_RDONLY | os.O_DIRECTORY | _NOFOLLOW)
+        with os.scandir(ssh_dir if ssh_fd is None else ssh_fd) as entries:
+            keys = sorted(
+                (entry.name[3:].replace("_", "-"), entry.path, entry.stat(follow_symlinks=False))
+                for entry in entries
+                if entry.name in _KEY_NAMES and entry.is_file(follow_symlinks=False)
+            )
+        # entry.path is relative to ssh_fd, if open
+        details = ",".join(f"{kind}={_classify_key(path, ssh_fd)}" for kind, path, _ in keys)
+    except OSError as exc:
+        # No `.ssh`, or one linked elsewhere (say to /root/.ssh): ENOTDIR or ELOOP.
+        if exc.errno in (errno.ENOENT, errno.ENOTDIR, errno.ELOOP):
+            return ["", ""], []
+        _emit_error(_ERROR_KEY_SCAN_FAILED, f"Cannot classify keys in {ssh_dir}: {exc}")
+        return exc
+    finally:
+        if ssh_fd is not None:
+            os.close(ssh_fd)
+    return [",".join(kind for kind, _, _ in keys), details], [st.st_mtime_ns for *_, st in keys]
+
+
+def _reusable(cached: Any, signature: list[int], ssh_dir: str) -> bool:
+    """Whether a snapshot entry `[st_dev, st_ino, st_mtime_ns, key stamp, probe]` still holds."""
+    if not (isinstance(cached, list) and len(cached) == 5 and cached[:3] == signature):
+        return False
+    probe = cached[4]
+    if not (isinstance(probe, list) and len(probe) == 2 and all(type(t) is str for t in probe)):
+        return False
+    # Re-stat the listed keys by name, without following links: "ecdsa-sk" was id_ecdsa_sk.
+    names = ["id_" + kind.replace("-", "_") for kind in probe[0].split(",") if kind]
+    try:
+        stamp = [os.lstat(os.path.join(ssh_dir, name)).st_mtime_ns for name in names]
+    except OSError:
+        return False
+    return stamp == cached[3]
+
+
+def _is_failure(value: Any) -> bool:
+    """Whether a snapshot value has the shape `[kind, latency, retry at]` of a failed home."""
+    shaped = isinstance(value, list) and len(value) == 3 and isinstance(value[0], str)
+    return shaped and all(type(number) in (int, float) for number in value[1:])
+
+
+class _ScanState:
+    """Cached probes, the rotation cursor and recently failed homes; kept on disk if asked."""
+
+    def __init__(self, state_path: str | None, users_root: str, retry_minutes: float) -> None:
+        self.state_path = state_path
+        self.retry_seconds = retry_minutes * 60
+        self.root: list[int] = []
+        self.users: dict[str, Any] = {}
+        self.fresh: dict[str, Any] = {}
+        # home -> [kind, latency, retry at], least recently seen first
+        self.failed: dict[str, Any] = {}
+        self.cursor = 0  # survives root changes
+        with contextlib.suppress(OSError, ValueError, LookupError, TypeError):
+            st = os.stat(users_root)
+            self.root = [st.st_dev, st.st_ino, st.st_mtime_ns]
+            if state_path:
+                with open(state_path, encoding="utf-8") as handle:
+                    state = json.load(handle)
+                if state["version"] == _STATE_VERSION:
+                    self.cursor = int(state["cursor"])
+                    failed = dict(state["failed"]).items()
+                    self.failed = {home: entry for home, entry in failed if _is_failure(entry)}
+                    if state["root"] == self.root:
+                        self.users = dict(state["users"])
+
+    def columns(self, home: str, ssh_dir: str) -> list[str]:
+        """Status, types and details, reusing the cached probe of an unchanged `.ssh`."""
+        begun = time.monotonic()
+        failure = self.failed.pop(home, None)
+        if failure and failure[2] > time.time():
+            self.failed[home] = failure
+            return [f"Skipped({failure[0]})", "", ""]
+        signature = None
+        with contextlib.suppress(OSError):
+            st = os.stat(ssh_dir, follow_symlinks=False)
+            signature = [st.st_dev, st.st_ino, st.st_mtime_ns]
+        # The `.ssh` signature covers added, removed and renamed keys; the key stamp covers
+        # rewrites in place. Anything else is probed again.
+        cached = self.users.get(home)
+        if signature and _reusable(cached, signature, ssh_dir):
+            probe = cached[4]
+        elif isinstance(probe := _probe_keys(ssh_dir), tuple):
+            probe, stamp = probe
+            cached = [*signature, stamp, probe] if signature else None
+        latency = time.monotonic() - begun
+        if isinstance(probe, OSError) or latency > _SLOW_PROBE_SECONDS:
+            kind = errno.errorcode.get(probe.errno, "EIO") if isinstance(probe, OSError) else "slow"
+            self.failed[home] = [kind, round(latency, 3), time.time() + self.retry_seconds]
+            if len(self.failed) > _FAILED_LIMIT:
+                del self.failed[next(iter(self.failed))]
+        elif signature:
+            self.fresh[home] = cached
+        if isinstance(probe, OSError):  # the first failure still reads as no key
+            return ["No", "", ""]
+        return ["Exist" if probe[0] else "No", *probe]
+
+    def save(self, complete: bool) -> None:
+        """Replace the snapshot atomically; a cut-short run keeps the users it missed."""
+        if not self.state_path:
+            return
+        users = self.fresh if complete else {**self.users, **self.fresh}
+        state = {"version": _STATE_VERSION, "root": self.root, "cursor": self.cursor}
+        state.update(users=users, failed=self.failed)
+        temp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump(state, handle, separators=(",", ":"))
+            os.replace(temp_path, self.state_path)
+        except OSError as exc:
+            _emit_error(_ERROR_STATE_WRITE_FAILED, f"Unable to persist {self.state_path}: {exc}")
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+
+
+def _iter_user_rows(
+    users_root: str,
+    names: list[str],
+    *,
+    state_path: str | None = None,
+    time_budget: float | None = None,
+    shard_count: int = 1,
+    retry_minutes: float = 60,
+) -> Iterator[str]:
+    """Yield a row per home in the shard the rotation cursor selects."""
+    if not (type(shard_count) is int and shard_count >= 1):
+        _emit_error(_ERROR_INVALID_OPTION, f"Invalid shard_count={shard_count!r}; using 1")
+        shard_count = 1
+    state = _ScanState(state_path, users_root, retry_minutes)
+    shard = state.cursor % shard_count
+    if shard_count > 1:
+        names = [name for name in names if zlib.crc32(os.fsencode(name)) % shard_count == shard]
+    deadline = float("inf") if time_budget is None else time.monotonic() + time_budget
+    complete = True
+    budget = _MAX_OUTPUT_BYTES - 64  # room for the marker row
+    try:
+        if not names:
+            yield _NO_RESULTS_ROW
+        for index, name in enumerate(names):
+            if time.monotonic() >= deadline:
+                complete = False
+                _emit_error(
+                    _ERROR_DEADLINE_EXCEEDED, f"Time budget exhausted; {len(names) - index} left"
+                )
+                yield _PARTIAL_ROW.format("Timeout", len(names) - index)
+                break
+            columns = state.columns(name, os.path.join(users_root, name, ".ssh"))
+            line = "\t".join((_sanitize_user(name), *columns))
+            budget -= len(line.encode()) + 1
+            if budget < 0:
+                yield _PARTIAL_ROW.format("Truncated", len(names) - index)
+                break
+            yield line
+        # A cut-short run keeps the cursor, so the same shard is retried.
+        state.cursor = (shard + complete) % shard_count
+        state.save(complete and shard_count == 1)
+    finally:
+        _flush_errors()
+
+
+def _env_number(name: str, parse: Callable[[str], Any], default: Any) -> Any:
+    """Parse a `WALDO_*` number; unset or malformed (reported) gives the default."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return parse(value)
+    except ValueError:
+        _emit_error(_ERROR_INVALID_OPTION, f"Invalid {name}={value!r}; using {default!r}")
+        return default
+
+
+def _main_options() -> dict[str, Any]:
+    """Read the `WALDO_*` environment variables used when the file runs directly."""
+    return {
+        "state_path": os.environ.get("WALDO_STATE_PATH"),
+        "time_budget": _env_number("WALDO_TIME_BUDGET", float, None),
+        "shard_count": _env_number("WALDO_SHARD_COUNT", int, 1),
+        "retry_minutes": _env_number("WALDO_RETRY_MINUTES", float, 60),
+    }
+
+
+# === SENSOR_COPY_BLOCK END ===
+
+
+def _list_user_dirs(users_root: Path) -> list[str]:
+    # `All Users`, `Default User` and similar junctions are not profiles.
+    with os.scandir(users_root) as entries:
+        return sorted(
+            entry.name
+            for entry in entries
+            if entry.is_dir(follow_symlinks=False)
+            and not getattr(entry.stat(follow_symlinks=False), "st_file_attributes", 0)
+            & stat.FILE_ATTRIBUTE_REPARSE_POINT
+        )
+
+
+def iter_sensor_rows(base_dir: str | None = None, **options: Any) -> Iterator[str]:
+    """Yield one row per profile as soon as its `.ssh` is classified."""
+    root = _default_root() if base_dir is None else Path(base_dir)
+    users_root = _users_dir(root)
+    try:
+        names = _list_user_dirs(users_root)
+    except OSError as exc:
+        if isinstance(exc, FileNotFoundError):
+            _emit_error(_ERROR_MISSING_USERS, f"Missing directory: {users_root}")
+        else:
+            _emit_error(_ERROR_ENUMERATION_FAILED, f"Unable to enumerate {users_root}: {exc}")
+        _flush_errors()
+        return
+    yield from _iter_user_rows(str(users_root), names, **options)
+
+
+def run_sensor(base_dir: str | None = None, **options: Any) -> str:
+    """Classify the SSH private keys in each user profile."""
+    return "\n".join(iter_sensor_rows(base_dir, **options))
+
+
+if __name__ == "__main__":
+    print(run_sensor(**_main_options()))
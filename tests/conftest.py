@@ -13,16 +13,65 @@ if str(REPO_ROOT) not in sys.path:
 from sensors.bar import linux as bar_linux  # noqa: E402
 from sensors.bar import mac as bar_mac  # noqa: E402
 from sensors.bar import win as bar_win  # noqa: E402
+from sensors.baz import linux as baz_linux  # noqa: E402
+from sensors.baz import mac as baz_mac  # noqa: E402
+from sensors.baz import win as baz_win  # noqa: E402
+from sensors.corge import linux as corge_linux  # noqa: E402
+from sensors.corge import mac as corge_mac  # noqa: E402
+from sensors.corge import win as corge_win  # noqa: E402
 from sensors.foo import linux as sensor_linux  # noqa: E402
 from sensors.foo import mac as sensor_mac  # noqa: E402
 from sensors.foo import win as sensor_win  # noqa: E402
+from sensors.garply import linux as garply_linux  # noqa: E402
+from sensors.garply import mac as garply_mac  # noqa: E402
+from sensors.garply import win as garply_win  # noqa: E402
+from sensors.grault import linux as grault_linux  # noqa: E402
+from sensors.grault import mac as grault_mac  # noqa: E402
+from sensors.grault import win as grault_win  # noqa: E402
+from sensors.quux import linux as quux_linux  # noqa: E402
+from sensors.quux import mac as quux_mac  # noqa: E402
+from sensors.quux import win as quux_win  # noqa: E402
+from sensors.qux import linux as qux_linux  # noqa: E402
+from sensors.qux import mac as qux_mac  # noqa: E402
+from sensors.qux import win as qux_win  # noqa: E402
+from sensors.waldo import linux as waldo_linux  # noqa: E402
+from sensors.waldo import mac as waldo_mac  # noqa: E402
+from sensors.waldo import win as waldo_win  # noqa: E402
 
 
 class ForbiddenCallError(RuntimeError):
     """Raised when a forbidden API is invoked during tests."""
 
 
-_SENSOR_MODULES = (bar_win, bar_mac, bar_linux, sensor_win, sensor_mac, sensor_linux)
+_SENSOR_MODULES = (
+    bar_win,
+    bar_mac,
+    bar_linux,
+    baz_win,
+    baz_mac,
+    baz_linux,
+    sensor_win,
+    sensor_mac,
+    sensor_linux,
+    qux_win,
+    qux_mac,
+    qux_linux,
+    quux_win,
+    quux_mac,
+    quux_linux,
+    corge_win,
+    corge_mac,
+    corge_linux,
+    grault_win,
+    grault_mac,
+    grault_linux,
+    garply_win,
+    garply_mac,
+    garply_linux,
+    waldo_win,
+    waldo_mac,
+    waldo_linux,
+)
 
 
 def _forbidden(*args, **kwargs):  # type: ignore[no-untyped-def]
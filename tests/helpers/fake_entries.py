@@ -1,28 +1,344 @@
 from __future__ import annotations
 
+import ctypes
+import errno
+import os
+import socket
+import struct
+import sys
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Self
+
+import pytest
 
 
 @dataclass
 class FakeUserDir:
-    """Wrapper that exposes a fake directory name while using a real filesystem path."""
+    """Stand-in for os.DirEntry that exposes a fake name while pointing at a real directory."""
 
     path: Path
     fake_name: str
+    file_attributes: int = 0
 
-    def is_dir(self) -> bool:
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
         return self.path.is_dir()
 
+    def is_symlink(self) -> bool:
+        return self.path.is_symlink()
+
+    def inode(self) -> int:
+        return self.path.stat().st_ino
+
+    def stat(self, *, follow_symlinks: bool = True) -> SimpleNamespace:
+        """Expose only the Windows attribute bits (e.g. a junction's reparse-point flag)."""
+        return SimpleNamespace(st_file_attributes=self.file_attributes)
+
     @property
     def name(self) -> str:
         return self.fake_name
 
-    def __truediv__(self, child: str) -> Path:
-        return self.path / child
-
-    def joinpath(self, *children: str) -> Path:
-        return self.path.joinpath(*children)
+    def __fspath__(self) -> str:
+        return str(self.path)
 
     def __str__(self) -> str:  # pragma: no cover - debugging helper
         return str(self.path)
+
+
+class FakeScandir:
+    """Context-manager iterator mimicking the object returned by os.scandir()."""
+
+    def __init__(self, entries: Iterable[object]) -> None:
+        self._entries = list(entries)
+
+    def __enter__(self) -> Iterator[object]:
+        return iter(self._entries)
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def __iter__(self) -> Iterator[object]:
+        return iter(self._entries)
+
+
+class _RecordingEntry:
+    """DirEntry wrapper that logs ``stat()``; everything else is forwarded to the real entry."""
+
+    def __init__(self, entry: os.DirEntry, path: str, calls: list[tuple[str, str]]) -> None:
+        self._entry, self._path, self._calls = entry, path, calls
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        self._calls.append(("DirEntry.stat", self._path))
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._entry, name)
+
+    def __fspath__(self) -> str:
+        return os.fspath(self._entry)
+
+
+class _RecordingScandir:
+    """os.scandir() result whose entries log their ``stat()`` calls."""
+
+    def __init__(self, entries: object, directory: str, calls: list[tuple[str, str]]) -> None:
+        self._entries, self._directory, self._calls = entries, directory, calls
+        self._iterator = iter(entries)  # type: ignore[call-overload]
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._entries.__exit__(*exc_info)  # type: ignore[attr-defined]
+
+    def __iter__(self) -> Self:
+        return self
+
+    def __next__(self) -> _RecordingEntry:
+        entry = next(self._iterator)
+        return _RecordingEntry(entry, os.path.join(self._directory, entry.name), self._calls)
+
+    def close(self) -> None:
+        self._entries.close()  # type: ignore[attr-defined]
+
+
+def record_fs_calls(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, str]]:
+    """Log every os.stat/os.lstat/os.scandir/os.open and DirEntry.stat call as ``(function, path)``.
+
+    Descriptor-relative calls (``dir_fd=`` or ``os.scandir(fd)``) are logged with the path
+    the descriptor was opened on, so assertions read the same on both probing paths.
+    """
+    calls: list[tuple[str, str]] = []
+    fd_paths: dict[int, str] = {}
+    original_open, original_close = os.open, os.close
+
+    def resolve(path, dir_fd=None):  # type: ignore[no-untyped-def]
+        if isinstance(path, int):
+            return fd_paths.get(path, str(path))
+        return os.path.join(fd_paths[dir_fd], path) if dir_fd in fd_paths else str(path)
+
+    for name in ("stat", "lstat"):
+        original = getattr(os, name)
+
+        def recording(path, *args, _name=name, _original=original, **kwargs):  # type: ignore[no-untyped-def]
+            calls.append((_name, resolve(path, kwargs.get("dir_fd"))))
+            return _original(path, *args, **kwargs)
+
+        monkeypatch.setattr(os, name, recording)
+
+    original_scandir = os.scandir
+
+    def recording_scandir(path=".", *args, **kwargs):  # type: ignore[no-untyped-def]
+        calls.append(("scandir", resolve(path)))
+        return _RecordingScandir(original_scandir(path, *args, **kwargs), calls[-1][1], calls)
+
+    def recording_open(path, *args, **kwargs):  # type: ignore[no-untyped-def]
+        calls.append(("open", resolve(path, kwargs.get("dir_fd"))))
+        fd = original_open(path, *args, **kwargs)
+        fd_paths[fd] = calls[-1][1]
+        return fd
+
+    def recording_close(fd):  # type: ignore[no-untyped-def]
+        fd_paths.pop(fd, None)
+        original_close(fd)
+
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+    monkeypatch.setattr(os, "open", recording_open)
+    monkeypatch.setattr(os, "close", recording_close)
+    return calls
+
+
+def probed_ssh_dirs(calls: list[tuple[str, str]]) -> list[str]:
+    """`.ssh` directories probed, whether listed by path or opened relative to a descriptor."""
+    return list(
+        dict.fromkeys(
+            path for name, path in calls if name in {"open", "scandir"} and path.endswith(".ssh")
+        )
+    )
+
+
+class FakeLibproc:
+    """Stand-in for libSystem's proc_listallpids/proc_pidinfo over ``(pid, ppid, status, rss, name)``.
+
+    A ``None`` rss makes the task-info call fail as it does for another user's process; pids in
+    ``denied`` fail the BSD-info call with EPERM, and unknown pids with ESRCH.
+    """
+
+    def __init__(
+        self,
+        processes: Iterable[tuple[int, int, int, int | None, bytes]],
+        *,
+        denied: Iterable[int] = (),
+    ) -> None:
+        self.processes = {process[0]: process for process in processes}
+        self.denied = set(denied)
+        self.listed: list[int] = []
+        self.targets: set[int] = set()
+
+    def proc_listallpids(self, buffer: object, size: int) -> int:
+        pids = [*self.processes, *self.denied]
+        if buffer is not None:
+            for index, pid in enumerate(pids[: size // ctypes.sizeof(ctypes.c_int)]):
+                buffer[index] = pid  # type: ignore[index]
+            self.listed = pids
+        return len(pids)
+
+    def proc_pidinfo(self, pid: int, flavor: int, arg: int, target: object, size: int) -> int:
+        self.targets.add(ctypes.addressof(target.contents))  # type: ignore[attr-defined]
+        process = self.processes.get(pid)
+        if process is None:
+            ctypes.set_errno(errno.EPERM if pid in self.denied else errno.ESRCH)
+            return 0
+        _, ppid, status, rss, name = process
+        info = target.contents  # type: ignore[attr-defined]
+        if flavor == 3:
+            info.pid, info.ppid, info.status = pid, ppid, status
+            info.comm, info.name = name[:16], name[:32]
+        elif rss is None:
+            ctypes.set_errno(errno.EPERM)
+            return 0
+        else:
+            info.resident_size = rss
+        return size
+
+
+class FakeKernel32:
+    """Stand-in for the Toolhelp32 and psapi calls over ``(pid, ppid, exe, working_set)``.
+
+    A ``None`` working set makes OpenProcess fail as it does for protected processes; every
+    handle handed out is tracked so tests can check that each one is closed.
+    """
+
+    def __init__(self, processes: Iterable[tuple[int, int, str, int | None]]) -> None:
+        self.processes = list(processes)
+        self._working_sets = {pid: working_set for pid, _, _, working_set in self.processes}
+        self.open_handles: set[int] = set()
+        self._cursor = 0
+
+    def CreateToolhelp32Snapshot(self, flags: int, pid: int) -> int:
+        self.open_handles.add(1)
+        return 1
+
+    def _fill(self, target: object) -> int:
+        if self._cursor >= len(self.processes):
+            return 0
+        pid, ppid, exe, _ = self.processes[self._cursor]
+        entry = target.contents  # type: ignore[attr-defined]
+        entry.th32ProcessID, entry.th32ParentProcessID, entry.szExeFile = pid, ppid, exe
+        return 1
+
+    def Process32FirstW(self, handle: int, target: object) -> int:
+        self._cursor = 0
+        return self._fill(target)
+
+    def Process32NextW(self, handle: int, target: object) -> int:
+        self._cursor += 1
+        return self._fill(target)
+
+    def OpenProcess(self, access: int, inherit: bool, pid: int) -> int | None:
+        if self._working_sets.get(pid) is None:
+            return None
+        self.open_handles.add(pid + 0x10000)
+        return pid + 0x10000
+
+    def K32GetProcessMemoryInfo(self, handle: int, target: object, size: int) -> int:
+        counters = target.contents  # type: ignore[attr-defined]
+        counters.WorkingSetSize = self._working_sets[handle - 0x10000]
+        return 1
+
+    def CloseHandle(self, handle: int) -> int:
+        self.open_handles.remove(handle)
+        return 1
+
+
+class FakeSocketLibproc:
+    """Stand-in for libproc's descriptor calls over ``{pid: [(so, address, port, tcp_state, uid)]}``.
+
+    Each process also holds a non-socket descriptor 0; a ``None`` tcp_state is a UDP socket,
+    and pids in ``vanished`` are listed but fail afterwards with ESRCH.
+    """
+
+    def __init__(
+        self,
+        sockets: dict[int, list[tuple[int, str, int, int | None, int]]],
+        *,
+        vanished: Iterable[int] = (),
+    ) -> None:
+        self.sockets = sockets
+        self.vanished = set(vanished)
+        self.list_calls = 0
+
+    def proc_listallpids(self, buffer: object, size: int) -> int:
+        pids = [*self.sockets, *self.vanished]
+        if buffer is not None:
+            for index, pid in enumerate(pids[: size // ctypes.sizeof(ctypes.c_int)]):
+                buffer[index] = pid  # type: ignore[index]
+        return len(pids)
+
+    def proc_pidinfo(self, pid: int, flavor: int, arg: int, target: object, size: int) -> int:
+        self.list_calls += 1
+        if pid not in self.sockets:
+            ctypes.set_errno(errno.ESRCH)
+            return 0
+        fds = [(0, 1), *((3 + index, 2) for index in range(len(self.sockets[pid])))]
+        fds = fds[: size // 8]
+        for index, (fd, fdtype) in enumerate(fds):
+            target[index].fd, target[index].fdtype = fd, fdtype  # type: ignore[index]
+        return len(fds) * 8
+
+    def proc_pidfdinfo(self, pid: int, fd: int, flavor: int, target: object, size: int) -> int:
+        so, address, port, state, uid = self.sockets[pid][fd - 3]
+        info = target.contents  # type: ignore[attr-defined]
+        info.so, info.vst_uid = so, uid
+        info.kind, info.tcp_state = (1, 0) if state is None else (2, state)
+        if ":" in address:
+            info.insi.vflag, packed = 0x2, socket.inet_pton(socket.AF_INET6, address)
+        else:
+            info.insi.vflag, packed = 0x1, bytes(12) + socket.inet_aton(address)
+        info.insi.laddr[:] = list(packed)
+        # The port sits in network byte order at the start of an int32.
+        info.insi.lport = int.from_bytes(port.to_bytes(2, "big") + bytes(2), sys.byteorder)
+        return size
+
+
+class FakeIphlpapi:
+    """Stand-in for GetExtendedTcpTable over ``{"tcp": [(address, port, pid)], "tcp6": [...]}``.
+
+    ``failure`` is returned instead of a table; ``sizes`` records the buffer size of every call.
+    """
+
+    def __init__(self, tables: dict[str, list[tuple[str, int, int]]], *, failure: int = 0) -> None:
+        self.tables = tables
+        self.failure = failure
+        self.sizes: list[int] = []
+
+    def _table(self, family: int) -> bytes:
+        ipv6 = family == 23
+        rows = self.tables.get("tcp6" if ipv6 else "tcp", [])
+        data = [len(rows).to_bytes(4, "little")]
+        for address, port, pid in rows:
+            local = socket.inet_pton(socket.AF_INET6 if ipv6 else socket.AF_INET, address)
+            port_bytes = port.to_bytes(2, "big")
+            # dwState is MIB_TCP_STATE_LISTEN (2); remote endpoints and scope ids are zero.
+            if ipv6:
+                data.append(
+                    struct.pack("<16sI2s2x16sIIII", local, 0, port_bytes, bytes(16), 0, 0, 2, pid)
+                )
+            else:
+                data.append(struct.pack("<I4s2s2xIII", 2, local, port_bytes, 0, 0, pid))
+        return b"".join(data)
+
+    def GetExtendedTcpTable(
+        self, buffer: object, size: object, order: bool, family: int, table: int, reserved: int
+    ) -> int:
+        self.sizes.append(size.contents.value)  # type: ignore[attr-defined]
+        if self.failure:
+            return self.failure
+        data = self._table(family)
+        if size.contents.value < len(data):  # type: ignore[attr-defined]
+            size.contents.value = len(data)  # type: ignore[attr-defined]
+            return 122
+        ctypes.memmove(buffer, data, len(data))
+        return 0
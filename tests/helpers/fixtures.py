@@ -2,9 +2,25 @@
 
 from __future__ import annotations
 
+import os
 import shutil
+import sys
 from pathlib import Path
 
+import pytest
+
+
+def os_matches_host(os_name: str) -> bool:
+    """Whether the ``linux``/``mac``/``win`` sensor module is native to the running host."""
+    platform = sys.platform
+    if os_name == "linux":
+        return platform.startswith("linux")
+    if os_name == "mac":
+        return platform == "darwin"
+    if os_name == "win":
+        return platform in {"win32", "cygwin"}
+    return False
+
 
 def prepare_sensor_files(sensor_name: str, os_name: str, tmp_root: Path) -> Path:
     """Copy fixture trees to a temp directory and return the new root for tests."""
@@ -17,3 +33,181 @@ def prepare_sensor_files(sensor_name: str, os_name: str, tmp_root: Path) -> Path
     dst = tmp_root / f"{sensor_name}_{os_name}_files"
     shutil.copytree(src, dst)
     return dst
+
+
+def generate_user_homes(users_dir: Path, count: int, *, key_every: int = 2) -> list[str]:
+    """Create ``count`` synthetic homes with a `.ssh` folder; every ``key_every``-th gets a key."""
+    names: list[str] = []
+    for index in range(count):
+        name = f"user{index:05d}"
+        ssh_dir = users_dir / name / ".ssh"
+        ssh_dir.mkdir(parents=True)
+        if key_every and index % key_every == key_every - 1:
+            (ssh_dir / "id_ed25519").write_text("key")
+        names.append(name)
+    return names
+
+
+def link_user_homes(users_dir: Path, links: dict[str, str]) -> None:
+    """Create ``name -> target`` symlinks in ``users_dir``; skip the test where unsupported."""
+    for name, target in links.items():
+        try:
+            os.symlink(target, users_dir / name, target_is_directory=True)
+        except (OSError, NotImplementedError) as exc:
+            pytest.skip(f"symlinks unavailable: {exc}")
+
+
+def generate_profile_list(
+    root: Path, count: int, *, parent: str = "Users", drive: str = "C:", first_rid: int = 1001
+) -> dict[str, str]:
+    """Create ``count`` homes under ``root/parent``; return a ``{SID: ProfileImagePath}`` stand-in."""
+    names = generate_user_homes(root / parent, count)
+    return {
+        f"S-1-5-21-3623811015-3361044348-30300820-{first_rid + index}": f"{drive}\\{parent}\\{name}"
+        for index, name in enumerate(names)
+    }
+
+
+_AUTHORIZED_KEY_LINES = (
+    "ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAIOMqqnkVzrm0SdG6UOoqKLsabgH5C9okWi0dh2l9GKJl svc{index}",
+    'command="/usr/local/bin/deploy --ref {index}",no-pty ssh-rsa AAAAB3NzaC1yc2EAAAADAQAB svc{index}',
+    'from="10.{index_mod}.0.0/16" ecdsa-sha2-nistp256 AAAAE2VjZHNhLXNoYTItbmlzdHAyNTY= svc{index}',
+    "# rotated key {index}",
+)
+
+
+def generate_authorized_keys(path: Path, count: int) -> int:
+    """Write ``count`` lines cycling plain, ``command=``, ``from=`` and comment lines; return bytes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with path.open("w", encoding="ascii", newline="\n") as handle:
+        for start in range(0, count, 4096):
+            block = "".join(
+                _AUTHORIZED_KEY_LINES[index % 4].format(index=index, index_mod=index % 256) + "\n"
+                for index in range(start, min(start + 4096, count))
+            )
+            written += handle.write(block)
+    return written
+
+
+def generate_tree(root: Path, entries: int, *, fanout: int = 1000, file_bytes: int = 0) -> int:
+    """Create exactly ``entries`` entries as directories of up to ``fanout`` files; return the file count."""
+    payload, bucket, files = b"x" * file_bytes, 0, 0
+    while (remaining := entries - bucket - files) > 0:
+        directory = root / f"d{bucket:05d}"
+        directory.mkdir(parents=True)
+        for index in range(min(fanout, remaining - 1)):
+            fd = os.open(directory / f"f{index:04d}", os.O_WRONLY | os.O_CREAT, 0o644)
+            os.write(fd, payload)
+            os.close(fd)
+        bucket, files = bucket + 1, files + min(fanout, remaining - 1)
+    return files
+
+
+_DPKG_STANZA = (
+    "Package: pkg{index:06d}\n"
+    "Status: install ok {state}\n"
+    "Priority: optional\n"
+    "Section: libs\n"
+    "Installed-Size: {size}\n"
+    "Maintainer: Example Maintainers <pkg{index:06d}@example.org>\n"
+    "Architecture: amd64\n"
+    "Version: {major}.{minor}-{index}\n"
+    "Depends: libc6 (>= 2.36), libgcc-s1 (>= 3.0)\n"
+    "Conffiles:\n /etc/pkg{index:06d}/main.conf 0123456789abcdef0123456789abcdef\n"
+    "Description: generated package {index}\n"
+)
+_DPKG_DESCRIPTION = " Long description line {line} explaining what the package provides.\n"
+
+
+def generate_dpkg_status(path: Path, count: int, *, description_lines: int = 12) -> int:
+    """Write ``count`` dpkg stanzas (every tenth in config-files state); return bytes written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    description = "".join(_DPKG_DESCRIPTION.format(line=line) for line in range(description_lines))
+    written = 0
+    with path.open("w", encoding="ascii", newline="\n") as handle:
+        for index in range(count):
+            state = "config-files" if index % 10 == 9 else "installed"
+            stanza = _DPKG_STANZA.format(
+                index=index, state=state, size=index % 9000, major=index % 7, minor=index % 13
+            )
+            written += handle.write(stanza + description + "\n")
+    return written
+
+
+def write_proc_entry(
+    proc_dir: Path,
+    pid: int,
+    comm: str,
+    *,
+    ppid: int = 1,
+    state: str = "S",
+    rss_pages: int = 0,
+    cmdline: bytes = b"",
+) -> None:
+    """Write a ``/proc/<pid>`` directory holding a 52-field ``stat`` line and a ``cmdline``."""
+    entry = proc_dir / str(pid)
+    entry.mkdir(parents=True)
+    # Fields 5-23 and 25-52 are filler; rss is field 24.
+    before = " ".join(["0"] * 19)
+    after = " ".join(["0"] * 28)
+    (entry / "stat").write_text(f"{pid} ({comm}) {state} {ppid} {before} {rss_pages} {after}\n")
+    (entry / "cmdline").write_bytes(cmdline)
+
+
+def generate_proc(proc_dir: Path, count: int, *, first_pid: int = 100) -> list[int]:
+    """Fake ``count`` processes next to non-pid entries; every eighth has a 15-byte comm."""
+    proc_dir.mkdir(parents=True, exist_ok=True)
+    (proc_dir / "meminfo").write_text("MemTotal: 1 kB\n")
+    (proc_dir / "sys").mkdir(exist_ok=True)
+    pids = list(range(first_pid, first_pid + count))
+    for pid in pids:
+        long_name = pid % 8 == 0
+        write_proc_entry(
+            proc_dir,
+            pid,
+            f"worker-{pid:08d}"[:15] if long_name else f"svc{pid}",
+            ppid=first_pid,
+            state="RSDZ"[pid % 4],
+            rss_pages=pid % 5000,
+            cmdline=f"/opt/bin/worker-{pid:08d}-daemon\0--flag\0".encode() if long_name else b"",
+        )
+    return pids
+
+
+TCP_HEADER = (
+    "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt"
+    "   uid  timeout inode\n"
+)
+TCP6_HEADER = (
+    "  sl  local_address                         remote_address                        st"
+    " tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+)
+
+
+def format_tcp_row(
+    sl: int, local: str, remote: str, state: int, *, uid: int = 0, inode: int = 0
+) -> str:
+    """Format a ``/proc/net/tcp{,6}`` row as the kernel does; addresses are ``HEX:PORT``."""
+    return (
+        f"{sl:4d}: {local} {remote} {state:02X} 00000000:00000000 00:00000000 00000000"
+        f" {uid:5d} {0:8d} {inode} 1 0000000000000000 100 0 0 10 0\n"
+    )
+
+
+def generate_proc_net_tcp(path: Path, count: int, *, listen_every: int = 1000) -> int:
+    """Write ``count`` IPv4 rows of which every ``listen_every``-th listens; return LISTEN rows."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    listening = 0
+    with path.open("w") as handle:
+        handle.write(TCP_HEADER)
+        for sl in range(count):
+            if sl % listen_every == 0:
+                listening += 1
+                row = format_tcp_row(sl, f"0100000A:{1024 + sl % 60000:04X}", "00000000:0000", 0x0A)
+            else:
+                # Established and TIME_WAIT peers of a load balancer fronting port 443.
+                peer = f"{sl & 0xFFFFFF:06X}0A:{1024 + sl % 64000:04X}"
+                row = format_tcp_row(sl, "0100000A:01BB", peer, 0x01 if sl % 3 else 0x06)
+            handle.write(row)
+    return listening
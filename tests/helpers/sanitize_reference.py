@@ -0,0 +1,58 @@
+"""Reference implementation of the foo sensors' username sanitizer."""
+
+from __future__ import annotations
+
+import random
+
+
+def reference_sanitize_user(value: str) -> str:
+    """Per-character loop the sensors used before the translate-table fast path."""
+    sanitized_chars: list[str] = []
+    saw_visible = False
+
+    for char in value:
+        code_point = ord(char)
+        if char in {"\t", "\n", "\r"} or not (32 <= code_point <= 126):
+            sanitized_chars.append("?")
+            continue
+
+        sanitized_chars.append(char)
+        if not char.isspace():
+            saw_visible = True
+
+    sanitized = "".join(sanitized_chars).strip()
+    if not sanitized or not saw_visible:
+        return "<unknown>"
+    return sanitized
+
+
+_EDGE_CASES = (
+    "",
+    " ",
+    "\t",
+    "?",
+    " ? ",
+    "alice",
+    "  bob  ",
+    "\x7f",
+    "ca\trol",
+    "dave\r\n",
+    "é",
+    " é ",
+    "ééx",
+    "\udcff",
+    "eve\udc80",
+    "　",
+    "名前",
+    "x\x00y",
+)
+_ALPHABET = "ab Z?~ \t\r\n\x00\x1f\x7f\x80é　名\udcff"
+
+
+def generate_usernames(count: int, seed: int = 1234) -> list[str]:
+    """Return edge cases plus ``count`` random names mixing printable, control and non-ASCII."""
+    rng = random.Random(seed)
+    names = list(_EDGE_CASES)
+    for _ in range(count):
+        names.append("".join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, 12))))
+    return names
@@ -1,22 +1,139 @@
 import os
 import re
+import subprocess
 import sys
+from pathlib import Path
 
 import pytest
 
 from sensors.bar import linux
+from tests.helpers.fixtures import prepare_sensor_files
 
-pytestmark = [
-    pytest.mark.skipif(
-        not os.environ.get("CI"), reason="Linux sensor integration test runs in CI only."
-    ),
-    pytest.mark.skipif(sys.platform != "linux", reason="Linux sensor test requires Linux."),
-]
 
+def _fake_run(stdout: str):  # type: ignore[no-untyped-def]
+    def run(command, **kwargs):  # type: ignore[no-untyped-def]
+        return subprocess.CompletedProcess(command, 0, stdout=stdout, stderr="")
 
+    return run
+
+
+def _no_spawn(*args, **kwargs):  # type: ignore[no-untyped-def]
+    raise AssertionError("The command fallback must not run when an in-process source answers.")
+
+
+def _broken(root: Path) -> str:
+    raise OSError("unreadable")
+
+
+@pytest.mark.skipif(
+    not os.environ.get("CI"), reason="Linux sensor integration test runs in CI only."
+)
+@pytest.mark.skipif(sys.platform != "linux", reason="Linux sensor test requires Linux.")
 def test_linux_reports_kernel_build() -> None:
     """Validate that we capture a plausible kernel build number."""
     result = linux.run_sensor().strip()
 
     assert result, "Kernel build output must not be empty."
     assert re.fullmatch(r"[0-9]+\.[0-9]+\.[0-9]+[-\w.]*", result)
+
+
+def test_linux_reads_osrelease_under_base_dir(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    base_dir = prepare_sensor_files("bar", "linux", tmp_path)
+    monkeypatch.setattr(linux.subprocess, "run", _no_spawn)
+
+    assert linux.lookup_build(str(base_dir)) == ("6.8.0-1008-azure", "osrelease")
+    assert linux.run_sensor(str(base_dir)) == "6.8.0-1008-azure"
+
+
+@pytest.mark.skipif(not hasattr(os, "uname"), reason="os.uname() requires a POSIX host.")
+def test_linux_live_lookup_uses_uname_without_spawning(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(linux.subprocess, "run", _no_spawn)
+
+    build, source = linux.lookup_build()
+
+    assert source == "uname"
+    assert build == linux._sanitize_build_number(os.uname().release, linux._BUILD_PATTERN)
+
+
+def test_linux_injected_readers_are_tried_in_order() -> None:
+    readers = {"uname": _broken, "osrelease": lambda root: "", "command": lambda root: "6.1.0-13"}
+
+    assert linux.lookup_build(readers=readers) == ("6.1.0-13", "command")
+
+
+def test_linux_falls_back_to_command_when_procfs_is_missing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(linux.subprocess, "run", _fake_run("5.15.0-91-generic\n"))
+
+    assert linux.lookup_build(str(tmp_path)) == ("5.15.0-91-generic", "command")
+
+
+def test_linux_reports_no_source_when_every_reader_fails(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert linux.lookup_build(readers={"uname": _broken, "osrelease": _broken}) == ("", "none")
+    assert capsys.readouterr().err == ""
+
+
+class TestBootCache:
+    def test_second_run_in_the_same_boot_is_a_cache_hit(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        base_dir = prepare_sensor_files("bar", "linux", tmp_path)
+        cache_path = str(tmp_path / "bar.cache")
+        monkeypatch.setattr(linux.subprocess, "run", _no_spawn)
+
+        first = linux.lookup_build(str(base_dir), cache_path=cache_path)
+        monkeypatch.setattr(linux, "_read_osrelease", _broken)
+        monkeypatch.setattr(linux, "_sanitize_build_number", _no_spawn)
+        second = linux.lookup_build(str(base_dir), cache_path=cache_path)
+
+        assert first == ("6.8.0-1008-azure", "osrelease")
+        assert second == ("6.8.0-1008-azure", "cache")
+
+    def test_reboot_invalidates_the_cached_build(self, tmp_path: Path) -> None:
+        base_dir = prepare_sensor_files("bar", "linux", tmp_path)
+        cache_path = str(tmp_path / "bar.cache")
+        linux.lookup_build(str(base_dir), cache_path=cache_path)
+
+        (base_dir / "proc/sys/kernel/random/boot_id").write_text(
+            "9b7e0c11-2f44-4d8a-8e3b-5a6c7d8e9f00\n"
+        )
+        (base_dir / "proc/sys/kernel/osrelease").write_text("6.8.0-1010-azure\n")
+
+        assert linux.lookup_build(str(base_dir), cache_path=cache_path) == (
+            "6.8.0-1010-azure",
+            "osrelease",
+        )
+        assert linux.lookup_build(str(base_dir), cache_path=cache_path)[1] == "cache"
+
+    @pytest.mark.parametrize("content", ["", "{", "[]", '{"version": 1}', "\x00" * 64])
+    def test_corrupt_cache_is_rebuilt(self, tmp_path: Path, content: str) -> None:
+        base_dir = prepare_sensor_files("bar", "linux", tmp_path)
+        cache_path = tmp_path / "bar.cache"
+        cache_path.write_text(content)
+
+        assert linux.lookup_build(str(base_dir), cache_path=str(cache_path))[1] == "osrelease"
+        assert linux.lookup_build(str(base_dir), cache_path=str(cache_path))[1] == "cache"
+
+    def test_unwritable_cache_still_returns_the_build(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        base_dir = prepare_sensor_files("bar", "linux", tmp_path)
+        cache_path = str(tmp_path / "missing" / "bar.cache")
+
+        assert linux.run_sensor(str(base_dir), cache_path=cache_path) == "6.8.0-1008-azure"
+        assert capsys.readouterr().err.startswith("BAR003 Unable to persist")
+        assert list(tmp_path.iterdir()) == [base_dir]
+
+    def test_unknown_boot_id_skips_the_cache(self, tmp_path: Path) -> None:
+        base_dir = prepare_sensor_files("bar", "linux", tmp_path)
+        cache_path = tmp_path / "bar.cache"
+
+        result = linux.lookup_build(str(base_dir), cache_path=str(cache_path), boot_id=_broken)
+
+        assert result == ("6.8.0-1008-azure", "osrelease")
+        assert not cache_path.exists()
@@ -1,22 +1,95 @@
 import os
 import re
+import subprocess
 import sys
+from pathlib import Path
 
 import pytest
 
 from sensors.bar import mac
+from tests.helpers.fixtures import prepare_sensor_files
 
-pytestmark = [
-    pytest.mark.skipif(
-        not os.environ.get("CI"), reason="macOS sensor integration test runs in CI only."
-    ),
-    pytest.mark.skipif(sys.platform != "darwin", reason="macOS sensor test requires macOS."),
-]
 
+def _fake_run(stdout: str):  # type: ignore[no-untyped-def]
+    def run(command, **kwargs):  # type: ignore[no-untyped-def]
+        return subprocess.CompletedProcess(command, 0, stdout=stdout, stderr="")
 
+    return run
+
+
+def _no_spawn(*args, **kwargs):  # type: ignore[no-untyped-def]
+    raise AssertionError("The command fallback must not run when an in-process source answers.")
+
+
+@pytest.mark.skipif(
+    not os.environ.get("CI"), reason="macOS sensor integration test runs in CI only."
+)
+@pytest.mark.skipif(sys.platform != "darwin", reason="macOS sensor test requires macOS.")
 def test_mac_reports_build_version() -> None:
-    """Validate that sw_vers -buildVersion returns a plausibly formatted build."""
+    """Validate that the live lookup returns a plausibly formatted build."""
     result = mac.run_sensor().strip()
 
     assert result, "macOS build output must not be empty."
     assert re.fullmatch(r"[0-9A-Z]+", result)
+
+
+def test_mac_reads_system_version_plist_under_base_dir(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    base_dir = prepare_sensor_files("bar", "mac", tmp_path)
+    monkeypatch.setattr(mac.subprocess, "run", _no_spawn)
+
+    assert mac.lookup_build(str(base_dir)) == ("23B81", "plist")
+    assert mac.run_sensor(str(base_dir)) == "23B81"
+
+
+def test_mac_injected_sysctl_serves_when_plist_is_missing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(mac.subprocess, "run", _no_spawn)
+    readers = {"plist": mac._read_plist, "sysctl": lambda root: "23C71\n"}
+
+    assert mac.lookup_build(str(tmp_path), readers=readers) == ("23C71", "sysctl")
+
+
+def test_mac_falls_back_to_sw_vers_when_plist_is_unreadable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    plist = tmp_path / "System/Library/CoreServices/SystemVersion.plist"
+    plist.parent.mkdir(parents=True)
+    plist.write_text("not a plist")
+    monkeypatch.setattr(mac.subprocess, "run", _fake_run("22G313\n"))
+
+    assert mac.lookup_build(str(tmp_path)) == ("22G313", "command")
+
+
+@pytest.mark.skipif(sys.platform == "darwin", reason="Checks the off-platform sysctl failure.")
+def test_mac_sysctl_reader_fails_cleanly_off_platform(tmp_path: Path) -> None:
+    with pytest.raises(mac._READ_ERRORS):
+        mac._read_sysctl(tmp_path)
+
+
+def test_mac_boot_cache_hits_until_kern_boottime_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    base_dir = prepare_sensor_files("bar", "mac", tmp_path)
+    options = {
+        "cache_path": str(tmp_path / "bar.cache"),
+        "boot_id": lambda root: "1700000000.123456",
+    }
+    monkeypatch.setattr(mac.subprocess, "run", _no_spawn)
+
+    assert mac.lookup_build(str(base_dir), **options) == ("23B81", "plist")
+    assert mac.lookup_build(str(base_dir), **options) == ("23B81", "cache")
+
+    options["boot_id"] = lambda root: "1700086400.000042"
+    assert mac.lookup_build(str(base_dir), **options) == ("23B81", "plist")
+
+
+@pytest.mark.skipif(sys.platform == "darwin", reason="Checks the off-platform boottime failure.")
+def test_mac_default_boot_reader_off_platform_skips_the_cache(tmp_path: Path) -> None:
+    base_dir = prepare_sensor_files("bar", "mac", tmp_path)
+    cache_path = tmp_path / "bar.cache"
+
+    assert mac.lookup_build(str(base_dir), cache_path=str(cache_path)) == ("23B81", "plist")
+    assert not cache_path.exists()
@@ -1,22 +1,92 @@
 import os
 import re
+import subprocess
 import sys
+from pathlib import Path
 
 import pytest
 
 from sensors.bar import win
 
-pytestmark = [
-    pytest.mark.skipif(
-        not os.environ.get("CI"), reason="Windows sensor integration test runs in CI only."
-    ),
-    pytest.mark.skipif(sys.platform != "win32", reason="Windows sensor test requires Windows."),
-]
+_CURRENT_VERSION = {
+    "CurrentMajorVersionNumber": 10,
+    "CurrentMinorVersionNumber": 0,
+    "CurrentBuild": "22631",
+    "UBR": 2861,
+}
 
 
+def _fake_run(stdout: str):  # type: ignore[no-untyped-def]
+    def run(command, **kwargs):  # type: ignore[no-untyped-def]
+        return subprocess.CompletedProcess(command, 0, stdout=stdout, stderr="")
+
+    return run
+
+
+def _registry(values: dict[str, object]):  # type: ignore[no-untyped-def]
+    return lambda root: win._registry_build(values.__getitem__)
+
+
+@pytest.mark.skipif(
+    not os.environ.get("CI"), reason="Windows sensor integration test runs in CI only."
+)
+@pytest.mark.skipif(sys.platform != "win32", reason="Windows sensor test requires Windows.")
 def test_win_reports_build_number() -> None:
-    """Validate that cmd /c ver returns a plausible Windows build string."""
+    """Validate that the live lookup returns a plausible Windows build string."""
     result = win.run_sensor().strip()
 
     assert result, "Windows build output must not be empty."
     assert re.fullmatch(r"[0-9.]+", result)
+
+
+def test_win_composes_build_from_registry_values() -> None:
+    def no_spawn(root: Path) -> str:
+        raise AssertionError("The command fallback must not run when the registry answers.")
+
+    readers = {"registry": _registry(_CURRENT_VERSION), "command": no_spawn}
+
+    assert win.lookup_build(readers=readers) == ("10.0.22631.2861", "registry")
+
+
+def test_win_falls_back_to_ver_when_a_registry_value_is_missing(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    values = {name: value for name, value in _CURRENT_VERSION.items() if name != "UBR"}
+    monkeypatch.setattr(
+        win.subprocess, "run", _fake_run("\nMicrosoft Windows [Version 10.0.19045.3803]\n")
+    )
+    readers = {"registry": _registry(values), "command": win._read_command}
+
+    assert win.lookup_build(readers=readers) == ("10.0.19045.3803", "command")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Checks the off-platform registry fallback.")
+def test_win_default_chain_falls_back_without_winreg(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(win.subprocess, "run", _fake_run("Microsoft Windows [Version 10.0.1]\n"))
+
+    assert win.lookup_build() == ("10.0.1", "command")
+
+
+def test_win_boot_cache_hits_until_the_last_boot_time_changes(tmp_path: Path) -> None:
+    values = dict(_CURRENT_VERSION)
+    options = {
+        "readers": {"registry": lambda root: win._registry_build(values.__getitem__)},
+        "cache_path": str(tmp_path / "bar.cache"),
+        "boot_id": lambda root: "1700000000",
+    }
+
+    assert win.lookup_build(**options) == ("10.0.22631.2861", "registry")
+    values["UBR"] = 3007
+    assert win.lookup_build(**options) == ("10.0.22631.2861", "cache")
+
+    options["boot_id"] = lambda root: "1700090000"
+    assert win.lookup_build(**options) == ("10.0.22631.3007", "registry")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Checks the off-platform boot time failure.")
+def test_win_default_boot_reader_off_platform_skips_the_cache(tmp_path: Path) -> None:
+    cache_path = tmp_path / "bar.cache"
+    readers = {"registry": _registry(_CURRENT_VERSION)}
+
+    assert win.lookup_build(readers=readers, cache_path=str(cache_path))[1] == "registry"
+    assert not cache_path.exists()
@@ -0,0 +1,54 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from sensors.baz import linux
+from tests.helpers.fixtures import prepare_sensor_files
+
+
+def _broken(root: Path) -> str:
+    raise PermissionError(13, "Permission denied")
+
+
+def test_linux_reads_identity_from_procfs(tmp_path: Path) -> None:
+    base_dir = prepare_sensor_files("baz", "linux", tmp_path)
+
+    result = linux.run_sensor(base_dir=str(base_dir))
+
+    assert result == "web01\t6.8.0-1008-azure\tx86_64\t6.8.0-1008-azure"
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Live uname probe requires Linux.")
+def test_linux_live_probe_matches_uname() -> None:
+    uname = os.uname()
+
+    expected = f"{uname.nodename}\t{uname.release}\t{uname.machine}\t{uname.release}"
+
+    assert linux.run_sensor() == expected
+
+
+def test_linux_unreadable_fact_leaves_an_empty_cell(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    base_dir = prepare_sensor_files("baz", "linux", tmp_path)
+    (base_dir / "proc/sys/kernel/arch").unlink()
+
+    result = linux.run_sensor(base_dir=str(base_dir))
+
+    assert result == "web01\t6.8.0-1008-azure\t\t6.8.0-1008-azure"
+    assert capsys.readouterr().err.startswith("BAZ001 Cannot read arch: ")
+
+
+def test_linux_no_readable_fact_reports_no_results(capsys: pytest.CaptureFixture[str]) -> None:
+    readers = dict.fromkeys(linux._FACTS, _broken)
+
+    assert linux.run_sensor(readers=readers) == "[no results]\t\t\t"
+    assert capsys.readouterr().err.count("\n") == 1
+
+
+def test_linux_control_characters_cannot_break_the_row() -> None:
+    readers = {"hostname": lambda root: "web\t01\n", "arch": lambda root: "x86_64"}
+
+    assert linux.run_sensor(readers=readers) == "web?01\t\tx86_64\t"
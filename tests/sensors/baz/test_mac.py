@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from sensors.baz import mac
+from tests.helpers.fixtures import prepare_sensor_files
+
+
+def test_mac_reads_hostname_and_build_from_plists(tmp_path: Path) -> None:
+    base_dir = prepare_sensor_files("baz", "mac", tmp_path)
+
+    assert mac.run_sensor(base_dir=str(base_dir)) == "design-mbp\t\t\t23B81"
+
+
+def test_mac_prefers_the_configured_host_name(tmp_path: Path) -> None:
+    base_dir = prepare_sensor_files("baz", "mac", tmp_path)
+    plist = base_dir / mac._PREFERENCES_PLIST
+    plist.write_text(
+        plist.read_text().replace(
+            "<key>ComputerName</key>",
+            "<key>HostName</key>\n<string>build-07.example</string>\n<key>ComputerName</key>",
+        )
+    )
+
+    assert mac.run_sensor(base_dir=str(base_dir)).split("\t")[0] == "build-07.example"
+
+
+def test_mac_injected_live_readers_fill_every_column() -> None:
+    readers = {
+        "hostname": lambda root: "design-mbp.local",
+        "kernel": lambda root: "23.1.0",
+        "arch": lambda root: "arm64",
+        "build": lambda root: "23B81",
+    }
+
+    assert mac.run_sensor(readers=readers) == "design-mbp.local\t23.1.0\tarm64\t23B81"
+
+
+@pytest.mark.skipif(sys.platform == "darwin", reason="Checks the off-platform sysctl failure.")
+def test_mac_sysctl_build_is_empty_off_platform(capsys: pytest.CaptureFixture[str]) -> None:
+    result = mac.run_sensor(readers={"hostname": lambda root: "h", "build": mac._read_sysctl_build})
+
+    assert result == "h\t\t\t"
+    assert capsys.readouterr().err.startswith("BAZ201 Cannot read build: ")
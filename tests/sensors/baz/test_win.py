@@ -0,0 +1,48 @@
+import sys
+
+import pytest
+
+from sensors.baz import win
+
+_REGISTRY = {
+    win._CURRENT_VERSION_KEY: {
+        "CurrentMajorVersionNumber": 10,
+        "CurrentMinorVersionNumber": 0,
+        "CurrentBuild": "22631",
+        "UBR": 2861,
+    },
+    win._COMPUTER_NAME_KEY: {"ComputerName": "WKS-0042"},
+    win._ENVIRONMENT_KEY: {"PROCESSOR_ARCHITECTURE": "AMD64"},
+}
+
+
+def _query(key_path: str, name: str) -> object:
+    try:
+        return _REGISTRY[key_path][name]
+    except KeyError:
+        raise FileNotFoundError(2, "The system cannot find the file specified", name) from None
+
+
+def test_win_composes_identity_from_registry_values() -> None:
+    result = win.run_sensor(readers=win._registry_readers(_query))
+
+    assert result == "WKS-0042\t10.0.22631\tAMD64\t10.0.22631.2861"
+
+
+def test_win_missing_value_only_empties_its_own_columns(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.delitem(_REGISTRY[win._CURRENT_VERSION_KEY], "UBR")
+
+    result = win.run_sensor(readers=win._registry_readers(_query))
+
+    assert result == "WKS-0042\t10.0.22631\tAMD64\t"
+    assert capsys.readouterr().err.startswith("BAZ101 Cannot read build: ")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Checks the off-platform registry failure.")
+def test_win_default_readers_report_no_results_off_platform(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert win.run_sensor() == "[no results]\t\t\t"
+    assert capsys.readouterr().err.startswith("BAZ101 Cannot read hostname: ")
@@ -0,0 +1,172 @@
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from sensors.corge import linux
+from tests.helpers.fixtures import generate_dpkg_status, prepare_sensor_files
+
+FIXTURE_ROWS = [
+    "bash\t5.2.15-2+b2\tinstall ok installed",
+    "openssh-server\t1:9.2p1-2+deb12u3\tinstall ok installed",
+    "telnetd\t0.17+2.4-2\tdeinstall ok config-files",
+]
+
+
+def _naive_records(path: Path) -> list[tuple[str, str, str]]:
+    """The approach the sensor replaces: decode everything, then split stanzas and fields."""
+    records = []
+    for stanza in path.read_text(encoding="utf-8").split("\n\n"):
+        fields = dict(
+            line.split(": ", 1)
+            for line in stanza.splitlines()
+            if ": " in line and not line.startswith(" ")
+        )
+        if "Package" in fields:
+            records.append((fields["Package"], fields.get("Version", ""), fields["Status"]))
+    return records
+
+
+def _mapped_records(path: Path) -> list[tuple[str, str, str]]:
+    view = linux._map_file(path)
+    assert view is not None
+    with view:
+        return list(linux._iter_dpkg_records(view, None))
+
+
+def _write_status(tmp_path: Path, text: str) -> Path:
+    path = linux._status_path(tmp_path)
+    path.parent.mkdir(parents=True)
+    path.write_text(text)
+    return path
+
+
+class TestRealExecution:
+    def test_linux_reports_dpkg_packages(self, tmp_path: Path) -> None:
+        base_dir = prepare_sensor_files("corge", "linux", tmp_path)
+
+        assert linux.run_sensor(base_dir=str(base_dir)).splitlines() == FIXTURE_ROWS
+
+    @pytest.mark.parametrize(
+        "packages", [["telnetd", "bash"], "bash, telnetd", ("telnetd", "bash")]
+    )
+    def test_linux_filter_limits_rows(self, tmp_path: Path, packages: object) -> None:
+        base_dir = prepare_sensor_files("corge", "linux", tmp_path)
+
+        result = linux.run_sensor(base_dir=str(base_dir), packages=packages)
+
+        assert result.splitlines() == [FIXTURE_ROWS[0], FIXTURE_ROWS[2]]
+
+    @pytest.mark.parametrize("packages", [["nosuch"], "nosuch"])
+    def test_linux_filter_without_matches_reports_no_results(
+        self, tmp_path: Path, packages: object
+    ) -> None:
+        base_dir = prepare_sensor_files("corge", "linux", tmp_path)
+
+        assert linux.run_sensor(base_dir=str(base_dir), packages=packages) == linux._NO_RESULTS_ROW
+
+    def test_linux_missing_database_emits_error(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        assert linux.run_sensor(base_dir=str(tmp_path)) == ""
+        assert capsys.readouterr().err.startswith("CORGE001 Missing dpkg database: ")
+
+    def test_linux_unreadable_database_emits_error(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        linux._status_path(tmp_path).mkdir(parents=True)
+
+        assert linux.run_sensor(base_dir=str(tmp_path)) == ""
+        assert capsys.readouterr().err.startswith("CORGE002 Cannot map ")
+
+    def test_linux_empty_database_reports_no_results(self, tmp_path: Path) -> None:
+        _write_status(tmp_path, "")
+
+        assert linux.run_sensor(base_dir=str(tmp_path)) == linux._NO_RESULTS_ROW
+
+
+class TestStanzaScanner:
+    def test_linux_fields_may_appear_in_any_order_or_be_missing(self, tmp_path: Path) -> None:
+        path = _write_status(
+            tmp_path,
+            "Status: install ok installed\nVersion: 2.0\nPackage: late-name\n\n"
+            "Package: no-version\nStatus: purge ok not-installed\n\n"
+            "Description: a stanza without a Package field\n\n",
+        )
+
+        assert _mapped_records(path) == [
+            ("late-name", "2.0", "install ok installed"),
+            ("no-version", "", "purge ok not-installed"),
+        ]
+
+    def test_linux_extra_blank_lines_and_missing_final_newline(self, tmp_path: Path) -> None:
+        path = _write_status(
+            tmp_path, "\n\nPackage: a\nVersion: 1\n\n\n\nPackage: b\nVersion: 2\nStatus: x y z"
+        )
+
+        assert _mapped_records(path) == [("a", "1", ""), ("b", "2", "x y z")]
+
+    def test_linux_control_characters_and_bad_utf8_are_sanitized(self, tmp_path: Path) -> None:
+        path = linux._status_path(tmp_path)
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"Package: caf\xe9\nVersion: 1\x0b0\nStatus: install ok installed\n")
+
+        assert linux.run_sensor(base_dir=str(tmp_path)) == "caf�\t1?0\tinstall ok installed"
+
+    def test_linux_matches_the_naive_parser(self, tmp_path: Path) -> None:
+        path = linux._status_path(tmp_path)
+        generate_dpkg_status(path, 300)
+
+        assert _mapped_records(path) == _naive_records(path)
+
+    def test_linux_scan_does_not_copy_the_file_into_python_objects(self, tmp_path: Path) -> None:
+        path = linux._status_path(tmp_path)
+        size = generate_dpkg_status(path, 1500)
+        view = linux._map_file(path)
+        assert view is not None
+
+        tracemalloc.start()
+        try:
+            with view:
+                count = sum(1 for _ in linux._iter_dpkg_records(view, None))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert count == 1500
+        assert peak < size / 20
+
+    @pytest.mark.slow
+    @pytest.mark.timeout(120)
+    def test_linux_status_benchmark_against_naive_split(self, tmp_path: Path) -> None:
+        path = linux._status_path(tmp_path)
+        size = generate_dpkg_status(path, 8000)
+
+        def measure(parse):  # type: ignore[no-untyped-def]
+            runs = []
+            for _ in range(3):
+                started = time.perf_counter()
+                records = parse(path)
+                runs.append(time.perf_counter() - started)
+            tracemalloc.start()
+            try:
+                parse(path)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            return records, min(runs), peak
+
+        mapped, mapped_time, mapped_peak = measure(_mapped_records)
+        naive, naive_time, naive_peak = measure(_naive_records)
+        for label, seconds, peak in (
+            ("mmap", mapped_time, mapped_peak),
+            ("naive", naive_time, naive_peak),
+        ):
+            print(
+                f"{label}: {size / 2**20:.1f} MiB in {seconds * 1000:.0f} ms,"
+                f" {8000 / seconds:,.0f} packages/s, peak {peak / 1024:.0f} KiB"
+            )
+
+        assert mapped == naive
+        assert mapped_peak * 4 < naive_peak
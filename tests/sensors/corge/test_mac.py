@@ -0,0 +1,46 @@
+import plistlib
+from pathlib import Path
+
+import pytest
+
+from sensors.corge import mac
+from tests.helpers.fixtures import prepare_sensor_files
+
+
+def test_mac_reports_installer_receipts(tmp_path: Path) -> None:
+    base_dir = prepare_sensor_files("corge", "mac", tmp_path)
+
+    assert mac.run_sensor(base_dir=str(base_dir)).splitlines() == [
+        "com.apple.pkg.CLTools_Executables\t15.1.0.0.1.1700200546\tinstalled",
+        "com.example.agent\t2.4.1\tinstalled",
+    ]
+
+
+def test_mac_filter_limits_rows(tmp_path: Path) -> None:
+    base_dir = prepare_sensor_files("corge", "mac", tmp_path)
+
+    result = mac.run_sensor(base_dir=str(base_dir), packages="com.example.agent")
+
+    assert result == "com.example.agent\t2.4.1\tinstalled"
+
+
+def test_mac_missing_receipts_emits_error(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    assert mac.run_sensor(base_dir=str(tmp_path)) == ""
+    assert capsys.readouterr().err.startswith("CORGE201 Missing receipt database: ")
+
+
+def test_mac_unreadable_receipts_are_skipped_and_reported(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    receipts = mac._receipts_dir(tmp_path)
+    receipts.mkdir(parents=True)
+    (receipts / "broken.plist").write_text("<?xml version='1.0'?><plist><dict>")
+    (receipts / "empty.plist").write_bytes(plistlib.dumps({"PackageVersion": "1"}))
+    (receipts / "ok.plist").write_bytes(
+        plistlib.dumps({"PackageIdentifier": "ok"}, fmt=plistlib.FMT_BINARY)
+    )
+
+    assert mac.run_sensor(base_dir=str(tmp_path)) == "ok\t\tinstalled"
+    assert capsys.readouterr().err.startswith("CORGE203 Cannot read ")
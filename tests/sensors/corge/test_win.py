@@ -0,0 +1,36 @@
+import sys
+
+import pytest
+
+from sensors.corge import win
+
+ENTRIES = [
+    {"DisplayName": "7-Zip 23.01 (x64)", "DisplayVersion": "23.01"},
+    {"DisplayName": "", "DisplayVersion": "1.0"},
+    {"DisplayName": "Contoso\tAgent", "DisplayVersion": ""},
+]
+
+
+def test_win_reports_uninstall_entries() -> None:
+    result = win.run_sensor(entries=lambda: ENTRIES)
+
+    assert result.splitlines() == [
+        "7-Zip 23.01 (x64)\t23.01\tinstalled",
+        "Contoso?Agent\t\tinstalled",
+    ]
+
+
+def test_win_filter_limits_rows() -> None:
+    result = win.run_sensor(entries=lambda: ENTRIES, packages=["Contoso\tAgent"])
+
+    assert result == "Contoso?Agent\t\tinstalled"
+
+
+def test_win_no_programs_reports_no_results() -> None:
+    assert win.run_sensor(entries=list) == win._NO_RESULTS_ROW
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="the registry exists on Windows")
+def test_win_missing_registry_emits_error(capsys: pytest.CaptureFixture[str]) -> None:
+    assert win.run_sensor() == win._NO_RESULTS_ROW
+    assert capsys.readouterr().err.startswith("CORGE101 Registry unavailable: ")
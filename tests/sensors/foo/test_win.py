@@ -1,12 +1,36 @@
 import errno
+import io
+import json
+import os
 import shutil
+import stat
+import time
+import tracemalloc
+import zlib
+from collections import Counter
 from pathlib import Path
 
 import pytest
 
 from sensors.foo import win
-from tests.helpers.fake_entries import FakeUserDir
-from tests.helpers.fixtures import prepare_sensor_files
+from tests.helpers.fake_entries import (
+    FakeScandir,
+    FakeUserDir,
+    probed_ssh_dirs,
+    record_fs_calls,
+)
+from tests.helpers.fixtures import (
+    generate_profile_list,
+    generate_user_homes,
+    link_user_homes,
+    prepare_sensor_files,
+)
+from tests.helpers.sanitize_reference import generate_usernames, reference_sanitize_user
+
+
+def _key_columns(result: str) -> list[str]:
+    """Drop the metadata columns, whose values depend on checkout time and umask."""
+    return [line.rsplit("\t", 3)[0] for line in result.splitlines()]
 
 
 class TestRealExecution:
@@ -14,14 +38,43 @@ class TestRealExecution:
         base_dir = prepare_sensor_files("foo", "win", tmp_path)
 
         result = win.run_sensor(base_dir=str(base_dir))
-        lines = result.splitlines()
+        lines = _key_columns(result)
 
-        assert "alice\tExist" in lines
-        assert "bob\tNo" in lines
+        assert lines == [
+            "alice\tExist\ted25519,rsa",
+            "bob\tNo\t",
+            "wendy\tExist\tecdsa-sk,ed25519-sk",
+        ]
 
-    def test_win_handles_missing_users(self, tmp_path: Path) -> None:
+    def test_win_handles_missing_users(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
         result = win.run_sensor(base_dir=str(tmp_path))
         assert result == ""
+        assert capsys.readouterr().err.startswith("FOO201 ")
+
+    def test_win_reads_each_ssh_dir_once(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        users_dir = tmp_path / "Users"
+        generate_user_homes(users_dir, 40)
+        ssh_dir = users_dir / "user00000" / ".ssh"
+        for key_name in win._KEY_NAMES:
+            (ssh_dir / key_name).write_text("key")
+        fs_calls = record_fs_calls(monkeypatch)
+
+        result = win.run_sensor(base_dir=str(tmp_path))
+
+        assert (
+            _key_columns(result)[0] == "user00000\tExist\tdsa,ecdsa,ecdsa-sk,ed25519,ed25519-sk,rsa"
+        )
+        # One listing for the users root plus one `.ssh` listing per user, however many
+        # key names are checked; file types come from the cached directory entries. Windows
+        # answers DirEntry.stat (40 profile attribute checks, 6 keys here and 1 in each of the
+        # 20 odd homes) from the FindFirstFile data, and there is no home stat. Descriptors
+        # are only opened where dir_fd works.
+        calls = Counter(name for name, _ in fs_calls if name != "open")
+        assert calls == {"scandir": 41, "DirEntry.stat": 40 + 6 + 20}
 
     def test_win_emits_placeholder_when_no_users(self, tmp_path: Path) -> None:
         base_dir = prepare_sensor_files("foo", "win", tmp_path)
@@ -33,7 +86,437 @@ class TestRealExecution:
                 entry.unlink()
 
         result = win.run_sensor(base_dir=str(base_dir))
-        assert result == "[no results]\t"
+        assert result == "[no results]" + "\t" * 5
+
+    def test_win_streams_rows_matching_run_sensor(self, tmp_path: Path) -> None:
+        base_dir = prepare_sensor_files("foo", "win", tmp_path)
+
+        rows = list(win.iter_sensor_rows(base_dir=str(base_dir)))
+        stream = io.StringIO()
+        win._write_rows(iter(rows), stream)
+
+        assert "\n".join(rows) == win.run_sensor(base_dir=str(base_dir))
+        assert stream.getvalue() == "\n".join(rows) + "\n"
+
+    def test_win_write_rows_flushes_in_chunks(self) -> None:
+        writes: list[str] = []
+
+        class _RecordingStream(io.StringIO):
+            def write(self, text: str) -> int:
+                writes.append(text)
+                return len(text)
+
+        row_count = win._WRITE_CHUNK_ROWS * 2 + 1
+        win._write_rows((f"user{index}\tNo" for index in range(row_count)), _RecordingStream())
+
+        assert len(writes) == 3
+        assert sum(chunk.count("\n") for chunk in writes) == row_count
+
+    def test_win_row_stream_memory_stays_flat(self, tmp_path: Path) -> None:
+        def peak_bytes(user_count: int) -> int:
+            base_dir = tmp_path / f"scale_{user_count}"
+            generate_user_homes(base_dir / "Users", user_count, key_every=0)
+            rows = win.iter_sensor_rows(base_dir=str(base_dir))
+            next(rows)  # enumeration (the sorted name list) completes before the first row
+            tracemalloc.start()
+            try:
+                for _ in rows:
+                    pass
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        small, large = peak_bytes(50), peak_bytes(1000)
+        assert large < small * 2 + 4096
+
+
+class TestKeyMetadata:
+    def test_win_reports_key_age_mode_and_owner(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        users_dir = tmp_path / "Users"
+        generate_user_homes(users_dir, 3, key_every=0)
+        old_key = users_dir / "user00000" / ".ssh" / "id_ed25519"
+        new_key = users_dir / "user00001" / ".ssh" / "id_ed25519"
+        old_key.write_text("key")
+        new_key.write_text("key")
+        old_key.chmod(0o600)
+        new_key.chmod(0o640)
+        ten_days_ago = time.time() - 10 * 86400 - 60
+        os.utime(old_key, (ten_days_ago, ten_days_ago))
+        original_stat = win.os.stat
+
+        def foreign_home_stat(path, *args, **kwargs):  # type: ignore[no-untyped-def]
+            stat_result = original_stat(path, *args, **kwargs)
+            if os.path.basename(path) == "user00001":  # absolute or dir_fd-relative
+                fields = list(stat_result)
+                fields[4] += 1  # st_uid
+                return os.stat_result(fields)
+            return stat_result
+
+        monkeypatch.setattr(win.os, "stat", foreign_home_stat)
+
+        result = win.run_sensor(base_dir=str(tmp_path))
+
+        # NTFS has no POSIX mode bits or uid, so only the age is reported.
+        assert result.splitlines() == [
+            "user00000\tExist\ted25519\t10\t\t",
+            "user00001\tExist\ted25519\t0\t\t",
+            "user00002\tNo\t\t\t\t",
+        ]
+
+    def test_win_metadata_adds_no_stat_for_keyless_users(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        users_dir = tmp_path / "Users"
+        names = generate_user_homes(users_dir, 30, key_every=3)
+        fs_calls = record_fs_calls(monkeypatch)
+
+        result = win.run_sensor(base_dir=str(tmp_path))
+
+        assert len(result.splitlines()) == 30
+        stats = [path for name, path in fs_calls if name in {"stat", "lstat", "DirEntry.stat"}]
+        # Only DirEntry.stat, which Windows answers from the FindFirstFile data: one per profile
+        # (reparse-point check) and one per key file. NTFS has no POSIX owner to compare.
+        assert {name for name, _ in fs_calls} - {"open", "scandir"} == {"DirEntry.stat"}
+        assert sorted(path for path in stats if ".ssh" not in path) == [
+            str(users_dir / name) for name in names
+        ]
+        assert [path for path in stats if ".ssh" in path] == [
+            str(users_dir / name / ".ssh" / "id_ed25519") for name in names[2::3]
+        ]
+
+
+class TestLinkAwareEnumeration:
+    def test_win_skips_junctions_and_symlinks(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        users_dir = tmp_path / "Users"
+        generate_user_homes(users_dir, 2)
+        link_user_homes(users_dir, {"alias": "user00000"})
+        # `Default User` is a junction to a real profile; its reparse-point bit comes from
+        # the directory entry itself.
+        junction = FakeUserDir(
+            path=users_dir / "user00001",
+            fake_name="Default User",
+            file_attributes=stat.FILE_ATTRIBUTE_DIRECTORY | stat.FILE_ATTRIBUTE_REPARSE_POINT,
+        )
+        original_scandir = win.os.scandir
+
+        def patched_scandir(path):
+            with original_scandir(path) as iterator:
+                entries = list(iterator)
+            if str(path) == str(users_dir):
+                entries.append(junction)
+            return FakeScandir(entries)
+
+        monkeypatch.setattr(win.os, "scandir", patched_scandir)
+        fs_calls = record_fs_calls(monkeypatch)
+
+        result = win.run_sensor(base_dir=str(tmp_path))
+
+        assert _key_columns(result) == ["user00000\tNo\t", "user00001\tExist\ted25519"]
+        probed = probed_ssh_dirs(fs_calls)
+        assert len({os.path.realpath(path) for path in probed}) == len(probed) == 2
+
+
+class TestPathProbing:
+    def test_win_path_probes_match_descriptor_probes(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        # Windows has no dir_fd support, so the shared block falls back to full paths.
+        base_dir = prepare_sensor_files("foo", "win", tmp_path)
+        expected = win.run_sensor(base_dir=str(base_dir))
+        monkeypatch.setattr(win, "_DIR_FD", False)
+        fs_calls = record_fs_calls(monkeypatch)
+
+        result = win.run_sensor(base_dir=str(base_dir))
+
+        assert result == expected
+        assert all(os.path.isabs(path) for _, path in fs_calls)
+        assert len(probed_ssh_dirs(fs_calls)) == 3
+
+
+class TestProfileDiscovery:
+    @staticmethod
+    def _mixed_host(tmp_path: Path, listed: int, redirected: int, stale: int) -> dict[str, str]:
+        """Profiles under `Users` and on a `D:` profile share, plus non-profile folders."""
+        profiles = generate_profile_list(tmp_path, listed)
+        profiles.update(
+            generate_profile_list(
+                tmp_path, redirected, parent="Profiles", drive="D:", first_rid=100_001
+            )
+        )
+        for index in range(stale):  # Public, Default, leftovers of deleted accounts
+            (tmp_path / "Users" / f"stale{index:05d}" / ".ssh").mkdir(parents=True)
+        return profiles
+
+    def test_win_profile_discovery_matches_the_users_listing(self, tmp_path: Path) -> None:
+        profiles = generate_profile_list(tmp_path, 20)
+
+        listed = win.run_sensor(base_dir=str(tmp_path))
+        discovered = win.run_sensor(
+            base_dir=str(tmp_path), discovery="profiles", read_profiles=lambda: profiles
+        )
+
+        assert discovered == listed
+
+    def test_win_profile_discovery_reads_a_json_stand_in(self, tmp_path: Path) -> None:
+        profiles = self._mixed_host(tmp_path, 2, 1, 1)
+        (tmp_path / "Users" / "stale00000" / ".ssh" / "id_rsa").write_text("key")
+        sid = next(iter(profiles))
+        profiles[f"{sid}.bak"] = profiles[sid].upper()  # a corrupt-profile copy of one folder
+        stand_in = tmp_path / "profile_list.json"
+        stand_in.write_text(json.dumps(profiles))
+
+        result = win.run_sensor(
+            base_dir=str(tmp_path),
+            discovery="profiles",
+            read_profiles=lambda: json.loads(stand_in.read_text()),
+        )
+
+        assert _key_columns(result) == [
+            "user00000\tNo\t",
+            "user00000\tNo\t",
+            "user00001\tExist\ted25519",
+        ]
+
+    def test_win_unreadable_profile_list_reports_foo205(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        def missing_key() -> dict[str, str]:
+            raise FileNotFoundError(errno.ENOENT, "The system cannot find the file specified")
+
+        result = win.run_sensor(
+            base_dir=str(tmp_path), discovery="profiles", read_profiles=missing_key
+        )
+
+        assert result == ""
+        assert capsys.readouterr().err.startswith("FOO205 ")
+
+    @pytest.mark.parametrize(
+        "counts",
+        [
+            pytest.param((300, 100, 50), id="small"),
+            pytest.param(
+                (3000, 1000, 500),
+                id="thousands",
+                marks=[pytest.mark.slow, pytest.mark.timeout(120)],
+            ),
+        ],
+    )
+    def test_win_profile_discovery_probes_only_registered_profiles(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, counts: tuple[int, int, int]
+    ) -> None:
+        listed_count, redirected_count, stale_count = counts
+        profiles = self._mixed_host(tmp_path, *counts)
+        fs_calls = record_fs_calls(monkeypatch)
+
+        win.run_sensor(base_dir=str(tmp_path))
+        listed = probed_ssh_dirs(fs_calls)
+        fs_calls.clear()
+        win.run_sensor(base_dir=str(tmp_path), discovery="profiles", read_profiles=lambda: profiles)
+        discovered = probed_ssh_dirs(fs_calls)
+
+        print(f"{len(profiles)} SIDs: listing probed {len(listed)}, ProfileList {len(discovered)}")
+        assert len(listed) == listed_count + stale_count
+        assert len(discovered) == listed_count + redirected_count
+        assert not [path for path in discovered if "stale" in path]
+
+
+class TestShardedScans:
+    @pytest.mark.parametrize("shard_count", [2, 7])
+    def test_win_union_of_shards_equals_full_scan(self, tmp_path: Path, shard_count: int) -> None:
+        generate_user_homes(tmp_path / "Users", 40, key_every=3)
+        full = win.run_sensor(base_dir=str(tmp_path)).splitlines()
+
+        shards = [
+            win.run_sensor(base_dir=str(tmp_path), shard_count=shard_count, shard_index=index)
+            for index in range(shard_count)
+        ]
+
+        rows = [row for shard in shards for row in shard.splitlines() if row != win._NO_RESULTS_ROW]
+        assert sorted(rows) == full
+        assert all(shard for shard in shards)  # an empty shard still reports `[no results]`
+
+    def test_win_shard_membership_is_a_stable_name_hash(self, tmp_path: Path) -> None:
+        names = generate_user_homes(tmp_path / "Users", 12)
+
+        result = win.run_sensor(base_dir=str(tmp_path), shard_count=3, shard_index=1)
+
+        expected = [name for name in names if zlib.crc32(name.encode()) % 3 == 1]
+        assert [row.split("\t", 1)[0] for row in result.splitlines()] == expected
+
+    @pytest.mark.parametrize(
+        ("shard_count", "shard_index"), [(0, 0), (-2, 0), (2, 2), (3, -1), (2, None)]
+    )
+    def test_win_invalid_shard_options_fall_back_to_a_full_scan(
+        self,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+        shard_count: int,
+        shard_index: int | None,
+    ) -> None:
+        generate_user_homes(tmp_path / "Users", 6)
+        full = win.run_sensor(base_dir=str(tmp_path))
+        options = {"shard_count": shard_count, "shard_index": shard_index}
+
+        result = win.run_sensor(base_dir=str(tmp_path), **options)
+
+        assert result == full
+        assert capsys.readouterr().err.startswith("FOO207 Invalid shard_count=")
+
+    def test_win_malformed_environment_options_use_the_defaults(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        monkeypatch.setenv("FOO_TIME_BUDGET", "soon")
+        monkeypatch.setenv("FOO_SHARD_COUNT", "four")
+        monkeypatch.setenv("FOO_SHARD_INDEX", "1")
+
+        options = win._main_options()
+        win._flush_errors()
+
+        assert options["time_budget"] is None
+        assert (options["shard_count"], options["shard_index"]) == (1, 1)
+        (line,) = capsys.readouterr().err.splitlines()
+        assert line == (
+            "FOO207 Invalid FOO_TIME_BUDGET='soon'; using None;"
+            " Invalid FOO_SHARD_COUNT='four'; using 1"
+        )
+
+
+class TestAggregatedDiagnostics:
+    @staticmethod
+    def _deny(monkeypatch: pytest.MonkeyPatch, *names: str) -> None:
+        """Fail every `.ssh` listing under the given homes with EACCES."""
+        targets = tuple(os.path.join(name, ".ssh") for name in names)
+        for function in ("open", "scandir"):
+            original = getattr(win.os, function)
+
+            def denying(path, *args, _original=original, **kwargs):  # type: ignore[no-untyped-def]
+                if str(path).endswith(targets):
+                    raise PermissionError(errno.EACCES, "Denied", str(path))
+                return _original(path, *args, **kwargs)
+
+            monkeypatch.setattr(win.os, function, denying)
+
+    def test_win_stderr_volume_is_flat_as_failures_grow(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        summaries = {}
+        for count in (10, 400):
+            base_dir = tmp_path / f"run{count:04d}"
+            names = generate_user_homes(base_dir / "Users", count, key_every=1)
+            with monkeypatch.context() as patch:
+                TestAggregatedDiagnostics._deny(patch, *names)
+                win.run_sensor(base_dir=str(base_dir))
+            summaries[count] = capsys.readouterr().err
+
+        for count, err in summaries.items():
+            assert err.count("\n") == 1
+            assert err.startswith("FOO203 Cannot determine key status for ")
+            assert err.endswith(f" (+{count - win._ERROR_EXAMPLES} more)\n")
+        # Only the occurrence count grows; the three examples carry equal-width names.
+        assert len(summaries[400]) - len(summaries[10]) == len("397") - len("7")
+
+    def test_win_cut_short_run_still_writes_its_summary(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        names = generate_user_homes(tmp_path / "Users", 5, key_every=1)
+        TestAggregatedDiagnostics._deny(monkeypatch, *names)
+
+        rows = win.iter_sensor_rows(base_dir=str(tmp_path))
+        assert next(rows).startswith("user00000\tNo\t")
+        rows.close()
+
+        (line,) = capsys.readouterr().err.splitlines()
+        assert line.startswith("FOO203 Cannot determine key status for ")
+        assert "user00000" in line and "more" not in line
+        assert win._errors == {}
+
+
+class TestTimeBudget:
+    @staticmethod
+    def _slow_probes(monkeypatch: pytest.MonkeyPatch, seconds_per_probe: float) -> list[float]:
+        """Drive a fake monotonic clock that each `.ssh` probe advances."""
+        clock = [0.0]
+        original_probe = win._probe_keys
+
+        def slow_probe(*args):  # type: ignore[no-untyped-def]
+            clock[0] += seconds_per_probe
+            return original_probe(*args)
+
+        monkeypatch.setattr(win.time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(win, "_probe_keys", slow_probe)
+        return clock
+
+    def test_win_time_budget_returns_partial_results(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        generate_user_homes(tmp_path / "Users", 20, key_every=0)
+        clock = self._slow_probes(monkeypatch, 0.25)
+
+        result = win.run_sensor(base_dir=str(tmp_path), time_budget=1.0)
+
+        lines = _key_columns(result)
+        assert lines[:-1] == [f"user{index:05d}\tNo\t" for index in range(4)]
+        assert lines[-1] == "[partial results]\tTimeout\t16 users not scanned"
+        # The budget is checked before every probe, so it overshoots by at most one probe.
+        assert clock[0] == pytest.approx(1.0)
+        assert capsys.readouterr().err.startswith("FOO206 ")
+
+    def test_win_zero_time_budget_stops_before_the_first_probe(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        generate_user_homes(tmp_path / "Users", 3)
+        clock = self._slow_probes(monkeypatch, 0.25)
+
+        unbounded = win.run_sensor(base_dir=str(tmp_path), time_budget=None)
+        result = win.run_sensor(base_dir=str(tmp_path), time_budget=0)
+
+        assert "[partial results]" not in unbounded
+        assert result == win._PARTIAL_ROW.format("Timeout", 3)
+        assert clock[0] == pytest.approx(0.75)
+
+    def test_win_time_budget_not_reached_emits_no_marker(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        generate_user_homes(tmp_path / "Users", 5, key_every=0)
+        self._slow_probes(monkeypatch, 0.01)
+
+        result = win.run_sensor(base_dir=str(tmp_path), time_budget=1.0)
+
+        assert len(_key_columns(result)) == 5
+        assert "[partial results]" not in result
+
+
+class TestSanitizeFastPath:
+    def test_win_sanitize_matches_reference_loop(self) -> None:
+        mismatches = [
+            name
+            for name in generate_usernames(5000)
+            if win._sanitize_user(name) != reference_sanitize_user(name)
+        ]
+        assert mismatches == []
+
+    @pytest.mark.slow
+    @pytest.mark.timeout(300)
+    def test_win_sanitize_benchmark(self) -> None:
+        odd_names = generate_usernames(10_000)
+        names = [f"user{index:07d}" for index in range(1_000_000 - len(odd_names))] + odd_names
+
+        timings: dict[str, float] = {}
+        for label, sanitize in (
+            ("fast", win._sanitize_user),
+            ("reference", reference_sanitize_user),
+        ):
+            started = time.perf_counter()
+            for name in names:
+                sanitize(name)
+            timings[label] = time.perf_counter() - started
+            print(f"{label}: {len(names)} names in {timings[label]:.2f} s")
+
+        assert timings["fast"] < timings["reference"]
 
 
 class TestMockedBehavior:
@@ -44,37 +527,38 @@ class TestMockedBehavior:
         placeholder.mkdir(parents=True, exist_ok=True)
 
         fake_entry = FakeUserDir(path=placeholder, fake_name="\t")
-        original_iterdir = win.Path.iterdir
+        original_scandir = win.os.scandir
 
-        def patched_iterdir(self: Path):
-            entries = list(original_iterdir(self))
-            if self == users_dir:
+        def patched_scandir(path):
+            with original_scandir(path) as iterator:
+                entries = list(iterator)
+            if str(path) == str(users_dir):
                 entries.append(fake_entry)
-            return iter(entries)
+            return FakeScandir(entries)
 
-        monkeypatch.setattr(win.Path, "iterdir", patched_iterdir, raising=False)
+        monkeypatch.setattr(win.os, "scandir", patched_scandir)
 
         result = win.run_sensor(base_dir=str(base_dir))
-        assert "<unknown>\tNo" in result
+        assert "<unknown>\tNo\t" in _key_columns(result)
 
     @pytest.mark.parametrize(
         "exception",
         [PermissionError(errno.EACCES, "Denied"), OSError(errno.ENOENT, "boom")],
     )
-    def test_win_handles_iterdir_errors(
+    def test_win_handles_scandir_errors(
         self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, exception: OSError
     ) -> None:
         base_dir = prepare_sensor_files("foo", "win", tmp_path)
         users_dir = base_dir / "Users"
 
-        original_iterdir = win.Path.iterdir
+        original_scandir = win.os.scandir
 
-        def patched_iterdir(self: Path):
-            if self == users_dir:
+        def patched_scandir(path):
+            if str(path) == str(users_dir):
                 raise exception
-            return original_iterdir(self)
+            return original_scandir(path)
 
-        monkeypatch.setattr(win.Path, "iterdir", patched_iterdir, raising=False)
+        monkeypatch.setattr(win.os, "scandir", patched_scandir)
 
         result = win.run_sensor(base_dir=str(base_dir))
         assert result == ""
@@ -0,0 +1,62 @@
+import ctypes
+import sys
+
+import pytest
+
+from sensors.garply import mac
+from tests.helpers.fake_entries import FakeSocketLibproc
+
+SOCKETS = {
+    1: [(0xA1, "0.0.0.0", 22, 1, 0), (0xA2, "::", 22, 1, 0)],
+    # Forked workers share the master's socket; established and UDP sockets are not listeners.
+    310: [(0xB1, "127.0.0.1", 8080, 1, 501), (0xB2, "10.0.0.5", 50122, 4, 501)],
+    311: [(0xB1, "127.0.0.1", 8080, 1, 501), (0xB3, "0.0.0.0", 5353, None, 65)],
+    412: [(0xC1, "fe80::1", 7000, 1, 501)],
+}
+
+
+def test_mac_struct_layouts_match_proc_info_h() -> None:
+    assert ctypes.sizeof(mac._InSockInfo) == 80
+    assert ctypes.sizeof(mac._SocketFdInfo) == 792
+    assert mac._SocketFdInfo.insi.offset == 264
+
+
+def test_mac_reports_each_listening_socket_once() -> None:
+    rows = mac.run_sensor(libproc=FakeSocketLibproc(SOCKETS)).splitlines()
+
+    assert rows == [
+        "tcp\t0.0.0.0\t22\t0\t1",
+        "tcp\t127.0.0.1\t8080\t501\t310",
+        "tcp6\t::\t22\t0\t1",
+        "tcp6\tfe80::1\t7000\t501\t412",
+    ]
+
+
+def test_mac_descriptor_list_grows_for_busy_processes() -> None:
+    sockets = {9: [(index, "0.0.0.0", 1024 + index, 1, 0) for index in range(600)]}
+    libproc = FakeSocketLibproc(sockets)
+
+    assert len(mac.run_sensor(libproc=libproc).splitlines()) == 600
+    assert libproc.list_calls == 3
+
+
+def test_mac_exited_process_is_skipped_quietly(capsys: pytest.CaptureFixture[str]) -> None:
+    libproc = FakeSocketLibproc({1: SOCKETS[1]}, vanished=[77])
+
+    assert len(mac.run_sensor(libproc=libproc).splitlines()) == 2
+    assert capsys.readouterr().err == ""
+
+
+def test_mac_no_listeners_reports_no_results() -> None:
+    assert mac.run_sensor(libproc=FakeSocketLibproc({1: []})) == mac._NO_RESULTS_ROW
+
+
+def test_mac_enumeration_failure_emits_error(capsys: pytest.CaptureFixture[str]) -> None:
+    assert mac.run_sensor(libproc=FakeSocketLibproc({})) == ""
+    assert capsys.readouterr().err.startswith("GARPLY202 Unable to enumerate processes: ")
+
+
+@pytest.mark.skipif(sys.platform == "darwin", reason="libproc exists on macOS")
+def test_mac_missing_libproc_emits_error(capsys: pytest.CaptureFixture[str]) -> None:
+    assert mac.run_sensor() == ""
+    assert capsys.readouterr().err.startswith("GARPLY201 libproc unavailable: ")
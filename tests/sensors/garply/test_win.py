@@ -0,0 +1,43 @@
+import sys
+
+import pytest
+
+from sensors.garply import win
+from tests.helpers.fake_entries import FakeIphlpapi
+
+TABLES = {
+    "tcp": [("0.0.0.0", 445, 4), ("0.0.0.0", 135, 1012), ("127.0.0.1", 49664, 788)],
+    "tcp6": [("::", 445, 4), ("fe80::5efe:a00:1", 3389, 1170)],
+}
+
+
+def test_win_reports_listener_tables() -> None:
+    assert win.run_sensor(iphlpapi=FakeIphlpapi(TABLES)).splitlines() == [
+        "tcp\t0.0.0.0\t135\t\t1012",
+        "tcp\t0.0.0.0\t445\t\t4",
+        "tcp\t127.0.0.1\t49664\t\t788",
+        "tcp6\t::\t445\t\t4",
+        "tcp6\tfe80::5efe:a00:1\t3389\t\t1170",
+    ]
+
+
+def test_win_buffer_grows_with_the_table() -> None:
+    iphlpapi = FakeIphlpapi({"tcp": [("0.0.0.0", port, 4) for port in range(1024, 2024)]})
+
+    assert len(win.run_sensor(iphlpapi=iphlpapi).splitlines()) == 1000
+    assert iphlpapi.sizes == [win._TABLE_BYTES, 4 + 1000 * 24, win._TABLE_BYTES]
+
+
+def test_win_empty_tables_report_no_results() -> None:
+    assert win.run_sensor(iphlpapi=FakeIphlpapi({})) == win._NO_RESULTS_ROW
+
+
+def test_win_table_failure_emits_error(capsys: pytest.CaptureFixture[str]) -> None:
+    assert win.run_sensor(iphlpapi=FakeIphlpapi(TABLES, failure=87)) == ""
+    assert capsys.readouterr().err.startswith("GARPLY102 Unable to read the TCP listener table: ")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="iphlpapi exists on Windows")
+def test_win_missing_iphlpapi_emits_error(capsys: pytest.CaptureFixture[str]) -> None:
+    assert win.run_sensor() == ""
+    assert capsys.readouterr().err.startswith("GARPLY101 iphlpapi unavailable: ")
@@ -0,0 +1,159 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from sensors.grault import linux
+from tests.helpers.fixtures import generate_proc, prepare_sensor_files, write_proc_entry
+
+
+class TestRealExecution:
+    def test_linux_reports_proc_fixture(self, tmp_path: Path) -> None:
+        base_dir = prepare_sensor_files("grault", "linux", tmp_path)
+
+        result = linux.run_sensor(base_dir=str(base_dir), page_kb=4)
+
+        assert result.splitlines() == [
+            "1\t0\tS\t12288\tsystemd",
+            "2\t0\tS\t0\tkthreadd",
+            "812\t1\tS\t10240\tcontainerd-shim-runc-v2",
+            "4242\t1\tS\t5120\t(sd-pam)",
+            "5000\t2\tI\t0\tkworker/u16:2-e",
+        ]
+
+    def test_linux_missing_proc_emits_error(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        assert linux.run_sensor(base_dir=str(tmp_path)) == ""
+        assert capsys.readouterr().err.startswith("GRAULT001 Missing directory: ")
+
+    def test_linux_proc_without_processes_reports_no_results(self, tmp_path: Path) -> None:
+        (tmp_path / "proc/sys").mkdir(parents=True)
+
+        assert linux.run_sensor(base_dir=str(tmp_path)) == linux._NO_RESULTS_ROW
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="Live /proc requires Linux.")
+    def test_linux_live_scan_includes_this_process(self) -> None:
+        rows = [row.split("\t") for row in linux.run_sensor().splitlines()]
+        own = next(row for row in rows if row[0] == str(os.getpid()))
+
+        assert own[1] == str(os.getppid()) and int(own[3]) > 0
+
+
+class TestProcReader:
+    def test_linux_comm_with_spaces_and_parentheses(self, tmp_path: Path) -> None:
+        write_proc_entry(tmp_path / "proc", 7, "a) b (c", ppid=3, state="R", rss_pages=2)
+
+        assert linux.run_sensor(base_dir=str(tmp_path), page_kb=4) == "7\t3\tR\t8\ta) b (c"
+
+    @pytest.mark.parametrize(
+        ("cmdline", "comm"),
+        [
+            (b"/usr/lib/postgresql-16-main\0-D\0", "postgresql-16-main"),
+            (b"postgres: checkpointer\0", "postgresql-16-m"),
+            (b"", "postgresql-16-m"),
+        ],
+    )
+    def test_linux_truncated_comm_is_completed_from_argv0(
+        self, tmp_path: Path, cmdline: bytes, comm: str
+    ) -> None:
+        write_proc_entry(tmp_path / "proc", 9, "postgresql-16-m", cmdline=cmdline)
+
+        assert linux.run_sensor(base_dir=str(tmp_path)).endswith(f"\t{comm}")
+
+    def test_linux_short_comm_skips_the_cmdline_read(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        generate_proc(tmp_path / "proc", 16, first_pid=200)
+        opened: list[str] = []
+        real_open = os.open
+        monkeypatch.setattr(
+            linux.os, "open", lambda path, flags: opened.append(path) or real_open(path, flags)
+        )
+
+        assert len(linux.run_sensor(base_dir=str(tmp_path)).splitlines()) == 16
+        assert sum(path.endswith("/cmdline") for path in opened) == 2
+
+    @pytest.mark.parametrize("error", [FileNotFoundError, ProcessLookupError])
+    def test_linux_process_exiting_mid_scan_is_skipped_quietly(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+        error: type[OSError],
+    ) -> None:
+        generate_proc(tmp_path / "proc", 3, first_pid=10)
+        real_read = linux._read_into
+
+        def read_into(path: str, buffer: bytearray) -> int:
+            if "/11/" in path:
+                raise error(3, "gone")
+            return real_read(path, buffer)
+
+        monkeypatch.setattr(linux, "_read_into", read_into)
+
+        rows = linux.run_sensor(base_dir=str(tmp_path)).splitlines()
+
+        assert [row.split("\t")[0] for row in rows] == ["10", "12"]
+        assert capsys.readouterr().err == ""
+
+    def test_linux_pid_directory_without_stat_is_skipped(self, tmp_path: Path) -> None:
+        generate_proc(tmp_path / "proc", 2, first_pid=20)
+        (tmp_path / "proc/20/stat").unlink()
+
+        assert linux.run_sensor(base_dir=str(tmp_path)).split("\t")[0] == "21"
+
+    def test_linux_malformed_stat_is_reported(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        (tmp_path / "proc/30").mkdir(parents=True)
+        (tmp_path / "proc/30/stat").write_text("30 (short) S 1\n")
+
+        assert linux.run_sensor(base_dir=str(tmp_path)) == linux._NO_RESULTS_ROW
+        assert capsys.readouterr().err.startswith("GRAULT003 Cannot parse ")
+
+    def test_linux_reads_use_one_buffer_and_no_text_open(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        generate_proc(tmp_path / "proc", 40)
+        buffers: set[int] = set()
+        real_readv = os.readv
+        monkeypatch.setattr(
+            linux.os, "readv", lambda fd, parts: buffers.add(id(parts[0])) or real_readv(fd, parts)
+        )
+        monkeypatch.setattr("builtins.open", lambda *args, **kwargs: pytest.fail("open() used"))
+
+        assert len(linux.run_sensor(base_dir=str(tmp_path)).splitlines()) == 40
+        assert len(buffers) == 1
+
+    @pytest.mark.slow
+    @pytest.mark.timeout(300)
+    def test_linux_proc_scan_benchmark(self, tmp_path: Path) -> None:
+        count, proc_dir = 20_000, tmp_path / "proc"
+        pids = generate_proc(proc_dir, count)
+
+        def naive() -> list[list[str]]:
+            # One Path and one text-mode open() per file, as a straightforward port of ps would.
+            rows = []
+            for pid in pids:
+                stat = (proc_dir / str(pid) / "stat").read_text()
+                (proc_dir / str(pid) / "cmdline").read_bytes()
+                rows.append(stat[stat.rindex(")") + 2 :].split())
+            return rows
+
+        def batched() -> list[tuple[int, int, str, int | str, str]]:
+            return list(linux._iter_proc_records(str(proc_dir), pids, 4))
+
+        for label, scan in (("batched", batched), ("naive", naive)):
+            runs = []
+            for _ in range(3):
+                started = time.perf_counter()
+                rows = scan()
+                runs.append(time.perf_counter() - started)
+            print(
+                f"{label}: {count:,} processes in {min(runs) * 1000:.0f} ms, {count / min(runs):,.0f}/s"
+            )
+
+            assert len(rows) == count
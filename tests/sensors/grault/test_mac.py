@@ -0,0 +1,72 @@
+import ctypes
+import sys
+
+import pytest
+
+from sensors.grault import mac
+from tests.helpers.fake_entries import FakeLibproc
+
+PROCESSES = [
+    (1, 0, 2, 12_582_912, b"launchd"),
+    (88, 1, 3, None, b"WindowServer"),
+    (412, 1, 5, 0, b"zombie\tchild"),
+]
+
+
+def test_mac_struct_layouts_match_proc_info_h() -> None:
+    assert ctypes.sizeof(mac._BsdInfo) == 136
+    assert ctypes.sizeof(mac._TaskInfo) == 96
+
+
+def test_mac_reports_processes_in_pid_order() -> None:
+    libproc = FakeLibproc(reversed(PROCESSES))
+
+    assert mac.run_sensor(libproc=libproc).splitlines() == [
+        "1\t0\tR\t12288\tlaunchd",
+        "88\t1\tS\t\tWindowServer",
+        "412\t1\tZ\t0\tzombie?child",
+    ]
+
+
+def test_mac_reuses_one_buffer_per_flavor() -> None:
+    libproc = FakeLibproc(PROCESSES)
+
+    mac.run_sensor(libproc=libproc)
+
+    assert len(libproc.targets) == 2
+
+
+def test_mac_long_name_preferred_over_comm() -> None:
+    name = b"com.apple.WebKit.Networking"
+    libproc = FakeLibproc([(7, 1, 3, 4096, name)])
+
+    assert mac.run_sensor(libproc=libproc) == f"7\t1\tS\t4\t{name.decode()}"
+
+
+def test_mac_exited_process_is_skipped_quietly(capsys: pytest.CaptureFixture[str]) -> None:
+    libproc = FakeLibproc(PROCESSES)
+    del libproc.processes[88]
+
+    assert [row.split("\t")[0] for row in mac.run_sensor(libproc=libproc).splitlines()] == [
+        "1",
+        "412",
+    ]
+    assert capsys.readouterr().err == ""
+
+
+def test_mac_denied_process_emits_error(capsys: pytest.CaptureFixture[str]) -> None:
+    libproc = FakeLibproc(PROCESSES[:1], denied=[9])
+
+    assert mac.run_sensor(libproc=libproc) == "1\t0\tR\t12288\tlaunchd"
+    assert capsys.readouterr().err.startswith("GRAULT203 proc_pidinfo(9) failed: errno ")
+
+
+def test_mac_enumeration_failure_emits_error(capsys: pytest.CaptureFixture[str]) -> None:
+    assert mac.run_sensor(libproc=FakeLibproc([])) == ""
+    assert capsys.readouterr().err.startswith("GRAULT202 Unable to enumerate processes: ")
+
+
+@pytest.mark.skipif(sys.platform == "darwin", reason="libproc exists on macOS")
+def test_mac_missing_libproc_emits_error(capsys: pytest.CaptureFixture[str]) -> None:
+    assert mac.run_sensor() == ""
+    assert capsys.readouterr().err.startswith("GRAULT201 libproc unavailable: ")
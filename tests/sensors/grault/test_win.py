@@ -0,0 +1,54 @@
+import sys
+
+import pytest
+
+from sensors.grault import win
+from tests.helpers.fake_entries import FakeKernel32
+
+PROCESSES = [
+    (4, 0, "System", None),
+    (0, 0, "[System Process]", None),
+    (6120, 904, "explorer.exe", 157_286_400),
+    (904, 4, "svc\thost.exe", 20_480),
+]
+
+
+def test_win_reports_snapshot_in_pid_order() -> None:
+    assert win.run_sensor(kernel32=FakeKernel32(PROCESSES)).splitlines() == [
+        "0\t0\t\t\t[System Process]",
+        "4\t0\t\t\tSystem",
+        "904\t4\t\t20\tsvc?host.exe",
+        "6120\t904\t\t153600\texplorer.exe",
+    ]
+
+
+def test_win_closes_every_handle() -> None:
+    kernel32 = FakeKernel32(PROCESSES)
+
+    win.run_sensor(kernel32=kernel32)
+
+    assert kernel32.open_handles == set()
+
+
+def test_win_empty_snapshot_reports_no_results() -> None:
+    assert win.run_sensor(kernel32=FakeKernel32([])) == win._NO_RESULTS_ROW
+
+
+def test_win_failed_snapshot_emits_error(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    kernel32 = FakeKernel32(PROCESSES)
+    monkeypatch.setattr(
+        kernel32, "CreateToolhelp32Snapshot", lambda flags, pid: win._INVALID_HANDLE_VALUE
+    )
+    # ctypes only defines get_last_error on Windows; ERROR_ACCESS_DENIED stands in for it.
+    monkeypatch.setattr(win.ctypes, "get_last_error", lambda: 5, raising=False)
+
+    assert win.run_sensor(kernel32=kernel32) == ""
+    assert capsys.readouterr().err.startswith("GRAULT102 Unable to snapshot processes: ")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Toolhelp32 exists on Windows")
+def test_win_missing_toolhelp_emits_error(capsys: pytest.CaptureFixture[str]) -> None:
+    assert win.run_sensor() == ""
+    assert capsys.readouterr().err.startswith("GRAULT101 Toolhelp32 unavailable: ")
@@ -0,0 +1,219 @@
+import inspect
+import itertools
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from sensors.quux import linux
+from tests.helpers.fake_entries import record_fs_calls
+from tests.helpers.fixtures import generate_tree, prepare_sensor_files
+
+
+def _walk(top: Path, **caps: float) -> tuple[list[str], linux._BoundedWalk]:
+    options = {
+        "max_depth": linux._MAX_DEPTH,
+        "max_entries": linux._MAX_ENTRIES,
+        "deadline": float("inf"),
+    }
+    walk = linux._BoundedWalk(str(top), **{**options, **caps})
+    return sorted(os.path.relpath(entry.path, top) for entry in walk), walk
+
+
+class TestRealExecution:
+    def test_linux_reports_home_sizes(self, tmp_path: Path) -> None:
+        base_dir = prepare_sensor_files("quux", "linux", tmp_path)
+
+        result = linux.run_sensor(base_dir=str(base_dir))
+
+        assert result.splitlines() == ["alice\t66\t5\tComplete", "bob\t0\t1\tComplete"]
+
+    def test_linux_missing_home_root_emits_error(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        assert linux.run_sensor(base_dir=str(tmp_path)) == ""
+        assert capsys.readouterr().err.startswith("QUUX001 Missing directory: ")
+
+    def test_linux_empty_home_root_reports_no_results(self, tmp_path: Path) -> None:
+        (tmp_path / "home").mkdir()
+
+        assert linux.run_sensor(base_dir=str(tmp_path)) == linux._NO_RESULTS_ROW
+
+
+class TestBoundedWalk:
+    def test_linux_walk_does_not_follow_symlinks(self, tmp_path: Path) -> None:
+        generate_tree(tmp_path / "elsewhere", 50, file_bytes=100)
+        (tmp_path / "home/alice").mkdir(parents=True)
+        os.symlink(tmp_path / "elsewhere", tmp_path / "home/alice/big")
+        os.symlink(tmp_path / "home/alice", tmp_path / "home/alice/loop")
+
+        result = linux.run_sensor(base_dir=str(tmp_path))
+
+        size = len(str(tmp_path / "elsewhere")) + len(str(tmp_path / "home/alice"))
+        assert result == f"alice\t{size}\t2\tComplete"
+
+    def test_linux_walk_is_iterative_beyond_the_recursion_limit(self, tmp_path: Path) -> None:
+        leaf = tmp_path.joinpath(*["d"] * 300)
+        leaf.mkdir(parents=True)
+        (leaf / "deepest").write_text("x")
+        # Allow 100 more frames than are in use: a recursive walk could not go 300 deep.
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(len(inspect.stack(0)) + 100)
+        try:
+            paths, walk = _walk(tmp_path, max_depth=5000)
+        finally:
+            sys.setrecursionlimit(limit)
+
+        assert len(paths) == 301 and paths[-1].endswith("deepest")
+        assert walk.status == "Complete"
+
+    def test_linux_depth_cap_skips_deeper_directories(self, tmp_path: Path) -> None:
+        (tmp_path / "a/b/c").mkdir(parents=True)
+        (tmp_path / "a/top.txt").write_text("x")
+
+        paths, walk = _walk(tmp_path, max_depth=1)
+
+        assert paths == ["a", "a/b", "a/top.txt"]
+        assert walk.status == "Truncated(depth)"
+
+    def test_linux_entry_cap_stops_the_walk(self, tmp_path: Path) -> None:
+        generate_tree(tmp_path, 30, fanout=10)
+
+        paths, walk = _walk(tmp_path, max_entries=12)
+
+        assert len(paths) == walk.entries == 12
+        assert walk.status == "Truncated(entries)"
+
+    def test_linux_time_budget_stops_the_walk_and_the_scan(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        monkeypatch.setattr(linux, "_CLOCK_EVERY", 16)
+        generate_tree(tmp_path / "home/alice", 40)
+        (tmp_path / "home/bob").mkdir()
+        (tmp_path / "home/carol").mkdir()
+        clock = itertools.count(0, 10)  # every clock read advances ten seconds
+        monkeypatch.setattr(linux.time, "monotonic", lambda: next(clock))
+
+        rows = linux.run_sensor(base_dir=str(tmp_path), time_budget=25).splitlines()
+
+        assert rows[0].startswith("alice\t0\t") and rows[0].endswith("\tTruncated(time)")
+        assert rows[-1] == "[partial results]\t\t\tTimeout: 2 users not scanned"
+        assert capsys.readouterr().err.startswith("QUUX004 Time budget exhausted; 2 left")
+
+    def test_linux_zero_time_budget_expires_before_the_first_home(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        base_dir = prepare_sensor_files("quux", "linux", tmp_path)
+
+        rows = linux.run_sensor(base_dir=str(base_dir), time_budget=0).splitlines()
+
+        assert rows == ["[partial results]\t\t\tTimeout: 2 users not scanned"]
+        assert capsys.readouterr().err.startswith("QUUX004 Time budget exhausted; 2 left")
+
+    def test_linux_none_time_budget_never_expires(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        base_dir = prepare_sensor_files("quux", "linux", tmp_path)
+        clock = itertools.count(0, 10_000)
+        monkeypatch.setattr(linux.time, "monotonic", lambda: next(clock))
+
+        rows = linux.run_sensor(base_dir=str(base_dir), time_budget=None).splitlines()
+
+        assert [row.rsplit("\t", 1)[1] for row in rows] == ["Complete", "Complete"]
+
+    @pytest.mark.parametrize(
+        ("value", "expected"), [(None, linux._TIME_BUDGET), ("0", 0.0), ("2.5", 2.5)]
+    )
+    def test_linux_time_budget_env_is_parsed(
+        self, monkeypatch: pytest.MonkeyPatch, value: str | None, expected: float
+    ) -> None:
+        if value is not None:
+            monkeypatch.setenv("QUUX_TIME_BUDGET", value)
+        else:
+            monkeypatch.delenv("QUUX_TIME_BUDGET", raising=False)
+
+        assert linux._env_number("QUUX_TIME_BUDGET", float, linux._TIME_BUDGET) == expected
+
+    def test_linux_malformed_time_budget_env_is_reported(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        monkeypatch.setenv("QUUX_TIME_BUDGET", "30s")
+
+        assert linux._env_number("QUUX_TIME_BUDGET", float, linux._TIME_BUDGET) == 30.0
+        linux._flush_errors()
+        assert capsys.readouterr().err == "QUUX005 Invalid QUUX_TIME_BUDGET='30s'; using 30.0\n"
+
+    def test_linux_clock_is_read_once_per_clock_interval(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(linux, "_CLOCK_EVERY", 16)
+        generate_tree(tmp_path, 100)
+        reads = []
+        monkeypatch.setattr(linux.time, "monotonic", lambda: reads.append(1) or 0.0)
+
+        paths, walk = _walk(tmp_path, deadline=1.0)
+
+        assert walk.status == "Complete" and len(paths) == 100
+        assert len(reads) == -(-100 // 16)
+
+    def test_linux_unlistable_directory_truncates_the_walk(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        (tmp_path / "home/alice/private").mkdir(parents=True)
+        (tmp_path / "home/alice/private/secret").write_text("x" * 7)
+        (tmp_path / "home/alice/public").write_text("x" * 3)
+        scandir = os.scandir
+
+        def deny_private(path):  # type: ignore[no-untyped-def]
+            if str(path).endswith("private"):
+                raise PermissionError(13, "Permission denied", str(path))
+            return scandir(path)
+
+        monkeypatch.setattr(linux.os, "scandir", deny_private)
+
+        # The size misses what `private` holds, so the row must not claim `Complete`.
+        assert linux.run_sensor(base_dir=str(tmp_path)) == "alice\t3\t2\tTruncated(unreadable)"
+        assert capsys.readouterr().err.startswith("QUUX003 Cannot list ")
+
+    def test_linux_directories_are_entered_without_a_stat(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        (tmp_path / "home/alice/a/b").mkdir(parents=True)
+        (tmp_path / "home/alice/a/b/file").write_text("x" * 5)
+        fs_calls = record_fs_calls(monkeypatch)
+
+        assert linux.run_sensor(base_dir=str(tmp_path)) == "alice\t5\t3\tComplete"
+        # Only the file's size costs a stat; reparse attributes exist on Windows alone.
+        stats = [path for name, path in fs_calls if name in {"stat", "lstat", "DirEntry.stat"}]
+        assert stats == [str(tmp_path / "home/alice/a/b/file")]
+
+    def test_linux_unlistable_home_is_reported_as_unreadable(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        (tmp_path / "home/alice").mkdir(parents=True)
+        scandir = os.scandir
+
+        def deny_alice(path):  # type: ignore[no-untyped-def]
+            if str(path).endswith("alice"):
+                raise PermissionError(13, "Permission denied", str(path))
+            return scandir(path)
+
+        monkeypatch.setattr(linux.os, "scandir", deny_alice)
+
+        assert linux.run_sensor(base_dir=str(tmp_path)) == "alice\t\t\tUnreadable"
+
+    @pytest.mark.slow
+    @pytest.mark.timeout(600)
+    def test_linux_walk_benchmark_million_entries(self, tmp_path: Path) -> None:
+        files = generate_tree(tmp_path / "home/svc", 1_000_000, file_bytes=1)
+        runs = []
+        for _ in range(3):
+            started = time.perf_counter()
+            row = linux.run_sensor(base_dir=str(tmp_path), time_budget=None)
+            runs.append(time.perf_counter() - started)
+        rate = 1_000_000 / min(runs)
+        print(f"1,000,000 entries: {min(runs):.2f} s, {rate:,.0f} entries/s")
+
+        assert row == f"svc\t{files}\t1000000\tComplete"
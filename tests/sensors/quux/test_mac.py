@@ -0,0 +1,40 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from sensors.quux import mac
+from tests.helpers.fixtures import generate_tree, prepare_sensor_files
+
+
+def test_mac_reports_home_sizes(tmp_path: Path) -> None:
+    base_dir = prepare_sensor_files("quux", "mac", tmp_path)
+
+    result = mac.run_sensor(base_dir=str(base_dir))
+
+    assert result.splitlines() == ["alice\t66\t5\tComplete", "bob\t0\t1\tComplete"]
+
+
+def test_mac_missing_users_root_emits_error(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    assert mac.run_sensor(base_dir=str(tmp_path)) == ""
+    assert capsys.readouterr().err.startswith("QUUX201 Missing directory: ")
+
+
+def test_mac_entry_cap_is_per_home(tmp_path: Path) -> None:
+    generate_tree(tmp_path / "Users/alice", 40, fanout=10, file_bytes=2)
+    generate_tree(tmp_path / "Users/bob", 5, file_bytes=2)
+
+    result = mac.run_sensor(base_dir=str(tmp_path), max_entries=20)
+
+    assert result.splitlines()[1] == "bob\t8\t5\tComplete"
+    assert result.splitlines()[0].endswith("\t20\tTruncated(entries)")
+
+
+def test_mac_symlinked_home_is_not_listed(tmp_path: Path) -> None:
+    generate_tree(tmp_path / "elsewhere", 5)
+    (tmp_path / "Users").mkdir()
+    os.symlink(tmp_path / "elsewhere", tmp_path / "Users/linked")
+
+    assert mac.run_sensor(base_dir=str(tmp_path)) == mac._NO_RESULTS_ROW
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+import pytest
+
+from sensors.quux import win
+from tests.helpers.fixtures import generate_tree, prepare_sensor_files
+
+
+def test_win_reports_home_sizes(tmp_path: Path) -> None:
+    base_dir = prepare_sensor_files("quux", "win", tmp_path)
+
+    result = win.run_sensor(base_dir=str(base_dir))
+
+    assert result.splitlines() == ["alice\t66\t5\tComplete", "bob\t0\t1\tComplete"]
+
+
+def test_win_missing_users_root_emits_error(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    assert win.run_sensor(base_dir=str(tmp_path)) == ""
+    assert capsys.readouterr().err.startswith("QUUX101 Missing directory: ")
+
+
+def test_win_depth_cap_reports_truncation(tmp_path: Path) -> None:
+    generate_tree(tmp_path / "Users/alice/AppData/Local/Packages", 12, fanout=5, file_bytes=4)
+
+    result = win.run_sensor(base_dir=str(tmp_path), max_depth=2)
+
+    assert result == "alice\t0\t3\tTruncated(depth)"
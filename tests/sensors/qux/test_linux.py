@@ -0,0 +1,182 @@
+import errno
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from sensors.qux import linux
+from tests.helpers.fixtures import generate_authorized_keys, prepare_sensor_files
+
+
+def _scan(path: Path, max_bytes: int = linux._MAX_FILE_BYTES) -> tuple[object, ...]:
+    count, algorithms, options, truncated = linux._scan_authorized_keys(str(path), max_bytes)
+    return count, sorted(algorithms), sorted(options), truncated
+
+
+class TestRealExecution:
+    def test_linux_reports_authorized_keys(self, tmp_path: Path) -> None:
+        base_dir = prepare_sensor_files("qux", "linux", tmp_path)
+
+        result = linux.run_sensor(base_dir=str(base_dir))
+
+        assert result.splitlines() == [
+            "alice\tExist\t3\tecdsa-sha2-nistp256,ssh-ed25519,ssh-rsa\tcommand,from",
+            "bob\tNo\t\t\t",
+            "carol\tExist\t0\t\t",
+        ]
+
+    def test_linux_missing_home_root_emits_error(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        assert linux.run_sensor(base_dir=str(tmp_path)) == ""
+        assert capsys.readouterr().err.startswith("QUX001 Missing directory: ")
+
+    def test_linux_empty_home_root_reports_no_results(self, tmp_path: Path) -> None:
+        (tmp_path / "home").mkdir()
+
+        assert linux.run_sensor(base_dir=str(tmp_path)) == linux._NO_RESULTS_ROW
+
+    def test_linux_unreadable_file_is_reported(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        path = tmp_path / "home/dave/.ssh/authorized_keys"
+        generate_authorized_keys(path, 3)
+
+        def denied(*args: object, **kwargs: object) -> int:
+            raise PermissionError(errno.EACCES, "Permission denied", str(path))
+
+        monkeypatch.setattr(linux.os, "open", denied)
+
+        assert linux.run_sensor(base_dir=str(tmp_path)) == "dave\tUnreadable\t\t\t"
+        assert capsys.readouterr().err.startswith("QUX003 Cannot read ")
+
+    def test_linux_directory_is_reported_as_not_regular(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        (tmp_path / "home/dave/.ssh/authorized_keys").mkdir(parents=True)
+
+        assert linux.run_sensor(base_dir=str(tmp_path)) == "dave\tNotRegular\t\t\t"
+        assert capsys.readouterr().err == ""
+
+    @pytest.mark.timeout(10)
+    def test_linux_fifo_is_reported_without_blocking(self, tmp_path: Path) -> None:
+        path = tmp_path / "home/erin/.ssh/authorized_keys"
+        path.parent.mkdir(parents=True)
+        os.mkfifo(path)  # with no writer, a blocking open would never return
+
+        assert linux.run_sensor(base_dir=str(tmp_path)) == "erin\tNotRegular\t\t\t"
+
+    def test_linux_symlink_is_not_followed(self, tmp_path: Path) -> None:
+        shadow = tmp_path / "etc" / "shadow"
+        generate_authorized_keys(shadow, 3)
+        path = tmp_path / "home/mallory/.ssh/authorized_keys"
+        path.parent.mkdir(parents=True)
+        path.symlink_to(shadow)
+
+        assert linux.run_sensor(base_dir=str(tmp_path)) == "mallory\tNotRegular\t\t\t"
+
+
+class TestLineParser:
+    @pytest.mark.parametrize(
+        ("line", "algorithm", "options"),
+        [
+            ("ssh-ed25519 AAAA user@host", "ssh-ed25519", []),
+            ("  ssh-rsa AAAA\r", "ssh-rsa", []),
+            ('command="echo a, b c" ssh-rsa AAAA', "ssh-rsa", ["command"]),
+            ('no-pty,FROM="*.example.com" ssh-dss AAAA', "ssh-dss", ["from"]),
+            (
+                'from="10.0.0.1",command="x \\" y" ecdsa-sha2-nistp521 AAAA',
+                "ecdsa-sha2-nistp521",
+                ["command", "from"],
+            ),
+            ("restrict sk-ssh-ed25519@openssh.com AAAA", "sk-ssh-ed25519@openssh.com", []),
+            ("ssh-foo AAAA", "unknown", []),
+            ('command="unterminated ssh-rsa AAAA', "unknown", ["command"]),
+        ],
+    )
+    def test_linux_classifies_entries(self, line: str, algorithm: str, options: list[str]) -> None:
+        algorithms: set[str] = set()
+        seen: set[str] = set()
+
+        assert linux._classify_entry(line.encode(), algorithms, seen)
+        assert algorithms == {algorithm}
+        assert sorted(seen) == options
+
+    @pytest.mark.parametrize("line", ["", "   \t", "# comment", "  #ssh-rsa AAAA"])
+    def test_linux_skips_blank_and_comment_lines(self, line: str) -> None:
+        assert not linux._classify_entry(line.encode(), set(), set())
+
+    def test_linux_chunk_boundaries_do_not_change_the_result(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        path = tmp_path / "authorized_keys"
+        generate_authorized_keys(path, 400)
+        path.write_bytes(path.read_bytes() + b"ssh-dss AAAA last-line-without-newline")
+        expected = _scan(path)
+
+        monkeypatch.setattr(linux, "_CHUNK_BYTES", 7)
+
+        assert _scan(path) == expected
+        assert expected == (
+            301,
+            ["ecdsa-sha2-nistp256", "ssh-dss", "ssh-ed25519", "ssh-rsa"],
+            ["command", "from"],
+            False,
+        )
+
+    def test_linux_stops_at_the_per_file_byte_cap(self, tmp_path: Path) -> None:
+        path = tmp_path / "authorized_keys"
+        size = generate_authorized_keys(path, 2000)
+        lines = path.read_bytes().split(b"\n")
+        cap = len(b"\n".join(lines[:10])) + 5  # ten full lines and part of the eleventh
+
+        count, _, _, truncated = _scan(path, cap)
+
+        assert truncated
+        assert count == sum(not line.startswith(b"#") for line in lines[:10])
+        assert _scan(path, size)[3] is False
+
+    def test_linux_truncated_file_is_flagged_in_the_row(self, tmp_path: Path) -> None:
+        generate_authorized_keys(tmp_path / "home/svc/.ssh/authorized_keys", 500)
+
+        result = linux.run_sensor(base_dir=str(tmp_path), max_file_bytes=1024)
+
+        assert result.split("\t")[:2] == ["svc", "Truncated"]
+
+    def test_linux_parser_memory_does_not_grow_with_file_size(self, tmp_path: Path) -> None:
+        def peak_bytes(line_count: int) -> int:
+            path = tmp_path / f"authorized_keys_{line_count}"
+            generate_authorized_keys(path, line_count)
+            tracemalloc.start()
+            try:
+                linux._scan_authorized_keys(str(path), linux._MAX_FILE_BYTES)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        small, large = peak_bytes(2000), peak_bytes(20000)
+        assert large < small * 1.5 + 16384
+
+    @pytest.mark.slow
+    @pytest.mark.timeout(120)
+    def test_linux_parser_benchmark(self, tmp_path: Path) -> None:
+        path = tmp_path / "authorized_keys"
+        size = generate_authorized_keys(path, 500_000)
+        runs = []
+        for _ in range(3):
+            started = time.perf_counter()
+            count, _, _, truncated = linux._scan_authorized_keys(str(path), size)
+            runs.append(time.perf_counter() - started)
+        tracemalloc.start()
+        try:
+            linux._scan_authorized_keys(str(path), size)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        rate = 500_000 / min(runs)
+        print(f"{size / 2**20:.1f} MiB: {rate:,.0f} lines/s, peak {peak / 1024:.0f} KiB")
+
+        assert (count, truncated) == (375_000, False)
+        assert peak < 8 * linux._CHUNK_BYTES
@@ -0,0 +1,56 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from sensors.qux import mac
+from tests.helpers.fixtures import generate_authorized_keys, prepare_sensor_files
+
+
+def test_mac_reports_authorized_keys(tmp_path: Path) -> None:
+    base_dir = prepare_sensor_files("qux", "mac", tmp_path)
+
+    result = mac.run_sensor(base_dir=str(base_dir))
+
+    assert result.splitlines() == [
+        "alice\tExist\t3\tecdsa-sha2-nistp256,ssh-ed25519,ssh-rsa\tcommand,from",
+        "bob\tNo\t\t\t",
+        "carol\tExist\t0\t\t",
+    ]
+
+
+def test_mac_missing_users_root_emits_error(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    assert mac.run_sensor(base_dir=str(tmp_path)) == ""
+    assert capsys.readouterr().err.startswith("QUX201 Missing directory: ")
+
+
+def test_mac_large_file_is_counted_in_full_below_the_cap(tmp_path: Path) -> None:
+    generate_authorized_keys(tmp_path / "Users/svc/.ssh/authorized_keys", 8000)
+
+    assert mac.run_sensor(base_dir=str(tmp_path)).split("\t")[:3] == ["svc", "Exist", "6000"]
+
+
+@pytest.mark.timeout(10)
+def test_mac_fifo_is_reported_without_blocking(tmp_path: Path) -> None:
+    path = tmp_path / "Users/erin/.ssh/authorized_keys"
+    path.parent.mkdir(parents=True)
+    if not hasattr(os, "mkfifo"):
+        pytest.skip("FIFOs unavailable")
+    os.mkfifo(path)  # with no writer, a blocking open would never return
+
+    assert mac.run_sensor(base_dir=str(tmp_path)) == "erin\tNotRegular\t\t\t"
+
+
+def test_mac_symlink_is_not_followed(tmp_path: Path) -> None:
+    secret = tmp_path / "secret"
+    generate_authorized_keys(secret, 3)
+    path = tmp_path / "Users/mallory/.ssh/authorized_keys"
+    path.parent.mkdir(parents=True)
+    try:
+        path.symlink_to(secret)
+    except OSError as exc:
+        pytest.skip(f"symlinks unavailable: {exc}")
+
+    assert mac.run_sensor(base_dir=str(tmp_path)) == "mallory\tNotRegular\t\t\t"
@@ -0,0 +1,69 @@
+"""Check the copy-block diagnostics layer: one summary line per documented code, per run."""
+
+from __future__ import annotations
+
+import importlib
+import re
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SENSORS_ROOT = REPO_ROOT / "sensors"
+OS_FILES = ("linux", "mac", "win")
+ERROR_CODE_PATTERN = re.compile(r'_ERROR_[A-Z0-9_]+\s*=\s*"([A-Z]+[0-9]+)"')
+README_CODE_PATTERN = re.compile(r"^\|\s*([A-Z]+[0-9]+)\s*\|", re.MULTILINE)
+
+CASES = [
+    (sensor_dir.name, os_name)
+    for sensor_dir in sorted(SENSORS_ROOT.iterdir())
+    if (sensor_dir / "tanium_settings.yaml").exists()
+    for os_name in OS_FILES
+]
+CASE_IDS = [f"{sensor}-{os_name}" for sensor, os_name in CASES]
+
+
+def _declared_codes(sensor: str, os_name: str) -> list[str]:
+    source = (SENSORS_ROOT / sensor / f"{os_name}.py").read_text(encoding="utf-8")
+    return ERROR_CODE_PATTERN.findall(source)
+
+
+def _summaries(module, codes: list[str], failures: int, capsys) -> list[str]:  # type: ignore[no-untyped-def]
+    for index in range(failures):
+        for code in codes:
+            module._emit_error(code, f"Failure at /srv/home/user{index:05d}")
+    module._flush_errors()
+    return capsys.readouterr().err.splitlines()
+
+
+@pytest.mark.parametrize(("sensor", "os_name"), CASES, ids=CASE_IDS)
+def test_stderr_volume_is_constant_as_failures_grow(
+    sensor: str, os_name: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    module = importlib.import_module(f"sensors.{sensor}.{os_name}")
+    codes = _declared_codes(sensor, os_name)
+    documented = set(README_CODE_PATTERN.findall((SENSORS_ROOT / sensor / "README.md").read_text()))
+
+    few = _summaries(module, codes, 5, capsys)
+    many = _summaries(module, codes, 5000, capsys)
+
+    assert len(few) == len(many) == min(len(codes), module._ERROR_LINES)
+    for line in many:
+        code, _, text = line.partition(" ")
+        assert code in documented
+        assert text.count("Failure at ") == module._ERROR_EXAMPLES
+        assert text.endswith(f" (+{5000 - module._ERROR_EXAMPLES} more)")
+    assert module._errors == {}
+
+
+@pytest.mark.parametrize(("sensor", "os_name"), CASES, ids=CASE_IDS)
+def test_line_cap_holds_across_codes(
+    sensor: str, os_name: str, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    module = importlib.import_module(f"sensors.{sensor}.{os_name}")
+    monkeypatch.setattr(module, "_ERROR_LINES", 1)
+
+    lines = _summaries(module, _declared_codes(sensor, os_name), 3, capsys)
+
+    assert len(lines) == 1
+    assert module._errors == {}
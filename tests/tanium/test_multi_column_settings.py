@@ -3,13 +3,12 @@
 from __future__ import annotations
 
 import importlib
-import sys
 from pathlib import Path
 from typing import TypedDict
 
 import pytest
 import yaml
-from tests.helpers.fixtures import prepare_sensor_files
+from tests.helpers.fixtures import os_matches_host, prepare_sensor_files
 
 
 class _MultiColumnCase(TypedDict):
@@ -79,7 +78,7 @@ def _iter_multi_column_cases() -> list[_MultiColumnCase]:
             files_dir = os_dir / "files"
             if not os_dir.is_dir() or not files_dir.exists():
                 continue
-            if not _os_matches_host(os_dir.name):
+            if not os_matches_host(os_dir.name):
                 continue
 
             cases.append(
@@ -95,17 +94,6 @@ def _iter_multi_column_cases() -> list[_MultiColumnCase]:
     return cases
 
 
-def _os_matches_host(os_name: str) -> bool:
-    platform = sys.platform
-    if os_name == "linux":
-        return platform.startswith("linux")
-    if os_name == "mac":
-        return platform == "darwin"
-    if os_name == "win":
-        return platform in {"win32", "cygwin"}
-    return False
-
-
 MULTI_COLUMN_CASES = _iter_multi_column_cases()
 CASE_IDS = [f"{case['sensor']}-{case['os']}" for case in MULTI_COLUMN_CASES]
 
@@ -114,12 +102,31 @@ def _validate_value(column_type: str, value: str) -> None:
     if column_type in {"text", "string"}:
         return
     if column_type in {"number", "numeric", "float"}:
-        float(value)
-        return
-    if column_type in {"integer", "int"}:
-        int(value)
-        return
-    raise AssertionError(f"Unsupported column type '{column_type}' in tanium_settings.yaml")
+        convert: type[float | int] = float
+    elif column_type in {"integer", "int"}:
+        convert = int
+    else:
+        raise AssertionError(f"Unsupported column type '{column_type}' in tanium_settings.yaml")
+    if value:  # empty cells (no data, the `[no results]` row) carry nothing to convert
+        convert(value)
+
+
+@pytest.mark.parametrize(
+    ("column_type", "value", "valid"),
+    [
+        ("integer", "12", True),
+        ("integer", "", True),
+        ("integer", "1.5", False),
+        ("number", "1.5", True),
+        ("number", "Exist", False),
+    ],
+)
+def test_validate_value_checks_numeric_columns(column_type: str, value: str, valid: bool) -> None:
+    if valid:
+        _validate_value(column_type, value)
+    else:
+        with pytest.raises(ValueError):
+            _validate_value(column_type, value)
 
 
 @pytest.mark.parametrize("case", MULTI_COLUMN_CASES, ids=CASE_IDS)
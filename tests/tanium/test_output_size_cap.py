@@ -0,0 +1,187 @@
+"""Check every sensor honours the max_output_bytes cap declared in its manifest."""
+
+from __future__ import annotations
+
+import importlib
+import plistlib
+import re
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+import yaml
+from tests.helpers.fake_entries import (
+    FakeIphlpapi,
+    FakeKernel32,
+    FakeLibproc,
+    FakeSocketLibproc,
+)
+from tests.helpers.fixtures import (
+    TCP6_HEADER,
+    format_tcp_row,
+    os_matches_host,
+    write_proc_entry,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SENSORS_ROOT = REPO_ROOT / "sensors"
+OS_FILES = ("linux", "mac", "win")
+_MARKER = re.compile(r"^\[partial results\]\s+Truncated\D+(\d+)")
+
+
+def _declared_caps() -> dict[str, int]:
+    caps: dict[str, int] = {}
+    for settings_path in sorted(SENSORS_ROOT.glob("*/tanium_settings.yaml")):
+        tanium_section = (yaml.safe_load(settings_path.read_text()) or {}).get("tanium", {})
+        caps[settings_path.parent.name] = tanium_section.get("max_output_bytes")
+    return caps
+
+
+def _oversized_homes(
+    module: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, cap: int
+) -> tuple[str, int]:
+    """Create enough 200-character home names that one row per home overruns ``cap``."""
+    users_dir = tmp_path / ("home" if module.__name__.endswith(".linux") else "Users")
+    count = cap // 200 + 8
+    for index in range(count):
+        (users_dir / f"user{index:05d}".ljust(200, "x")).mkdir(parents=True)
+    return module.run_sensor(str(tmp_path)), count
+
+
+def _oversized_bar(
+    module: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, cap: int
+) -> tuple[str, int]:
+    """Inject a reader whose output no build pattern matches and that exceeds ``cap``."""
+    return module.run_sensor(readers={"command": lambda root: "x" * (cap * 2)}), 1
+
+
+def _oversized_baz(
+    module: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, cap: int
+) -> tuple[str, int]:
+    """Inject a hostname reader whose value alone exceeds ``cap``."""
+    return module.run_sensor(readers={"hostname": lambda root: "h" * (cap * 2)}), 1
+
+
+def _oversized_corge(
+    module: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, cap: int
+) -> tuple[str, int]:
+    """Record enough 200-character package names in each OS's package database to overrun ``cap``."""
+    count = cap // 200 + 8
+    names = [f"pkg{index:05d}".ljust(200, "x") for index in range(count)]
+    if module.__name__.endswith(".win"):
+        return module.run_sensor(entries=lambda: [{"DisplayName": name} for name in names]), count
+    if module.__name__.endswith(".mac"):
+        receipts = module._receipts_dir(tmp_path)
+        receipts.mkdir(parents=True)
+        for name in names:
+            (receipts / f"{name}.plist").write_bytes(plistlib.dumps({"PackageIdentifier": name}))
+    else:
+        status = module._status_path(tmp_path)
+        status.parent.mkdir(parents=True)
+        status.write_text(
+            "".join(f"Package: {name}\nStatus: install ok installed\n\n" for name in names)
+        )
+    return module.run_sensor(str(tmp_path)), count
+
+
+def _oversized_grault(
+    module: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, cap: int
+) -> tuple[str, int]:
+    """Report enough processes with 200-character names to overrun ``cap`` on each OS."""
+    count = cap // 200 + 8
+    names = [f"proc{index:05d}".ljust(200, "x") for index in range(count)]
+    pids = range(100, 100 + count)
+    if module.__name__.endswith(".win"):
+        kernel32 = FakeKernel32(
+            [(pid, 1, name, 4096) for pid, name in zip(pids, names, strict=True)]
+        )
+        return module.run_sensor(kernel32=kernel32), count
+    if module.__name__.endswith(".mac"):
+        # proc_bsdinfo holds at most 32 name bytes, so the run state pads the rows instead.
+        libproc = FakeLibproc(
+            [(pid, 1, 2, 4096, name.encode()) for pid, name in zip(pids, names, strict=True)]
+        )
+        monkeypatch.setattr(module, "_STATES", {2: "R" * 200})
+        return module.run_sensor(libproc=libproc), count
+    proc_dir = module._proc_dir(tmp_path)
+    for pid, name in zip(pids, names, strict=True):
+        write_proc_entry(proc_dir, pid, name)
+    return module.run_sensor(str(tmp_path), page_kb=4), count
+
+
+def _oversized_garply(
+    module: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, cap: int
+) -> tuple[str, int]:
+    """Report enough IPv6 listeners (about 60 bytes per row) to overrun ``cap`` on each OS."""
+    count = cap // 40 + 8
+    ports = range(1024, 1024 + count)
+    address = "fd00:1111:2222:3333:4444:5555:6666:7777"
+    if module.__name__.endswith(".win"):
+        tables = {"tcp6": [(address, port, 4) for port in ports]}
+        return module.run_sensor(iphlpapi=FakeIphlpapi(tables)), count
+    if module.__name__.endswith(".mac"):
+        sockets = {4: [(port, address, port, 1, 0) for port in ports]}
+        return module.run_sensor(libproc=FakeSocketLibproc(sockets)), count
+    net_dir = module._proc_dir(tmp_path) / "net"
+    net_dir.mkdir(parents=True)
+    # The address as the kernel prints it: each 32-bit word as a little-endian number.
+    local = "111100FD333322225555444477776666"
+    rows = (
+        format_tcp_row(sl, f"{local}:{port:04X}", "0" * 32 + ":0000", 0x0A)
+        for sl, port in enumerate(ports)
+    )
+    (net_dir / "tcp6").write_text(TCP6_HEADER + "".join(rows))
+    return module.run_sensor(str(tmp_path)), count
+
+
+_OVERSIZED_RUNS: dict[
+    str, Callable[[ModuleType, Path, pytest.MonkeyPatch, int], tuple[str, int]]
+] = {
+    "foo": _oversized_homes,
+    "bar": _oversized_bar,
+    "baz": _oversized_baz,
+    "qux": _oversized_homes,
+    "quux": _oversized_homes,
+    "corge": _oversized_corge,
+    "grault": _oversized_grault,
+    "garply": _oversized_garply,
+    "waldo": _oversized_homes,
+}
+
+CAPS = _declared_caps()
+CASES = [(sensor, os_name) for sensor in CAPS for os_name in OS_FILES]
+# The oversized runs reach OS-only APIs (grault's Linux reader uses os.readv, for one), so
+# each host runs its own modules; the CI matrix covers the rest.
+NATIVE_CASES = [(sensor, os_name) for sensor, os_name in CASES if os_matches_host(os_name)]
+
+
+def test_every_sensor_declares_a_cap_and_an_oversized_fixture() -> None:
+    for sensor, cap in CAPS.items():
+        assert isinstance(cap, int) and cap > 0, f"{sensor} must declare max_output_bytes."
+        assert sensor in _OVERSIZED_RUNS, f"Add an oversized fixture for {sensor} to this module."
+
+
+@pytest.mark.parametrize(("sensor", "os_name"), CASES, ids=[f"{s}-{o}" for s, o in CASES])
+def test_sensor_cap_matches_manifest(sensor: str, os_name: str) -> None:
+    module = importlib.import_module(f"sensors.{sensor}.{os_name}")
+
+    assert module._MAX_OUTPUT_BYTES == CAPS[sensor]
+
+
+@pytest.mark.parametrize(
+    ("sensor", "os_name"), NATIVE_CASES, ids=[f"{s}-{o}" for s, o in NATIVE_CASES]
+)
+def test_sensor_truncates_oversized_output(
+    sensor: str, os_name: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    module = importlib.import_module(f"sensors.{sensor}.{os_name}")
+    cap = CAPS[sensor]
+
+    result, total_rows = _OVERSIZED_RUNS[sensor](module, tmp_path, monkeypatch, cap)
+    rows = result.split("\n")
+    marker = _MARKER.match(rows[-1])
+
+    assert len(result.encode()) <= cap
+    assert marker, f"Expected a truncation marker row, got {rows[-1][:80]!r}"
+    assert len(rows) - 1 + int(marker.group(1)) == total_rows